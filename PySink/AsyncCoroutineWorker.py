@@ -0,0 +1,48 @@
+import asyncio
+from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+
+
+class AsyncCoroutineWorker(CancellableAsyncWorker):
+    def __init__(self, *args, **kwargs):
+        """A :class:`~CancellableAsyncWorker` whose task is a coroutine. Workers should inherit from this class and
+        perform their task by overriding :meth:`~run` with an ``async def`` method.
+
+        Instead of occupying a thread of the :class:`~AsyncManager`, the coroutine is run on the manager's shared
+        :class:`~EventLoopThread`, so thousands of I/O-bound workers can be waiting at once. The usual methods
+        (:meth:`~AsyncWorker.update_progress`, :meth:`~AsyncWorker.complete`, etc) and
+        :class:`~PySink.AsyncWorkerSignals` are used to report the worker's state. Coroutine workers are started as soon
+        as they are provided to :meth:`AsyncManager.start_worker`: their :attr:`~AsyncWorker.priority` and
+        :attr:`~AsyncWorker.lane` only apply to thread-based workers.
+
+        The coroutine must not block the event loop (use ``await asyncio.sleep`` rather than ``time.sleep``).
+        Cancelling the worker (or its timeout expiring) also cancels the coroutine at its next ``await``, and exceptions
+        raised by the coroutine are appended to :attr:`~AsyncWorker.errors`.
+        """
+        super(AsyncCoroutineWorker, self).__init__(*args, **kwargs)
+
+    async def run(self) -> None:
+        """Performs the worker's task. Custom Workers should override this method with a coroutine. By default, this
+        will perform a demo task of counting to 5 at a one-second interval.
+        """
+        self.emit_start()
+        progress = 5
+        self.update_progress(progress, 'Starting')
+        for ii in range(5):
+            await asyncio.sleep(1)
+            progress += 90 / 5
+            self.update_progress(progress, f'Step {ii+1}')
+        self.complete(demo_result='Demo Result Value')
+
+    async def _execute(self) -> None:
+        if self.cancelled:
+            return
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        self.cancel_token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+        try:
+            await self.run()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exception:
+            self.errors.append(f'{type(exception).__name__}: {exception}')
+            self.complete()
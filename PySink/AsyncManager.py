@@ -1,7 +1,27 @@
-from PySide6.QtCore import Signal, QObject, QThreadPool
+from PySide6.QtCore import Qt, Signal, QObject, QThreadPool, QTimer
+from typing import Optional, Callable, Iterable
+from functools import partial
+import copy
+import itertools
+import threading
+from collections import deque
+import time
 from PySink.AsyncWorker import AsyncWorker
-from PySink.Objects import AsyncWorkerResults, AsyncWorkerProgress
+from PySink.Objects import AsyncWorkerResults, AsyncWorkerProgress, AsyncWorkerPartialResults, OverflowPolicy, WorkerStats, \
+    ManagerMetrics, WorkerEvent, RetryPolicy, SharedBuffer, WorkerGroup
 from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+from PySink.ProcessAsyncWorker import ProcessAsyncWorker
+from PySink.ProcessPool import ProcessPool
+from PySink.AsyncCoroutineWorker import AsyncCoroutineWorker
+from PySink.EventLoopThread import EventLoopThread
+from PySink.WorkerScheduler import WorkerScheduler, WorkerLane
+from PySink.WorkerGraph import WorkerGraph
+from PySink.MapWorker import MapWorker
+from PySink.MappedFileWorker import MappedFileWorker
+from PySink.ResultCache import ResultCache
+from PySink.ResultStore import ResultStore
+from PySink.TaskRunner import TaskRunner
+from PySink.EventBus import EventBus
 
 
 class AsyncManager(QObject):
@@ -9,12 +29,31 @@ class AsyncManager(QObject):
     worker_started_signal = Signal(str)
     #: Signal(:class:`~AsyncWorkerProgress`): Signal that contains progress data for a worker.
     worker_progress_signal = Signal(AsyncWorkerProgress)
+    #: Signal(:class:`~AsyncWorkerPartialResults`): Signal that contains a batch of results streamed by a worker before it finishes.
+    worker_partial_results_signal = Signal(AsyncWorkerPartialResults)
     #: Signal(:class:`~AsyncWorkerResults`): Signals that a worker has finished its task. Contains the results of the worker.
     worker_finished_signal = Signal(AsyncWorkerResults)
+    #: Signal(:class:`~AsyncWorkerResults`): Signals that an attempt of a worker failed and that the worker will be run again. Contains the results of the failed attempt.
+    worker_retry_signal = Signal(AsyncWorkerResults)
+    #: Signal(str, int): Weighted aggregate progress [0, 100] of a group of workers. Contains the name of the group and its progress. Only emitted when the integer progress changes.
+    group_progress_signal = Signal(str, int)
+    #: Signal(:class:`~WorkerGroup`): Signals that every worker of a group has finished. Contains the final state of the group.
+    group_finished_signal = Signal(WorkerGroup)
     #: Signal(): Signals that all workers have finished their tasks.
     all_workers_finished_signal = Signal()
+    #: Signal(dict): Periodic snapshot of the latest :class:`~AsyncWorkerProgress` of every worker that reported progress since the previous snapshot, keyed by worker id. Only emitted if progress batching is enabled.
+    worker_progress_batch_signal = Signal(dict)
+    #: Signal(:class:`~ManagerMetrics`): Periodic snapshot of the manager's state. Only emitted if metrics are enabled with an interval.
+    metrics_signal = Signal(ManagerMetrics)
+    _task_finished = Signal(AsyncWorkerResults)
+    _retry_released = Signal(str)
+    _lane_freed = Signal()
 
-    def __init__(self):
+    def __init__(self, max_progress_rate: Optional[float] = None, max_processes: Optional[int] = None,
+                 priority_aging_rate: float = 0.5, progress_batch_interval: Optional[int] = None,
+                 max_pending_partials: Optional[int] = 16, result_cache: Optional[ResultCache] = None,
+                 event_bus_interval: Optional[int] = None, result_store: Optional[ResultStore] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
         """Class that manages all :class:`workers<AsyncWorker>` and their corresponding threads. Once a worker is created,
         provide it to the :meth:`~start_worker` method to start the worker's long-running task. If the worker is of
         type :class:`~CancellableAsyncWorker`, it can be cancelled by passing the worker's
@@ -24,10 +63,272 @@ class AsyncManager(QObject):
         Worker signals are also exposed via the provided signal attributes :attr:`~worker_started_signal` ,
         :attr:`~worker_progress_signal` , and :attr:`~worker_finished_signal` . Once all active workers are complete,
         the manager will emit its :attr:`~all_workers_finished_signal`
+
+        Views displaying many workers at once can use the :attr:`~worker_progress_batch_signal` instead of
+        :attr:`~worker_progress_signal`. Once enabled (see :meth:`~set_progress_batch_interval`), it delivers the latest
+        progress of all updated workers in a single emission per interval.
+
+        Batches streamed by workers with :meth:`~AsyncWorker.emit_partial` are relayed by the
+        :attr:`~worker_partial_results_signal`. Each batch is acknowledged once the signal has been emitted, so a worker
+        that streams faster than the slots connected to the signal consume its batches is held back once it has
+        `max_pending_partials` batches waiting.
+
+        If a :attr:`~result_cache` is provided, workers that define a :meth:`~AsyncWorker.cache_key` are only run if
+        their results are not cached. Otherwise, the cached results are emitted right away (from the event loop) as if
+        the worker had completed.
+
+        Workers that define a :meth:`~AsyncWorker.dedup_key` are deduplicated while in flight: a worker started while
+        another worker with the same key is active is attached to that worker rather than run, and receives copies of
+        its signals. Cancelling an attached worker only detaches it, and cancelling the running worker hands the job to
+        the first attached worker.
+
+        Features that start a new worker for every change of user input (search-as-you-type, live previews, etc) can use
+        :meth:`~submit_latest`, which only keeps the most recent worker of a channel alive.
+
+        By default, the manager connects to the signals of every worker it starts. When many workers are started, the
+        manager can instead be given an :attr:`~event_bus`: workers then post their events to the bus, which is drained
+        on the GUI thread at a fixed cadence, so that no worker creates signals or connections. The manager's own
+        signals are emitted either way, and other subscribers can listen to the bus directly.
+
+        Results are delivered by signal and are not kept by the manager, unless it is given a :attr:`~result_store`, in
+        which case the results of recently finished workers can be looked up with :meth:`~get_results`.
+
+        Workers with a :class:`~RetryPolicy` that finish with errors are run again rather than reported as finished:
+        once the policy's backoff delay has elapsed, the worker is reset and queued again, so no thread is held while
+        waiting. Each failed attempt is reported by the :attr:`~worker_retry_signal`, and only the last attempt by the
+        :attr:`~worker_finished_signal`. Cancelling a worker that is waiting to be retried finishes it right away.
+
+        Large payloads produced in child processes can be returned as :class:`~SharedBuffer` instances, which reach the
+        GUI thread without being copied. The manager owns the buffers of the results it delivers, and frees them when
+        :meth:`~release_shared_buffers` is called. Buffers of results that are never delivered (failed attempts that are
+        retried, superseded workers) are freed right away.
+
+        Once enabled with :meth:`~enable_metrics`, the manager also records the lifecycle of every worker (see
+        :meth:`~get_worker_stats`) along with queue depth and thread usage (see :meth:`~get_metrics`). The snapshots
+        returned by :meth:`~get_metrics` also aggregate the rate and estimated time remaining reported in the progress of
+        the active workers.
+
+        Started workers are queued by the manager's :attr:`~scheduler` and handed to the :attr:`~threadpool` as threads
+        become available, highest :attr:`~AsyncWorker.priority` first. The priority of a queued worker can be changed
+        with :meth:`~set_worker_priority`, and queued workers gain priority over time so that low priority workers are
+        not starved under load. Workers can also be split into named lanes (see :meth:`~add_lane`), each with its own
+        concurrency limit and bounded queue.
+
+        CPU-bound tasks can be run in child processes by starting a :class:`~ProcessAsyncWorker`. Unless the worker is
+        given its own :class:`~ProcessPool`, its task is run on the manager's :attr:`~process_pool`, which is created
+        lazily the first time it is used. Call :meth:`ProcessPool.shutdown` to terminate its child processes.
+
+        Large numbers of short tasks can be run with :meth:`~submit`, which takes a plain callable rather than a worker.
+        Tasks are queued and run by a few reused runnables, and are only reported through the manager's signals, so they
+        cost no QObject creation or signal connection each.
+
+        Data-parallel jobs can be split into chunks processed in parallel with :meth:`~map`, and large files with
+        :meth:`~map_file`.
+
+        Workers sharing the same :attr:`~AsyncWorker.group` are tracked together: the group's weighted progress is
+        updated in constant time with every progress update of its workers and reported by the
+        :attr:`~group_progress_signal`, the :attr:`~group_finished_signal` is emitted once all of them have finished,
+        and they can be cancelled together with :meth:`~cancel_group`. A group is forgotten once it has finished, so
+        the next worker started with the same group name starts a new batch.
+
+        Workers that depend on each other can be started together as a :class:`~WorkerGraph` with :meth:`~start_graph`.
+        Each worker of the graph is queued as soon as its dependencies have finished, and receives their results.
+
+        I/O-bound tasks can be written as coroutines by starting an :class:`~AsyncCoroutineWorker`. These run
+        concurrently on the manager's :attr:`~event_loop`, a single thread shared by all coroutine workers, rather than
+        occupying a thread of the :attr:`~threadpool` each.
+
+        :param max_progress_rate: Default :attr:`~AsyncWorker.max_progress_rate` applied to started workers that do not
+            define their own. Defaults to None (unthrottled)
+        :type max_progress_rate: float, optional
+        :param max_processes: The maximum number of child processes used by :attr:`~process_pool`. Defaults to the
+            number of CPUs on the machine
+        :type max_processes: int, optional
+        :param priority_aging_rate: Priority gained by a queued worker for every second it waits to be started.
+            Defaults to 0.5
+        :type priority_aging_rate: float, optional
+        :param progress_batch_interval: Interval in milliseconds of the :attr:`~worker_progress_batch_signal`. Defaults
+            to None (batching disabled)
+        :type progress_batch_interval: int, optional
+        :param max_pending_partials: Default :attr:`~AsyncWorker.max_pending_partials` applied to started thread-based
+            workers that do not define their own. Defaults to 16
+        :type max_pending_partials: int, optional
+        :param result_cache: Cache used to skip workers whose results are already known. Defaults to None (no caching)
+        :type result_cache: ResultCache, optional
+        :param event_bus_interval: If provided, an :attr:`~event_bus` dispatching every `event_bus_interval`
+            milliseconds is created, and started workers report through it instead of their own signals. Defaults to
+            None (no event bus)
+        :type event_bus_interval: int, optional
+        :param result_store: Bounded history of the results of finished workers. Defaults to None (results are only
+            delivered by signal)
+        :type result_store: ResultStore, optional
+        :param retry_policy: Default :attr:`~AsyncWorker.retry_policy` applied to started workers that do not define
+            their own. Defaults to None (failed workers are not retried)
+        :type retry_policy: RetryPolicy, optional
         """
         super(AsyncManager, self).__init__()
         self.threadpool = QThreadPool()
         self.workers: {str: AsyncWorker} = {}
+        self.max_progress_rate: Optional[float] = max_progress_rate
+        self.max_pending_partials: Optional[int] = max_pending_partials
+        self.result_cache: Optional[ResultCache] = result_cache
+        self.result_store: Optional[ResultStore] = result_store
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        self._retry_timers: {str: QTimer} = {}
+        self._retries_on_release: set = set()
+        self._retry_lock = threading.Lock()
+        self.shared_buffers: {str: [SharedBuffer]} = {}
+        self._cache_keys: {str: str} = {}
+        self._flights: {str: str} = {}
+        self._flight_keys: {str: str} = {}
+        self._followers: {str: [AsyncWorker]} = {}
+        self._channel_pending: {str: AsyncWorker} = {}
+        self._channel_current: {str: str} = {}
+        self._channel_timers: {str: QTimer} = {}
+        self._worker_channels: {str: str} = {}
+        self._superseded: set = set()
+        self._task_counter = itertools.count()
+        self._tasks: set = set()
+        self._task_queue: deque = deque()
+        self._idle_runners: [TaskRunner] = []
+        self._active_runners: int = 0
+        self._borrowed_threads: int = 0
+        self._task_lock = threading.Lock()
+        self._task_finished.connect(self._task_complete_callback)
+        self._retry_released.connect(self._retry_released_callback)
+        # Queued, as workers admitted by the slot free room in their lane themselves when they are dispatched
+        self._lane_freed.connect(self._admit_blocked_workers, Qt.QueuedConnection)
+        self._blocked_workers: {str: deque} = {}
+        self.event_bus: Optional[EventBus] = None
+        if event_bus_interval is not None:
+            self.event_bus = EventBus(event_bus_interval, self)
+            self.event_bus._owner = self._worker_event_callback
+        self.process_pool: ProcessPool = ProcessPool(max_processes)
+        self.scheduler: WorkerScheduler = WorkerScheduler(priority_aging_rate)
+        self.event_loop: EventLoopThread = EventLoopThread()
+        self._progress_batch: {str: AsyncWorkerProgress} = {}
+        self._progress_batch_timer = QTimer(self)
+        self._progress_batch_timer.setSingleShot(True)
+        self._progress_batch_timer.timeout.connect(self._emit_progress_batch)
+        self._progress_batch_enabled = False
+        self.set_progress_batch_interval(progress_batch_interval)
+        self.metrics_history: int = 1000
+        self._worker_stats: Optional[{str: WorkerStats}] = None
+        self._metrics_counts: [int] = [0, 0, 0]
+        self._finished_stats: deque = deque()
+        self._progress_estimates: {str: AsyncWorkerProgress} = {}
+        self.groups: {str: WorkerGroup} = {}
+        self._worker_groups: {str: WorkerGroup} = {}
+        self._group_progress: {str: int} = {}
+        self._total_rate: float = 0.
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.timeout.connect(lambda: self.metrics_signal.emit(self.get_metrics()))
+
+    def add_lane(self, name: str, max_running: Optional[int] = None, max_queued: Optional[int] = None,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.REJECT, block_timeout: Optional[float] = None) -> None:
+        """Adds a named lane (or updates the limits of an existing one). Workers whose :attr:`~AsyncWorker.lane` is set
+        to the lane's name are queued on it, and at most `max_running` of them run at once regardless of how many of the
+        manager's threads are free. When a worker is started while the lane already has `max_queued` workers waiting,
+        the lane's `overflow_policy` decides what happens (see :class:`~OverflowPolicy`).
+
+        :param name: The name of the lane
+        :type name: str
+        :param max_running: The maximum number of workers of this lane running at once. Defaults to None (only limited
+            by the manager's thread count)
+        :type max_running: int, optional
+        :param max_queued: The maximum number of workers of this lane waiting to be started. Defaults to None (unbounded)
+        :type max_queued: int, optional
+        :param overflow_policy: What to do when a worker is started while the lane's queue is full. Defaults to
+            :attr:`OverflowPolicy.REJECT`
+        :type overflow_policy: OverflowPolicy, optional
+        :param block_timeout: With :attr:`OverflowPolicy.BLOCK`, the maximum number of seconds a worker is held waiting
+            for room in the queue, after which it finishes with a 'Dropped' error. Defaults to None (wait indefinitely)
+        :type block_timeout: float, optional
+        """
+        self.scheduler.add_lane(WorkerLane(name, max_running, max_queued, overflow_policy, block_timeout))
+        self._dispatch()
+
+    def enable_metrics(self, interval: Optional[int] = None, history: int = 1000) -> None:
+        """Starts recording worker lifecycle statistics and manager metrics. While metrics are disabled (the default),
+        the manager does no bookkeeping beyond a single check per event.
+
+        :param interval: If provided, the :attr:`~metrics_signal` is emitted every `interval` milliseconds
+        :type interval: int, optional
+        :param history: Number of finished workers whose statistics are kept. Defaults to 1000
+        :type history: int, optional
+        """
+        self.metrics_history = history
+        if self._worker_stats is None:
+            now = time.monotonic()
+            self._worker_stats = {worker_id: WorkerStats(worker_id, type(worker).__name__, now)
+                                  for worker_id, worker in self.workers.items()}
+            self._metrics_counts = [0, 0, 0]
+            self._finished_stats.clear()
+        if interval is not None:
+            self._metrics_timer.start(interval)
+        else:
+            self._metrics_timer.stop()
+
+    def disable_metrics(self) -> None:
+        """Stops recording metrics and discards the statistics recorded so far."""
+        self._metrics_timer.stop()
+        self._worker_stats = None
+
+    def get_results(self, worker_id: str) -> Optional[AsyncWorkerResults]:
+        """Returns the results of a finished worker (or task) from the :attr:`~result_store`.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: The worker's results, or None if there is no result store or the results are no longer stored
+        :rtype: AsyncWorkerResults
+        """
+        if self.result_store is None:
+            return None
+        return self.result_store.get(worker_id)
+
+    def release_shared_buffers(self, worker_id: Optional[str] = None) -> int:
+        """Frees the :class:`~SharedBuffer` instances found in the results of a finished worker. Views of the buffers
+        must not be used afterwards, and the worker's results are discarded from the :attr:`~result_store`.
+
+        :param worker_id: The unique identifier of the worker. Defaults to None (the buffers of every worker are freed)
+        :type worker_id: str, optional
+        :return: The number of freed buffers
+        :rtype: int
+        """
+        worker_ids = list(self.shared_buffers) if worker_id is None else [worker_id]
+        count = 0
+        for released_id in worker_ids:
+            buffers = self.shared_buffers.pop(released_id, [])
+            for shared in buffers:
+                shared.release()
+            count += len(buffers)
+            if buffers and self.result_store is not None:
+                self.result_store.discard(released_id)
+        return count
+
+    def get_worker_stats(self, worker_id: str) -> Optional[WorkerStats]:
+        """Returns the lifecycle statistics of an active or recently finished worker.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: The worker's statistics, or None if metrics are disabled or the worker is unknown
+        :rtype: WorkerStats
+        """
+        if self._worker_stats is None:
+            return None
+        return self._worker_stats.get(worker_id)
+
+    def get_metrics(self) -> ManagerMetrics:
+        """Returns a snapshot of the manager's state. Cumulative counts are only maintained while metrics are enabled.
+
+        :return: The manager's current metrics
+        :rtype: ManagerMetrics
+        """
+        finished, cancelled, progress = self._metrics_counts
+        etas = [estimate.eta for estimate in self._progress_estimates.values() if estimate.eta is not None]
+        return ManagerMetrics(time.monotonic(), len(self.workers), self.scheduler.queued_count,
+                              self.scheduler.running_count, self.threadpool.activeThreadCount(),
+                              finished, cancelled, progress, self._total_rate, max(etas) if etas else None)
 
     def cancel_all_workers(self) -> {str: str}:
         """Attempts to cancel all workers that are active and cancellable..
@@ -41,8 +342,8 @@ class AsyncManager(QObject):
             error = self.cancel_worker(worker_id)
             if error:
                 errors[worker_id] = error
-        if len(errors) == 0:
-            self.threadpool.clear()
+        # Queued workers are removed from the scheduler by cancel_worker. The thread pool is not cleared: runnables
+        # already handed to it must run to release their scheduler slot (cancelled workers return right away)
         return errors
 
     def cancel_worker(self, worker_id: str) -> str:
@@ -58,34 +359,717 @@ class AsyncManager(QObject):
             return f'There is no worker with id: {worker_id} currently running'
         if not isinstance(worker, CancellableAsyncWorker):
             return f'Worker if type {type(worker)} is not Cancellable'
+        unqueued = self.scheduler.remove(worker_id) is not None
+        self._unblock_worker(worker, worker.lane)
+        self._drop_estimate(worker_id)
+        if self._worker_stats is not None and worker_id in self._worker_stats:
+            self._worker_stats[worker_id].cancelled_at = time.monotonic()
+        self._detach_follower(worker)
+        followers = self._followers.pop(worker_id, None)
+        retry_timer = self._retry_timers.pop(worker_id, None)
+        with self._retry_lock:
+            self._retries_on_release.discard(worker_id)
+        if retry_timer is not None:
+            # The failed attempt already finished the worker: reset it so that it can finish again as cancelled
+            retry_timer.stop()
+            retry_timer.deleteLater()
+            worker.reset()
         worker.cancel()
+        if followers:
+            self._promote_follower(worker_id, followers)
+        elif followers is not None:
+            self._flights.pop(self._flight_keys.pop(worker_id))
+        if unqueued and self._blocked_workers:
+            self._admit_blocked_workers()
         return ''
 
+    def set_worker_priority(self, worker_id: str, priority: int) -> str:
+        """Changes the priority of a worker that is waiting to be started...
+
+        :param worker_id: The unique identifier of the queued worker
+        :type worker_id: str
+        :param priority: The new priority. Workers with a higher priority are started first
+        :type priority: int
+        :return: An message describing the issue if the worker is not waiting to be started
+        :rtype: str
+        """
+        if not self.scheduler.set_priority(worker_id, priority):
+            return f'There is no worker with id: {worker_id} waiting to be started'
+        return ''
+
+    def submit_latest(self, channel: str, worker: AsyncWorker, debounce: int = 0) -> None:
+        """Starts a worker on a "latest wins" channel. Any worker previously submitted to the same channel is
+        superseded: if it is still waiting for its debounce window to elapse it is discarded without being started, and
+        if it is active it is cancelled (when cancellable). Progress and results of superseded workers are not emitted by
+        the manager's signals, so only the latest worker of a channel is ever reported.
+
+        :param channel: The name of the channel
+        :type channel: str
+        :param worker: The worker to be run
+        :type worker: AsyncWorker
+        :param debounce: Number of milliseconds to wait before starting the worker. Submitting another worker to the
+            channel within that window discards this one. Defaults to 0 (start immediately)
+        :type debounce: int, optional
+        """
+        if debounce <= 0:
+            # Start the new worker first, so that the manager never appears idle in between
+            if self._channel_pending.pop(channel, None) is not None:
+                self._channel_timers[channel].stop()
+            superseded_id = self._channel_current.pop(channel, None)
+            self._start_channel_worker(channel, worker)
+            self._supersede(superseded_id)
+            return
+        self.cancel_channel(channel)
+        self._channel_pending[channel] = worker
+        timer = self._channel_timers.get(channel)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(partial(self._start_channel_worker, channel))
+            self._channel_timers[channel] = timer
+        timer.start(debounce)
+
+    def cancel_channel(self, channel: str) -> None:
+        """Discards the pending worker of a channel (see :meth:`~submit_latest`) and cancels its active worker. The
+        progress and results of the active worker are no longer emitted, even if it cannot be cancelled.
+
+        :param channel: The name of the channel
+        :type channel: str
+        """
+        if self._channel_pending.pop(channel, None) is not None:
+            self._channel_timers[channel].stop()
+        self._supersede(self._channel_current.pop(channel, None))
+
+    def set_progress_batch_interval(self, interval: Optional[int]) -> None:
+        """Enables (or disables) the :attr:`~worker_progress_batch_signal`. While enabled, progress updates are
+        collected and emitted together at most once per interval, keeping only the latest update of each worker.
+
+        :param interval: The minimum time between two batches in milliseconds, or None to disable batching
+        :type interval: int, optional
+        """
+        self._progress_batch_enabled = interval is not None
+        if self._progress_batch_enabled:
+            self._progress_batch_timer.setInterval(interval)
+        else:
+            self._progress_batch_timer.stop()
+            self._progress_batch = {}
+
     def start_worker(self, worker: AsyncWorker) -> None:
-        """Starts the worker on a new thread (or queues the worker if there are no threads available).
-        Once the worker is on the thread, the worker's :meth:`~AsyncWorker.run` method is called..
+        """Starts the worker on a new thread (or queues the worker according to its :attr:`~AsyncWorker.priority` if
+        there are no threads available). Once the worker is on the thread, the worker's :meth:`~AsyncWorker.run`
+        method is called..
+
+        If the worker's :attr:`~AsyncWorker.lane` has a bounded queue that is full, the lane's
+        :class:`~OverflowPolicy` is applied: the call either raises, returns while the manager holds the worker until
+        the lane has room, or drops the lane's oldest queued worker (which then finishes with a 'Dropped' error)..
 
         :param worker: The worker to be run
         :type worker: AsyncWorker
-        :raises Exception: Raised if a worker is provided that has the same id as one that is already running.
+        :raises Exception: Raised if a worker is provided that has the same id as one that is already running, if its
+            lane does not exist, or if its lane is full and cannot accept it.
         """
         if worker.id in self.workers:
             raise Exception(f'Worker with id: {worker.id} already running')
+        cache_key = None if self.result_cache is None else worker.cache_key()
+        if cache_key is not None:
+            results = self.result_cache.get(cache_key)
+            if results is not None:
+                self._register_worker(worker)
+                QTimer.singleShot(0, partial(self._complete_with_results, worker, results))
+                return
+        dedup_key = worker.dedup_key()
+        if dedup_key is not None and dedup_key in self._flights:
+            self._register_worker(worker)
+            self._followers[self._flights[dedup_key]].append(worker)
+            return
+        is_coroutine = isinstance(worker, AsyncCoroutineWorker)
+        lane = None if is_coroutine else self.scheduler.get_lane(worker)
+        blocked = False
+        if lane is not None and lane.overflow_policy == OverflowPolicy.BLOCK:
+            # Workers already waiting for room are admitted first
+            blocked = lane.is_full or lane.name in self._blocked_workers
+        elif lane is not None and lane.is_full and lane.overflow_policy == OverflowPolicy.REJECT:
+            raise Exception(f'The queue of lane {lane.name} is full')
+        if cache_key is not None:
+            self._cache_keys[worker.id] = cache_key
+        if dedup_key is not None:
+            self._flights[dedup_key] = worker.id
+            self._flight_keys[worker.id] = dedup_key
+            self._followers[worker.id] = []
+        self._register_worker(worker)
+        if blocked:
+            self._block_worker(worker, lane)
+        else:
+            self._queue_worker(worker)
+
+    def submit(self, func: Callable, *args, **kwargs) -> str:
+        """Runs a callable on the :attr:`~threadpool` as a lightweight task. Unlike workers, tasks have no signals of
+        their own and are not scheduled by priority or lane: they are handed to the thread pool directly, and their
+        results are only reported by the :attr:`~worker_finished_signal` (and count towards the
+        :attr:`~all_workers_finished_signal`). If the callable returns a dict, it becomes the
+        :attr:`~AsyncWorkerResults.results_dict`, otherwise the returned value is stored as ``result``. Exceptions are
+        appended to :attr:`~AsyncWorkerResults.errors`. A thread running tasks keeps running them until none are
+        queued, and is only handed to queued workers afterwards.
+
+        :param func: The callable to be run
+        :type func: Callable
+        :param args: Positional arguments passed to the callable
+        :param kwargs: Key-word arguments passed to the callable
+        :return: The id of the task, used as the :attr:`~AsyncWorkerResults.id` of its results
+        :rtype: str
+        """
+        task_id = f'task-{next(self._task_counter)}'
+        self._tasks.add(task_id)
+        with self._task_lock:
+            self._task_queue.append((task_id, func, args, kwargs))
+            if self._active_runners >= self.threadpool.maxThreadCount():
+                return task_id
+            self._active_runners += 1
+            runner = self._idle_runners.pop() if self._idle_runners else TaskRunner(self)
+        self.threadpool.start(runner)
+        return task_id
+
+    def map(self, func: Callable, iterable: Iterable, chunksize: int = 1, use_processes: bool = False,
+            ordered: bool = True, identifier: Optional[str] = None) -> MapWorker:
+        """Applies a callable to every item of an iterable in parallel, by starting a :class:`~MapWorker`. Progress and
+        results are reported through the manager's signals like any other worker, and the results of each chunk are
+        also available as they complete via the returned worker's
+        :attr:`signals.chunk_finished<PySink.MapWorkerSignals.chunk_finished>` signal.
+
+        :param func: The callable applied to each item. Must be picklable if `use_processes` is True
+        :type func: Callable
+        :param iterable: The items to be processed
+        :type iterable: Iterable
+        :param chunksize: The number of items per chunk. Defaults to 1
+        :type chunksize: int, optional
+        :param use_processes: Whether to process the chunks on the :attr:`~process_pool`. Defaults to False (threads)
+        :type use_processes: bool, optional
+        :param ordered: Whether results are delivered in input order rather than completion order. Defaults to True
+        :type ordered: bool, optional
+        :param identifier: A unique identifier for the worker. Defaults to a uuid4 string
+        :type identifier: str, optional
+        :return: The started worker
+        :rtype: MapWorker
+        """
+        worker = MapWorker(func, iterable, chunksize, use_processes, ordered, identifier)
+        self.start_worker(worker)
+        return worker
+
+    def map_file(self, path: str, func: Callable, chunk_size: int = 4 * 2 ** 20, delimiter: bytes = b'\n',
+                 use_processes: bool = False, ordered: bool = True, identifier: Optional[str] = None) -> MappedFileWorker:
+        """Processes a large file in parallel, record-aligned chunks, by starting a :class:`~MappedFileWorker`. Progress
+        is reported from the number of bytes processed.
+
+        :param path: The path of the file to be processed
+        :type path: str
+        :param func: The callable applied to a memoryview of each chunk. Must be picklable if `use_processes` is True
+        :type func: Callable
+        :param chunk_size: The approximate size of each chunk in bytes. Defaults to 4 MiB
+        :type chunk_size: int, optional
+        :param delimiter: The bytes ending each record. Defaults to a newline
+        :type delimiter: bytes, optional
+        :param use_processes: Whether to process the chunks on the :attr:`~process_pool`. Defaults to False (threads)
+        :type use_processes: bool, optional
+        :param ordered: Whether results are delivered in file order rather than completion order. Defaults to True
+        :type ordered: bool, optional
+        :param identifier: A unique identifier for the worker. Defaults to a uuid4 string
+        :type identifier: str, optional
+        :return: The started worker
+        :rtype: MappedFileWorker
+        """
+        worker = MappedFileWorker(path, func, chunk_size, delimiter, use_processes, ordered, identifier)
+        self.start_worker(worker)
+        return worker
+
+    def start_graph(self, graph: WorkerGraph) -> None:
+        """Starts a :class:`~WorkerGraph`. The workers without dependencies are queued immediately, and the others are
+        queued as soon as all of their dependencies have finished successfully. Every worker of the graph is considered
+        active (see :attr:`~workers`) until it finishes, so :attr:`~all_workers_finished_signal` is only emitted once
+        the whole graph is done.
+
+        The :attr:`~result_cache` and in-flight deduplication do not apply to graph workers: their
+        :meth:`~AsyncWorker.cache_key` and :meth:`~AsyncWorker.dedup_key` are ignored, since their inputs (the results of
+        their dependencies) are not known when the graph is started.
+
+        :param graph: The graph to be started
+        :type graph: WorkerGraph
+        :raises Exception: Raised if the graph is empty or has already been started, if one of its workers has the same
+            id as a worker that is already running, or if one of its workers' lane does not exist.
+        """
+        if not graph.workers:
+            raise Exception('Cannot start an empty graph')
+        if graph._queue_worker is not None:
+            raise Exception('The graph has already been started')
+        for worker in graph.workers.values():
+            if worker.id in self.workers:
+                raise Exception(f'Worker with id: {worker.id} already running')
+            if not isinstance(worker, AsyncCoroutineWorker):
+                self.scheduler.get_lane(worker)
+        for worker in graph.workers.values():
+            self._register_worker(worker)
+        for worker in graph._start(self._queue_worker, self._will_retry):
+            self._queue_worker(worker)
+
+    def get_group(self, name: str) -> Optional[WorkerGroup]:
+        """Returns the state of a group of workers that has not finished yet.
+
+        :param name: The name of the group
+        :type name: str
+        :return: The group, or None if no unfinished worker belongs to it
+        :rtype: WorkerGroup
+        """
+        return self.groups.get(name)
+
+    def cancel_group(self, name: str) -> {str: str}:
+        """Attempts to cancel every unfinished worker of a group (see :meth:`~cancel_worker`).
+
+        :param name: The name of the group to be cancelled
+        :type name: str
+        :return: A dictionary of errors if they are encountered, keyed by worker id.
+        :rtype: dict
+        """
+        group = self.groups.get(name)
+        if group is None:
+            return {}
+        errors = {}
+        for worker_id in group.worker_ids:
+            error = self.cancel_worker(worker_id)
+            if error:
+                errors[worker_id] = error
+        return errors
+
+    def cancel_graph(self, graph: WorkerGraph) -> {str: str}:
+        """Attempts to cancel every unfinished worker of a graph (see :meth:`~cancel_worker`).
+
+        :param graph: The graph to be cancelled
+        :type graph: WorkerGraph
+        :return: A dictionary of errors if they are encountered, keyed by worker id.
+        :rtype: dict
+        """
+        errors = {}
+        for worker_id in list(graph.workers):
+            if worker_id in graph.results:
+                continue
+            error = self.cancel_worker(worker_id)
+            if error:
+                errors[worker_id] = error
+        return errors
+
+    def _register_worker(self, worker: AsyncWorker) -> None:
+        if worker.max_progress_rate is None:
+            worker.max_progress_rate = self.max_progress_rate
+        if worker.max_pending_partials is None and not isinstance(worker, AsyncCoroutineWorker):
+            # Blocking a coroutine worker would block every coroutine sharing the event loop
+            worker.max_pending_partials = self.max_pending_partials
+        if worker.retry_policy is None:
+            worker.retry_policy = self.retry_policy
+        worker.attempt = 1
         worker.reset()
-        worker.setAutoDelete(True)
-        worker.signals.started.connect(lambda worker_id=worker.id: self.worker_started_signal.emit(worker_id))
-        worker.signals.progress.connect(self.worker_progress_signal.emit)
-        worker.signals.finished.connect(self._worker_complete_callback)
+        if isinstance(worker, (ProcessAsyncWorker, MapWorker)) and worker.process_pool is None:
+            worker.process_pool = self.process_pool
+        if isinstance(worker, MapWorker):
+            worker.threadpool = self.threadpool
+            worker._try_start = self._borrow_thread
+        if self.event_bus is not None:
+            self.event_bus.bind(worker)
+        else:
+            worker.signals.started.connect(self._worker_started_callback)
+            worker.signals.progress.connect(self._worker_progress_callback)
+            worker.signals.finished.connect(self._worker_complete_callback)
+            # Few workers stream partial results, so that connection is only made once a worker does
+            worker._defer_connections({WorkerEvent.PARTIAL_RESULTS: self._worker_partial_results_callback})
         self.workers[worker.id] = worker
-        self.threadpool.start(worker)
+        if worker.group is not None:
+            group = self.groups.get(worker.group)
+            if group is None:
+                group = self.groups[worker.group] = WorkerGroup(worker.group)
+            group._add(worker.id, worker.group_weight)
+            self._worker_groups[worker.id] = group
+            self._emit_group_progress(group)
+        if self._worker_stats is not None:
+            self._worker_stats[worker.id] = WorkerStats(worker.id, type(worker).__name__, time.monotonic())
+
+    def _queue_worker(self, worker: AsyncWorker) -> None:
+        # May be called from any thread: graph workers are queued by the thread of their last dependency
+        if isinstance(worker, CancellableAsyncWorker):
+            worker.start_timeout()
+        if isinstance(worker, AsyncCoroutineWorker):
+            self.event_loop.submit(self._run_coroutine_worker(worker))
+            return
+        try:
+            dropped_worker = self.scheduler.push(worker)
+        except Exception as exception:
+            # The lane filled up after the worker was admitted (graph workers are only queued once their dependencies finish)
+            worker.errors.append(str(exception))
+            worker.complete()
+            return
+        if dropped_worker is not None:
+            dropped_worker.errors.append('Dropped')
+            dropped_worker.complete()
+        self._dispatch()
+
+    def _block_worker(self, worker: AsyncWorker, lane: WorkerLane) -> None:
+        # The worker is held by the manager rather than the caller: start_worker returns, and the worker is queued once
+        # the lane has room
+        self._blocked_workers.setdefault(lane.name, deque()).append(worker)
+        if lane.block_timeout is not None:
+            QTimer.singleShot(int(1000 * lane.block_timeout), self, partial(self._expire_blocked_worker, worker, lane))
+
+    def _unblock_worker(self, worker: AsyncWorker, lane_name: Optional[str]) -> bool:
+        blocked = self._blocked_workers.get(lane_name)
+        if blocked is None or worker not in blocked:
+            return False
+        blocked.remove(worker)
+        if not blocked:
+            del self._blocked_workers[lane_name]
+        return True
+
+    def _expire_blocked_worker(self, worker: AsyncWorker, lane: WorkerLane) -> None:
+        if self._unblock_worker(worker, lane.name):
+            worker.errors += ['Dropped', f'Timed out waiting for room in the queue of lane {lane.name}']
+            worker.complete()
+
+    def _admit_blocked_workers(self) -> None:
+        for lane_name, blocked in list(self._blocked_workers.items()):
+            lane = self.scheduler.lanes[lane_name]
+            while blocked and not lane.is_full:
+                self._queue_worker(blocked.popleft())
+            if not blocked:
+                del self._blocked_workers[lane_name]
+
+    def _will_retry(self, worker: AsyncWorker, results: AsyncWorkerResults) -> bool:
+        # May be called from any thread: graphs need to know whether a failure is final before the manager handles it
+        if worker.retry_policy is None or worker.id in self._superseded:
+            return False
+        if 'Cancelled' in results.errors and 'Timed out' not in results.errors:
+            return False
+        return worker.retry_policy.should_retry(results.errors, worker.attempt)
+
+    def _schedule_retry(self, worker: AsyncWorker, results: AsyncWorkerResults) -> None:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(partial(self._retry_worker, worker))
+        self._retry_timers[worker.id] = timer
+        timer.start(int(1000 * worker.retry_policy.get_delay(worker.attempt)))
+        self.worker_retry_signal.emit(results)
+
+    def _retry_worker(self, worker: AsyncWorker) -> None:
+        if worker.id not in self._retry_timers:
+            return
+        with self._retry_lock:
+            if self.scheduler.is_running(worker.id):
+                # A worker that timed out can still be running its previous attempt: starting it again now would run
+                # the same instance twice at once, so wait for that attempt to return and release its slot
+                self._retries_on_release.add(worker.id)
+                return
+        self._retry_timers.pop(worker.id).deleteLater()
+        worker.attempt += 1
+        worker.reset()
+        self._queue_worker(worker)
+
+    def _dispatch(self) -> None:
+        # May be called from any thread: both the scheduler and QThreadPool.start are thread-safe. Threads taken by task
+        # runners and map helpers are not available to workers: a worker handed to the pool while they hold every
+        # thread would wait in the pool's own queue, where a worker of higher priority queued later can't overtake it
+        available = self.threadpool.maxThreadCount() - self._active_runners - self._borrowed_threads
+        ready = self.scheduler.take_ready(available)
+        for worker in ready:
+            self.threadpool.start(partial(self._run_worker, worker))
+        if ready and self._blocked_workers:
+            self._lane_freed.emit()
+
+    def _borrow_thread(self, func: Callable) -> bool:
+        # Runs a map helper on an idle thread, if there is one. Called from the map worker's thread
+        with self._task_lock:
+            if self.scheduler.running_count + self._active_runners + self._borrowed_threads >= \
+                    self.threadpool.maxThreadCount():
+                return False
+            self._borrowed_threads += 1
+        if not self.threadpool.tryStart(partial(self._run_borrowed, func)):
+            with self._task_lock:
+                self._borrowed_threads -= 1
+            return False
+        return True
+
+    def _run_borrowed(self, func: Callable) -> None:
+        try:
+            func()
+        finally:
+            with self._task_lock:
+                self._borrowed_threads -= 1
+            self._dispatch()
+
+    def _run_worker(self, worker: AsyncWorker) -> None:
+        self._record_start(worker.id)
+        try:
+            if not (isinstance(worker, CancellableAsyncWorker) and worker.cancelled):
+                worker.run()
+        finally:
+            with self._retry_lock:
+                self.scheduler.release(worker.id)
+                retry = worker.id in self._retries_on_release
+                self._retries_on_release.discard(worker.id)
+            if retry:
+                self._retry_released.emit(worker.id)
+            self._dispatch()
+
+    def _retry_released_callback(self, worker_id: str) -> None:
+        worker = self.workers.get(worker_id)
+        if worker is not None:
+            self._retry_worker(worker)
+
+    async def _run_coroutine_worker(self, worker: AsyncCoroutineWorker) -> None:
+        self._record_start(worker.id)
+        await worker._execute()
+
+    def _record_start(self, worker_id: str) -> None:
+        worker_stats = self._worker_stats
+        if worker_stats is not None:
+            stats = worker_stats.get(worker_id)
+            if stats is not None:
+                stats.started_at = time.monotonic()
+
+    def _worker_progress_callback(self, progress: AsyncWorkerProgress):
+        # Progress can still be queued when its worker is cancelled or has finished. This runs for every update, so
+        # the lookups are kept to one per dict
+        worker_id = progress.id
+        worker = self.workers.get(worker_id)
+        if worker is None or (isinstance(worker, CancellableAsyncWorker) and worker.cancelled) or \
+                (self._superseded and worker_id in self._superseded):
+            return
+        if self._worker_stats is not None:
+            self._metrics_counts[2] += 1
+            stats = self._worker_stats.get(worker_id)
+            if stats is not None:
+                stats.progress_count += 1
+        if self._worker_groups:
+            group = self._worker_groups.get(worker_id)
+            if group is not None and progress.value >= 0:
+                group._update(worker_id, min(progress.value, 100))
+                self._emit_group_progress(group)
+        previous = self._progress_estimates.get(worker_id)
+        self._progress_estimates[worker_id] = progress
+        if progress.rate is not None or (previous is not None and previous.rate is not None):
+            self._total_rate += (progress.rate or 0.) - (previous.rate if previous is not None and previous.rate else 0.)
+        self.worker_progress_signal.emit(progress)
+        if self._followers:
+            for follower in self._followers.get(worker_id, ()):
+                follower._post(WorkerEvent.PROGRESS, AsyncWorkerProgress(progress.value, progress.message, follower.id,
+                                                                         progress.elapsed, progress.rate, progress.eta))
+        if self._progress_batch_enabled:
+            self._progress_batch[progress.id] = progress
+            if not self._progress_batch_timer.isActive():
+                self._progress_batch_timer.start()
+
+    def _drop_estimate(self, worker_id: str) -> None:
+        estimate = self._progress_estimates.pop(worker_id, None)
+        if estimate is not None:
+            self._total_rate = self._total_rate - (estimate.rate or 0.) if self._progress_estimates else 0.
+
+    def _supersede(self, worker_id: Optional[str]) -> None:
+        if worker_id is not None and worker_id in self.workers:
+            self._superseded.add(worker_id)
+            if isinstance(self.workers[worker_id], CancellableAsyncWorker):
+                self.cancel_worker(worker_id)
+
+    def _start_channel_worker(self, channel: str, worker: Optional[AsyncWorker] = None) -> None:
+        if worker is None:
+            worker = self._channel_pending.pop(channel, None)
+            if worker is None:
+                return
+        self.start_worker(worker)
+        if worker.id in self.workers:
+            self._channel_current[channel] = worker.id
+            self._worker_channels[worker.id] = channel
+
+    def _next_task(self, runner: TaskRunner) -> Optional[tuple]:
+        # Called from the runner's thread. A runner only goes idle once the queue is empty
+        with self._task_lock:
+            if self._task_queue:
+                return self._task_queue.popleft()
+            self._active_runners -= 1
+            self._idle_runners.append(runner)
+        # Hand the runner's thread to the workers waiting for one
+        self._dispatch()
+        return None
+
+    def _task_complete_callback(self, results: AsyncWorkerResults):
+        self._tasks.discard(results.id)
+        self._claim_shared_buffers(results)
+        if self.result_store is not None:
+            self.result_store.add(results)
+        self.worker_finished_signal.emit(results)
+        if not self.workers and not self._tasks:
+            self.all_workers_finished_signal.emit()
+
+    def _detach_follower(self, worker: AsyncWorker) -> None:
+        dedup_key = worker.dedup_key()
+        leader_id = None if dedup_key is None else self._flights.get(dedup_key)
+        if leader_id is not None and leader_id != worker.id and worker in self._followers[leader_id]:
+            self._followers[leader_id].remove(worker)
+
+    def _promote_follower(self, leader_id: str, followers: [AsyncWorker]) -> None:
+        dedup_key = self._flight_keys.pop(leader_id)
+        leader = followers.pop(0)
+        self._flights[dedup_key] = leader.id
+        self._flight_keys[leader.id] = dedup_key
+        self._followers[leader.id] = followers
+        cache_key = None if self.result_cache is None else leader.cache_key()
+        if cache_key is not None:
+            self._cache_keys[leader.id] = cache_key
+        self._queue_worker(leader)
+
+    def _worker_event_callback(self, worker_id: str, event: WorkerEvent, payload) -> bool:
+        # Returns True if the record must not reach the other subscribers of the bus (a failed attempt being retried)
+        if event == WorkerEvent.PROGRESS:
+            self._worker_progress_callback(payload)
+        elif event == WorkerEvent.FINISHED:
+            return self._worker_complete_callback(payload)
+        elif event == WorkerEvent.PARTIAL_RESULTS:
+            self._worker_partial_results_callback(payload)
+        else:
+            self._worker_started_callback(payload)
+        return False
+
+    def _worker_started_callback(self, worker_id: str):
+        if worker_id in self._superseded:
+            return
+        self.worker_started_signal.emit(worker_id)
+        for follower in self._followers.get(worker_id, ()):
+            follower._post(WorkerEvent.STARTED, follower.id)
+
+    def _complete_with_results(self, worker: AsyncWorker, results: AsyncWorkerResults) -> bool:
+        if self.workers.get(worker.id) is not worker:
+            return False
+        if isinstance(worker, CancellableAsyncWorker):
+            if worker.cancelled:
+                return False
+            worker._done = True
+        results.id = worker.id
+        worker.results = results
+        worker._post(WorkerEvent.FINISHED, results)
+        return True
+
+    def _worker_partial_results_callback(self, partial_results: AsyncWorkerPartialResults):
+        # Batches of superseded workers are dropped, but still acknowledged so that the worker is not blocked
+        if partial_results.id not in self._superseded:
+            self.worker_partial_results_signal.emit(partial_results)
+            for follower in self._followers.get(partial_results.id, ()):
+                follower._post(WorkerEvent.PARTIAL_RESULTS,
+                               AsyncWorkerPartialResults(partial_results.items, partial_results.index, follower.id))
+        worker = self.workers.get(partial_results.id)
+        if worker is not None:
+            worker.acknowledge_partial()
+
+    def _record_finish(self, worker_id: str, results: AsyncWorkerResults):
+        stats = self._worker_stats.get(worker_id)
+        if stats is not None:
+            stats.finished_at = time.monotonic()
+            self._metrics_counts[0] += 1
+            if 'Cancelled' in results.errors:
+                self._metrics_counts[1] += 1
+                if stats.cancelled_at is None:
+                    stats.cancelled_at = stats.finished_at
+            # Only the statistics of the most recently finished workers are kept
+            self._finished_stats.append(worker_id)
+            while len(self._finished_stats) > self.metrics_history:
+                self._worker_stats.pop(self._finished_stats.popleft(), None)
+
+    def _emit_progress_batch(self):
+        batch, self._progress_batch = self._progress_batch, {}
+        if batch:
+            self.worker_progress_batch_signal.emit(batch)
+
+    def _emit_group_progress(self, group: WorkerGroup) -> None:
+        progress = int(group.progress)
+        if self._group_progress.get(group.name) != progress:
+            self._group_progress[group.name] = progress
+            self.group_progress_signal.emit(group.name, progress)
+
+    def _finish_group_worker(self, worker_id: str, results: AsyncWorkerResults) -> None:
+        group = self._worker_groups.pop(worker_id, None)
+        if group is None:
+            return
+        group._finish(worker_id, bool(results.errors), 'Cancelled' in results.errors)
+        self._emit_group_progress(group)
+        if group.done:
+            if self.groups.get(group.name) is group:
+                self.groups.pop(group.name)
+            self._group_progress.pop(group.name, None)
+            self.group_finished_signal.emit(group)
+
+    def _claim_shared_buffers(self, results: AsyncWorkerResults) -> bool:
+        buffers = [value for value in results.results_dict.values() if isinstance(value, SharedBuffer)]
+        if buffers:
+            self.shared_buffers.setdefault(results.id, []).extend(buffers)
+        return bool(buffers)
+
+    @staticmethod
+    def _attach_shared_buffers(results: AsyncWorkerResults) -> None:
+        # Gives a copy of the results handles of its own, so that each worker's buffers can be released independently
+        handles = {}
+        for shared in results.results_dict.values():
+            if isinstance(shared, SharedBuffer) and id(shared) not in handles:
+                handles[id(shared)] = SharedBuffer(shared.size, shared.name)
+        results.results_dict = {key: handles.get(id(value), value) for key, value in results.results_dict.items()}
+        for name, value in getattr(results, '__dict__', {}).items():
+            if id(value) in handles:
+                setattr(results, name, handles[id(value)])
+
+    @staticmethod
+    def _release_unclaimed(results: AsyncWorkerResults) -> None:
+        for value in results.results_dict.values():
+            if isinstance(value, SharedBuffer):
+                value.release()
 
-    def _worker_complete_callback(self, results: AsyncWorkerResults):
+    def _worker_complete_callback(self, results: AsyncWorkerResults) -> bool:
+        # Returns True if the worker is retried rather than finished
         worker_id = results.id
         if worker_id and worker_id in self.workers:
-            self.worker_finished_signal.emit(results)
+            self.scheduler.remove(worker_id)
+            if self._will_retry(self.workers[worker_id], results):
+                self._release_unclaimed(results)
+                self._drop_estimate(worker_id)
+                self._schedule_retry(self.workers[worker_id], results)
+                return True
+            has_shared_buffers = self._claim_shared_buffers(results)
+            cache_key = self._cache_keys.pop(worker_id, None)
+            if cache_key is not None and not results.errors and not has_shared_buffers:
+                try:
+                    self.result_cache.put(cache_key, results, type(self.workers[worker_id]))
+                except Exception as exception:
+                    # Results that cannot be copied (or pickled) are delivered, just not cached
+                    results.warnings.append(f'Results not cached: {type(exception).__name__}: {exception}')
+            if self._worker_stats is not None:
+                self._record_finish(worker_id, results)
+            self._drop_estimate(worker_id)
+            if self.result_store is not None:
+                self.result_store.add(results)
+            channel = self._worker_channels.pop(worker_id, None)
+            if channel is not None and self._channel_current.get(channel) == worker_id:
+                self._channel_current.pop(channel)
+            if worker_id in self._superseded:
+                self._superseded.discard(worker_id)
+                self.release_shared_buffers(worker_id)
+            else:
+                self.worker_finished_signal.emit(results)
             self.workers.pop(worker_id)
-            if len(self.workers) == 0:
+            self._finish_group_worker(worker_id, results)
+            followers = self._followers.pop(worker_id, None)
+            if followers is not None:
+                self._flights.pop(self._flight_keys.pop(worker_id))
+                for follower in followers:
+                    # Followers share the leader's result values, but get their own id and error/warning lists
+                    follower_results = copy.copy(results)
+                    follower_results.errors = list(results.errors)
+                    follower_results.warnings = list(results.warnings)
+                    if has_shared_buffers:
+                        self._attach_shared_buffers(follower_results)
+                    if not self._complete_with_results(follower, follower_results) and has_shared_buffers:
+                        self._release_unclaimed(follower_results)
+            if not self.workers and not self._tasks:
                 self.all_workers_finished_signal.emit()
+        return False
 
 
 if __name__ == '__main__':
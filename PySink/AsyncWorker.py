@@ -1,26 +1,105 @@
 from PySide6.QtCore import QRunnable, Slot
 from typing import Optional
+from functools import partial
+import math
+import threading
 import time
 import uuid
-from PySink.Objects import AsyncWorkerResults, AsyncWorkerSignals, AsyncWorkerProgress
+from PySink.Objects import AsyncWorkerResults, AsyncWorkerSignals, AsyncWorkerProgress, AsyncWorkerPartialResults, \
+    WorkerEvent, RetryPolicy, ProgressFlusher
 
 
 class AsyncWorker(QRunnable):
-    def __init__(self, identifier: Optional[str] = None):
+    def __init__(self, identifier: Optional[str] = None, max_progress_rate: Optional[float] = None):
         """A class that represents an Asynchronous Worker. Workers should inherit from this class
         and perform their long-running tasks by overriding the :meth:`~run` method.
 
         To define custom :attr:`~results` and :attr:`~signals`, redefine them within your custom worker's __init__ method..
+        The default :attr:`~signals` are only created when first accessed: workers started by an :class:`~AsyncManager`
+        that uses an :class:`~EventBus` report their state through the bus, and never create a QObject of their own.
+
+        When started by an :class:`~AsyncManager`, workers with a higher :attr:`~priority` are started before those with
+        a lower priority if the manager's threads are all busy. Setting :attr:`~lane` to the name of a lane added with
+        :meth:`AsyncManager.add_lane` subjects the worker to that lane's concurrency limit, and setting :attr:`~group`
+        includes the worker in the aggregate progress of that group (see :class:`~PySink.WorkerGroup`), in proportion
+        to its :attr:`~group_weight`. Workers started as part of
+        a :class:`~WorkerGraph` can read the results of the workers they depend on from :attr:`~dependency_results`.
+
+        Workers that report progress from tight loops can set :attr:`~max_progress_rate` to coalesce their progress
+        updates. Updates arriving faster than the given rate are held back, and only the latest one is emitted once the
+        interval has elapsed (from a :class:`~PySink.ProgressFlusher` thread shared by all workers if the worker stops
+        reporting, or when it completes).
+        Updates that move the value onto a boundary (0, 100 or indeterminate) are always emitted immediately.
+
+        Every emitted :class:`~PySink.AsyncWorkerProgress` also carries the time elapsed since the worker began
+        reporting, a rate of progress and the estimated time remaining, computed on the worker's thread. The rate is
+        smoothed exponentially over :attr:`~rate_window` seconds, which keeps the estimate steady for workers that
+        progress in bursts. If :attr:`~progress_total` is set to the amount of work represented by 100 (items, bytes,
+        etc), the rate is expressed in those units per second.
+
+        Workers producing large amounts of data can stream it with :meth:`~emit_partial` instead of holding everything
+        until :meth:`~complete`. If :attr:`~max_pending_partials` is set, at most that many batches can be waiting to be
+        consumed: further calls to :meth:`~emit_partial` block until a batch is acknowledged (see
+        :meth:`~acknowledge_partial`, which the :class:`~AsyncManager` calls once it has relayed a batch), keeping the
+        worker's memory bounded when it produces data faster than the GUI consumes it.
+
+        Idempotent workers can opt into the :class:`~AsyncManager`'s :class:`~ResultCache` by overriding
+        :meth:`~cache_key`. Similarly, workers that override :meth:`~dedup_key` are not run while another worker with the
+        same key is running: they attach to it and receive its progress and results instead.
+
+        A worker given a :attr:`~retry_policy` (or started by a manager with a default one) is run again when it
+        finishes with errors, until the policy gives up. Only the results of its last attempt are delivered, and
+        :attr:`~attempt` holds the number of the attempt being run.
 
         :param identifier: A unique identifier to differentiate this worker from other workers. Defaults to a uuid4 string
         :type identifier: str, optional
+        :param max_progress_rate: Maximum number of progress updates emitted per second. Defaults to None (unthrottled)
+        :type max_progress_rate: float, optional
         """
         super(AsyncWorker, self).__init__()
         self.errors: list = []
         self.warnings: list = []
         self.id: str = identifier if identifier is not None else str(uuid.uuid4())
-        self.signals: AsyncWorkerSignals = AsyncWorkerSignals()
+        self._signals: Optional[AsyncWorkerSignals] = None
+        self._bus = None
+        self._deferred_slots: Optional[dict] = None
+        self._deferred_lock: Optional[threading.Lock] = None
         self.results: AsyncWorkerResults = AsyncWorkerResults()
+        self.max_progress_rate: Optional[float] = max_progress_rate
+        self.priority: int = 0
+        self.lane: Optional[str] = None
+        self.group: Optional[str] = None
+        self.group_weight: float = 1.
+        self.dependency_results: {str: AsyncWorkerResults} = {}
+        self.max_pending_partials: Optional[int] = None
+        self.retry_policy: Optional[RetryPolicy] = None
+        self.progress_total: Optional[float] = None
+        self.rate_window: float = 5.
+        self.attempt: int = 1
+        self._partial_index: int = 0
+        self._partial_slots: Optional[threading.Semaphore] = None
+        self._last_progress_time: float = 0.
+        self._last_progress_value = None
+        self._pending_progress: Optional[tuple] = None
+        self._progress_lock = threading.Lock()
+        self._flush_due: Optional[float] = None
+        self._progress_started_at: Optional[float] = None
+        self._rate_sample: Optional[tuple] = None
+        self._rate_sums: [float] = [0., 0.]
+        self._rate: Optional[float] = None
+
+    @property
+    def signals(self) -> AsyncWorkerSignals:
+        """AsyncWorkerSignals: The signals used to report the worker's state. Created on first access, which for
+        workers started by an :class:`~PySink.AsyncManager` without an event bus is
+        :meth:`~PySink.AsyncManager.start_worker`."""
+        if self._signals is None:
+            self._signals = AsyncWorkerSignals()
+        return self._signals
+
+    @signals.setter
+    def signals(self, signals: AsyncWorkerSignals) -> None:
+        self._signals = signals
 
     @Slot()
     def run(self) -> None:
@@ -36,6 +115,27 @@ class AsyncWorker(QRunnable):
             self.update_progress(progress, f'Step {ii+1}')
         self.complete(demo_result='Demo Result Value')
 
+    def cache_key(self) -> Optional[str]:
+        """Returns the key under which the worker's results are cached by the :class:`~AsyncManager`'s
+        :attr:`~AsyncManager.result_cache`. Workers performing the same computation must return the same key, typically
+        built from their parameters. By default, this returns None and the worker is never cached.
+
+        :return: The worker's cache key, or None if the worker should not be cached
+        :rtype: str, optional
+        """
+        return None
+
+    def dedup_key(self) -> Optional[str]:
+        """Returns the key used by the :class:`~AsyncManager` to detect identical work that is already in flight. If
+        a worker with the same key is running (or queued) when this worker is started, this worker is not run. It
+        attaches to the running worker instead, and receives its progress, partial results and results (under its own
+        id). By default, this returns None and the worker is always run.
+
+        :return: The worker's deduplication key, or None if the worker should always be run
+        :rtype: str, optional
+        """
+        return None
+
     def reset(self) -> None:
         """Resets the worker's state. All warnings and errors will be cleared, and :attr:`~result` will be reset to the
         defined result type.
@@ -43,10 +143,22 @@ class AsyncWorker(QRunnable):
         self.errors = []
         self.warnings = []
         self.results = type(self.results)()
+        self._flush_due = None
+        self._last_progress_time = 0.
+        self._last_progress_value = None
+        self._pending_progress = None
+        self._progress_started_at = None
+        self._rate_sample = None
+        self._rate_sums = [0., 0.]
+        self._rate = None
+        self._partial_index = 0
+        # Created by the first call to emit_partial, as most workers never stream partial results
+        self._partial_slots = None
 
     def update_progress(self, progress_value: int, message='') -> None:
         """Emits the progress value and message. These values are emitted via the
-        :attr:`self.signals.progress<AsyncWorkerSignals.progress>` signal..
+        :attr:`self.signals.progress<AsyncWorkerSignals.progress>` signal. If :attr:`~max_progress_rate` is set,
+        updates are coalesced so that at most that many are emitted per second, always keeping the latest value.
 
         :param progress_value: The current progress value. For discrete behavior, this value should be [0, 100].
             For indeterminate behavior, this value should be -1.
@@ -54,18 +166,119 @@ class AsyncWorker(QRunnable):
         :param message: A message describing the current progress stage of the worker ('Downloading', 'Calculating', etc).
         :type message: str, optional
         """
-        progress = AsyncWorkerProgress()
-        progress.value = progress_value
-        progress.message = message
-        progress.id = self.id
-        self.signals.progress.emit(progress)
+        if self.max_progress_rate:
+            with self._progress_lock:
+                now = time.monotonic()
+                boundary = (progress_value <= 0 or progress_value >= 100) and progress_value != self._last_progress_value
+                remaining = 1 / self.max_progress_rate - (now - self._last_progress_time)
+                if not boundary and remaining > 0:
+                    self._pending_progress = (progress_value, message)
+                    if self._flush_due is None:
+                        # Emits the held back value even if the worker does not report again before it completes
+                        due = self._flush_due = now + remaining
+                        ProgressFlusher.instance().schedule(due, partial(self._flush_when_due, due))
+                    return
+                self._flush_due = None
+                self._last_progress_time = now
+                self._emit_progress(progress_value, message)
+            return
+        self._emit_progress(progress_value, message)
+
+    def flush_progress(self) -> None:
+        """Emits the latest progress update that was held back by :attr:`~max_progress_rate`, if there is one. This is
+        called automatically once the throttling interval has elapsed, and by :meth:`~complete`.
+        """
+        with self._progress_lock:
+            self._flush_pending_progress()
+
+    def _flush_when_due(self, due: float) -> None:
+        # Called by the flusher. The update it was scheduled for may already have been emitted (or replaced by an
+        # update emitted inline), in which case emitting now would exceed the rate
+        with self._progress_lock:
+            if self._flush_due == due:
+                self._flush_pending_progress()
+
+    def _flush_pending_progress(self) -> None:
+        self._flush_due = None
+        if self._pending_progress is not None:
+            self._last_progress_time = time.monotonic()
+            self._emit_progress(*self._pending_progress)
+
+    def _emit_progress(self, progress_value, message) -> None:
+        self._pending_progress = None
+        self._last_progress_value = progress_value
+        now = time.monotonic()
+        if self._progress_started_at is None:
+            self._progress_started_at = now
+        rate = eta = None
+        if progress_value >= 0:
+            self._update_rate(progress_value, now)
+            if progress_value >= 100:
+                eta = 0.
+            elif self._rate:
+                eta = (100 - progress_value) / self._rate
+            if self._rate is not None:
+                rate = self._rate if self.progress_total is None else self._rate * self.progress_total / 100
+        else:
+            self._rate_sample, self._rate_sums, self._rate = None, [0., 0.], None
+        self._post(WorkerEvent.PROGRESS, AsyncWorkerProgress(progress_value, message, self.id,
+                                                             now - self._progress_started_at, rate, eta))
+
+    def _update_rate(self, progress_value, now: float) -> None:
+        # Progress and time are both summed over an exponentially decaying window, so that bursts of updates are
+        # averaged over the time it took to produce them. The rate is in percentage points per second
+        if self._rate_sample is None:
+            self._rate_sample = (now, progress_value)
+            return
+        sample_time, sample_value = self._rate_sample
+        elapsed = now - sample_time
+        decay = math.exp(-elapsed / self.rate_window)
+        self._rate_sums[0] = self._rate_sums[0] * decay + max(progress_value - sample_value, 0)
+        self._rate_sums[1] = self._rate_sums[1] * decay + elapsed
+        self._rate_sample = (now, progress_value)
+        if self._rate_sums[1] >= self.rate_window / 20:
+            self._rate = self._rate_sums[0] / self._rate_sums[1]
+
+    def emit_partial(self, items: list) -> bool:
+        """Streams a batch of results before the worker completes. The batch is emitted via the
+        :attr:`self.signals.partial_results<AsyncWorkerSignals.partial_results>` signal, so the worker does not need to
+        keep it. If :attr:`~max_pending_partials` batches are already waiting to be acknowledged, this call blocks until
+        one of them is.
+
+        :param items: The batch of results
+        :type items: list
+        :return: False if the batch was not emitted
+        :rtype: bool
+        """
+        if self._partial_slots is None and self.max_pending_partials is not None:
+            self._partial_slots = threading.Semaphore(self.max_pending_partials)
+        if self._partial_slots is not None and not self._acquire_partial_slot():
+            return False
+        self._post(WorkerEvent.PARTIAL_RESULTS, AsyncWorkerPartialResults(items, self._partial_index, self.id))
+        self._partial_index += 1
+        return True
+
+    def acknowledge_partial(self) -> None:
+        """Signals that a batch emitted by :meth:`~emit_partial` has been consumed, allowing a blocked call to
+        :meth:`~emit_partial` to proceed. The :class:`~AsyncManager` calls this automatically after relaying each batch;
+        consumers connected to the worker's signals directly must call it themselves if :attr:`~max_pending_partials`
+        is set.
+        """
+        if self._partial_slots is not None:
+            self._partial_slots.release()
+
+    def _acquire_partial_slot(self) -> bool:
+        return self._partial_slots.acquire()
 
     def emit_start(self) -> None:
         """This method can be called within :meth:`~run` to let the application know that the long-running task has
         begun (this is signalled via the :attr:`self.signals.started<AsyncWorkerSignals.started>` signal). Calling
         this method is completely optional and does not affect the functionality of the worker.
         """
-        self.signals.started.emit(self.id)
+        if self._rate_sample is None:
+            self._progress_started_at = time.monotonic()
+            self._rate_sample = (self._progress_started_at, 0)
+        self._post(WorkerEvent.STARTED, self.id)
 
     def complete(self, **kwargs) -> None:
         """Signals the completion of the worker's long-running task. This should be called at the end of the overridden
@@ -79,6 +292,7 @@ class AsyncWorker(QRunnable):
 
         :param kwargs: Result values to be emitted, defined as key-word arguments
         """
+        self.flush_progress()
         self._load_default_results(clear=False)
         self.results.results_dict = kwargs
         try:
@@ -87,7 +301,30 @@ class AsyncWorker(QRunnable):
                 setattr(self.results, key, kwargs[key])
         except AttributeError:
             pass
-        self.signals.finished.emit(self.results)
+        self._post(WorkerEvent.FINISHED, self.results)
+
+    def _post(self, event: WorkerEvent, payload) -> None:
+        # Report through the event bus if the worker is bound to one, and through the signals if they exist
+        if self._bus is not None:
+            self._bus.post(self.id, event, payload)
+            if self._signals is None:
+                return
+        if self._deferred_slots and event in self._deferred_slots:
+            self._connect_deferred_slot(event)
+        getattr(self.signals, event.value).emit(payload)
+
+    def _defer_connections(self, slots: dict) -> None:
+        # Connecting a signal costs more than emitting it. Each slot (keyed by WorkerEvent) is only connected to its
+        # signal when the event is first posted, so that events a worker never posts are never connected
+        self._deferred_lock = threading.Lock()
+        self._deferred_slots = dict(slots)
+
+    def _connect_deferred_slot(self, event: WorkerEvent) -> None:
+        # Held while connecting, so that an event posted by another thread meanwhile is only emitted once connected
+        with self._deferred_lock:
+            slot = self._deferred_slots.pop(event, None)
+            if slot is not None:
+                getattr(self.signals, event.value).connect(slot)
 
     def _load_default_results(self, clear=True) -> AsyncWorkerResults:
         if clear:
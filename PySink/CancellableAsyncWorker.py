@@ -1,48 +1,132 @@
+from typing import Optional
+import threading
 from PySink import AsyncWorker
+from PySink.Objects import CancellationToken, WorkerEvent
 
 
 class CancellableAsyncWorker(AsyncWorker):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, timeout: Optional[float] = None, **kwargs):
         """A class that represents a cancellable :class:`~AsyncWorker`. Any workers that need to be cancellable
         should inherit from this class. CancellableAsyncWorker inherits from :class:`AsyncWorker`, and offers the
         ability to cancel the worker's task at any time by calling the :meth:`~cancel` method.
 
+        Cancellation is tracked by the worker's :attr:`~cancel_token`. Besides polling :attr:`~cancelled`, long waits
+        within :meth:`run()<AsyncWorker.run>` should use :meth:`~sleep` (or the token's
+        :meth:`~PySink.CancellationToken.wait`), which return as soon as the worker is cancelled. If a `timeout` is
+        given, the worker is cancelled automatically when it has not completed within that many seconds of being
+        started by the :class:`~AsyncManager`.
+
         IMPORTANT NOTE: While calling :meth:`~cancel` effectively halts the worker's task, it DOES NOT terminate the
         execution of :meth:`run()<AsyncWorker.run>` (doing so could result in unwanted data corruption). Within
         :meth:`run()<AsyncWorker.run>`, you should poll the :attr:`~cancelled` flag intermittently and return early if
         it is True.
+
+        :param timeout: Number of seconds after which the worker is cancelled. Defaults to None (no timeout)
+        :type timeout: float, optional
         """
         super(CancellableAsyncWorker, self).__init__(*args, **kwargs)
-        self.cancelled: bool = False
+        self.timeout: Optional[float] = timeout
+        self.cancel_token: CancellationToken = CancellationToken()
+        self._done: bool = False
+        self._finish_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: True once the worker has been cancelled (or has timed out)."""
+        return self.cancel_token.cancelled
+
+    @cancelled.setter
+    def cancelled(self, value: bool) -> None:
+        if value:
+            self.cancel_token.cancel()
+        elif self.cancel_token.cancelled:
+            self.cancel_token = CancellationToken()
 
     def cancel(self) -> None:
         """Cancels the worker. A 'Cancelled' message is appended to both :attr:`~PySink.AsyncWorkerResults.warnings`
         and :attr:`~PySink.AsyncWorkerResults.errors`, and the :attr:`~PySink.AsyncWorkerSignals.finished` signal is
         emitted (similar to calling :meth:`~complete`). Once this method is called, all internal method calls/signal
-        updates will be ignored, and an internal flag called :attr:`~cancelled` is set to True.
+        updates will be ignored, and the worker's :attr:`~cancel_token` is cancelled, waking the worker up if it is
+        waiting in :meth:`~sleep`.
 
         IMPORTANT NOTE: While calling :meth:`~cancel` effectively halts the worker's task, it DOES NOT terminate the
         execution of :meth:`run()<AsyncWorker.run>` (doing so could result in unwanted data corruption). Within
         :meth:`run()<AsyncWorker.run>`, you should poll the :attr:`~cancelled` flag intermittently and return early if
         it is True.
         """
-        self.errors.append('Cancelled')
-        self.warnings.append('Cancelled')
-        self.cancelled = True
-        self.signals.finished.emit(self._load_default_results())
+        if self._done:
+            return
+        self._finish_cancelled('Cancelled')
+        self.cancel_token.cancel()
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleeps for the given number of seconds, returning early if the worker is cancelled. Typical usage within
+        :meth:`run()<AsyncWorker.run>` is ``if self.sleep(1): return``.
+
+        :param seconds: The number of seconds to sleep
+        :type seconds: float
+        :return: True if the worker has been cancelled
+        :rtype: bool
+        """
+        return self.cancel_token.sleep(seconds)
+
+    def start_timeout(self) -> None:
+        """Arms the worker's :attr:`~timeout`, if it has one. This is called by the :class:`~AsyncManager` when the
+        worker is started.
+        """
+        if self.timeout is not None:
+            self.cancel_token.add_callback(self._on_token_cancelled)
+            self.cancel_token.cancel_after(self.timeout)
 
     def reset(self):
-        self.cancelled = False
+        self.cancel_token.clear_timeout()
+        self.cancel_token = CancellationToken()
+        self._done = False
         super().reset()
 
     def update_progress(self, progress_value: int, message=None) -> None:
         if not self.cancelled:
             super().update_progress(progress_value, message)
 
+    def _flush_pending_progress(self) -> None:
+        if not self.cancelled:
+            super()._flush_pending_progress()
+
+    def emit_partial(self, items: list) -> bool:
+        if self.cancelled:
+            return False
+        return super().emit_partial(items)
+
+    def _acquire_partial_slot(self) -> bool:
+        # Poll so that a worker blocked by back-pressure still notices when it is cancelled
+        while not self._partial_slots.acquire(timeout=0.05):
+            if self.cancelled:
+                return False
+        return not self.cancelled
+
     def emit_start(self):
         if not self.cancelled:
             super().emit_start()
 
     def complete(self, **kwargs) -> None:
-        if not self.cancelled:
-            super().complete(**kwargs)
+        with self._finish_lock:
+            if self.cancelled or self._done:
+                return
+            self._done = True
+        self.cancel_token.clear_timeout()
+        super().complete(**kwargs)
+
+    def _on_token_cancelled(self) -> None:
+        if self.cancel_token.timed_out:
+            self._finish_cancelled('Timed out')
+
+    def _finish_cancelled(self, reason: str) -> None:
+        with self._finish_lock:
+            if self._done:
+                return
+            self._done = True
+        self.errors.append('Cancelled')
+        self.warnings.append('Cancelled')
+        if reason != 'Cancelled':
+            self.errors.append(reason)
+        self._post(WorkerEvent.FINISHED, self._load_default_results())
@@ -0,0 +1,145 @@
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+from typing import Optional, Callable
+from collections import deque
+import time
+from PySink.Objects import WorkerEvent
+
+
+class EventBus(QObject):
+    _wake = Signal()
+
+    def __init__(self, interval: int = 16, parent: Optional[QObject] = None):
+        """A queue of worker events drained on the GUI thread at a fixed cadence. Workers bound to the bus post compact
+        ``(worker_id, event, payload)`` records instead of emitting the signals of their own
+        :class:`~PySink.AsyncWorkerSignals`, which are then never created. Posting is a single append to a thread-safe
+        deque, and every `interval` milliseconds the records are dispatched, in the order they were posted, to the
+        callables subscribed to them. The bus's timer only runs while there is something to dispatch: it is started by
+        the first record posted, and stopped once every record has been dispatched and no bound worker remains.
+
+        The bus is created by an :class:`~AsyncManager` given an `event_bus_interval`, and the manager binds every worker
+        it starts to it. Additional subscribers can listen to every worker, a single worker, or all workers of a type.
+        Records are first handed to the manager, and the finished records of failed attempts that the manager retries
+        (see :class:`~PySink.RetryPolicy`) are not dispatched to the subscribers, which only see a worker's last attempt.
+
+        :param interval: Milliseconds between two dispatches. Defaults to 16 (about 60 times per second)
+        :type interval: int, optional
+        :param parent: The QObject parent of the bus
+        :type parent: QObject, optional
+        """
+        super(EventBus, self).__init__(parent)
+        self._records: deque = deque()
+        self._worker_types: {str: type} = {}
+        self._subscribers: list = []
+        self._id_subscribers: {str: list} = {}
+        self._type_subscribers: list = []
+        # Set by the manager that owns the bus. Called before the subscribers, and returns True to consume a record
+        self._owner: Optional[Callable] = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.dispatch)
+        self._timer_requested: bool = False
+        self._last_dispatch: float = 0.
+        self._wake.connect(self._start_timer)
+
+    @property
+    def pending_count(self) -> int:
+        """int: The number of records waiting to be dispatched."""
+        return len(self._records)
+
+    def bind(self, worker) -> None:
+        """Makes a worker post its events to the bus. Its signals are still emitted if they were created (e.g. because
+        something is connected to them).
+
+        :param worker: The worker to be bound
+        :type worker: AsyncWorker
+        """
+        self._worker_types[worker.id] = type(worker)
+        worker._bus = self
+
+    def post(self, worker_id: str, event: WorkerEvent, payload) -> None:
+        """Queues a record to be dispatched. May be called from any thread.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :param event: The kind of event
+        :type event: WorkerEvent
+        :param payload: The event's data
+        """
+        self._records.append((worker_id, event, payload))
+        if not self._timer_requested:
+            # Only the first record posted while the timer is stopped needs to cross over to the GUI thread
+            self._timer_requested = True
+            self._wake.emit()
+
+    def subscribe(self, callback: Callable, worker_id: Optional[str] = None, worker_type: Optional[type] = None) -> None:
+        """Registers a callable called as ``callback(worker_id, event, payload)`` for every dispatched record of the
+        given worker, or of workers of the given type (or a subclass of it). Without a filter, the callable receives the
+        records of every worker. Subscriptions to a single worker are removed once its finished record is dispatched.
+
+        :param callback: The callable to be called
+        :type callback: Callable
+        :param worker_id: Only dispatch the records of the worker with this id
+        :type worker_id: str, optional
+        :param worker_type: Only dispatch the records of workers of this type
+        :type worker_type: type, optional
+        """
+        if worker_id is not None:
+            self._id_subscribers.setdefault(worker_id, []).append(callback)
+        elif worker_type is not None:
+            self._type_subscribers.append((worker_type, callback))
+        else:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Removes every subscription of a callable.
+
+        :param callback: The callable to be removed
+        :type callback: Callable
+        """
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber != callback]
+        self._type_subscribers = [entry for entry in self._type_subscribers if entry[1] != callback]
+        for worker_id in list(self._id_subscribers):
+            callbacks = [subscriber for subscriber in self._id_subscribers[worker_id] if subscriber != callback]
+            if callbacks:
+                self._id_subscribers[worker_id] = callbacks
+            else:
+                self._id_subscribers.pop(worker_id)
+
+    def dispatch(self) -> None:
+        """Dispatches the queued records. This is called by the bus's timer, but can be called on the GUI thread to
+        deliver the records immediately.
+        """
+        self._last_dispatch = time.monotonic()
+        records = self._records
+        # Records posted by the callbacks themselves are left for the next dispatch
+        for _ in range(len(records)):
+            worker_id, event, payload = records.popleft()
+            if self._owner is not None and self._owner(worker_id, event, payload):
+                continue
+            for callback in self._subscribers:
+                callback(worker_id, event, payload)
+            for callback in self._id_subscribers.get(worker_id, ()):
+                callback(worker_id, event, payload)
+            if self._type_subscribers:
+                worker_type = self._worker_types.get(worker_id)
+                for subscribed_type, callback in self._type_subscribers:
+                    if worker_type is not None and issubclass(worker_type, subscribed_type):
+                        callback(worker_id, event, payload)
+            if event == WorkerEvent.FINISHED:
+                self._worker_types.pop(worker_id, None)
+                self._id_subscribers.pop(worker_id, None)
+        # Cleared before checking for records, so that a record posted meanwhile requests the timer again
+        self._timer_requested = False
+        if records or self._worker_types:
+            self._timer_requested = True
+        else:
+            self._timer.stop()
+
+    @Slot()
+    def _start_timer(self) -> None:
+        if self._timer.isActive():
+            return
+        self._timer.start()
+        # Records posted after an idle period are dispatched right away rather than one interval later
+        if 1000 * (time.monotonic() - self._last_dispatch) >= self._timer.interval():
+            self.dispatch()
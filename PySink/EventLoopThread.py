@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+from typing import Optional, Coroutine
+import asyncio
+import threading
+
+
+class EventLoopThread:
+    def __init__(self, name: str = 'PySinkEventLoop'):
+        """An asyncio event loop running forever on a dedicated daemon thread. The :class:`~AsyncManager` uses it to run
+        the coroutines of :class:`~AsyncCoroutineWorker` instances, so any number of I/O-bound workers can be run
+        concurrently by a single thread. The thread is started lazily, the first time a coroutine is submitted.
+
+        :param name: The name of the thread
+        :type name: str, optional
+        """
+        self.name: str = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """bool: True if the loop's thread has been started and not yet stopped."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coroutine: Coroutine) -> Future:
+        """Schedules a coroutine on the loop. This method is thread-safe.
+
+        :param coroutine: The coroutine to be run
+        :type coroutine: Coroutine
+        :return: A future representing the execution of the coroutine. Cancelling it cancels the coroutine
+        :rtype: concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the loop and waits for its thread to exit. Coroutines still running are abandoned. The loop will be
+        restarted if another coroutine is submitted afterwards.
+
+        :param timeout: The maximum number of seconds to wait for the thread to exit
+        :type timeout: float, optional
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, args=(self._loop,), name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
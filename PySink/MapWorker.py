@@ -0,0 +1,172 @@
+from PySide6.QtCore import Slot, QThreadPool
+from typing import Optional, Callable, Iterable
+from concurrent.futures import wait, FIRST_COMPLETED
+import itertools
+import threading
+from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+from PySink.ProcessPool import ProcessPool
+from PySink.Objects import MapWorkerSignals
+
+
+def _run_chunk(func: Callable, chunk: list) -> list:
+    return [func(item) for item in chunk]
+
+
+class MapWorker(CancellableAsyncWorker):
+    def __init__(self, func: Callable, iterable: Iterable, chunksize: int = 1, use_processes: bool = False,
+                 ordered: bool = True, identifier: Optional[str] = None, process_pool: Optional[ProcessPool] = None,
+                 timeout: Optional[float] = None):
+        """A :class:`~CancellableAsyncWorker` that applies a callable to every item of an iterable, splitting the items
+        into chunks that are processed in parallel. Workers like this one are usually created with
+        :meth:`AsyncManager.map`.
+
+        With threads (the default), the worker processes chunks itself and borrows any idle threads of the
+        :class:`~AsyncManager`'s thread pool to process the others, so it never waits for a thread to become free. With
+        `use_processes`, every chunk is submitted to the :class:`~ProcessPool` instead, in which case `func` (and the
+        items) must be picklable.
+
+        The progress of all chunks is aggregated into the worker's own progress signal, and each chunk's results are
+        emitted via :attr:`signals.chunk_finished<PySink.MapWorkerSignals.chunk_finished>` as soon as they are
+        available: in input order if `ordered` is True, otherwise in the order the chunks complete. Once every chunk is
+        processed, the worker completes with the list of results as ``results``, in the same order. If `func` raises,
+        the remaining chunks are abandoned and the exception is appended to :attr:`~AsyncWorker.errors`.
+
+        :param func: The callable applied to each item
+        :type func: Callable
+        :param iterable: The items to be processed
+        :type iterable: Iterable
+        :param chunksize: The number of items per chunk. Defaults to 1
+        :type chunksize: int, optional
+        :param use_processes: Whether to process the chunks in child processes. Defaults to False
+        :type use_processes: bool, optional
+        :param ordered: Whether results are delivered in input order rather than completion order. Defaults to True
+        :type ordered: bool, optional
+        :param identifier: A unique identifier to differentiate this worker from other workers. Defaults to a uuid4 string
+        :type identifier: str, optional
+        :param process_pool: The pool to run the chunks on when `use_processes` is True. Defaults to the
+            :attr:`~AsyncManager.process_pool` of the manager that starts the worker
+        :type process_pool: ProcessPool, optional
+        :param timeout: Number of seconds after which the worker is cancelled. Defaults to None (no timeout)
+        :type timeout: float, optional
+        """
+        super(MapWorker, self).__init__(identifier=identifier, timeout=timeout)
+        if chunksize < 1:
+            raise Exception('chunksize must be at least 1')
+        self.signals: MapWorkerSignals = MapWorkerSignals()
+        self.func: Callable = func
+        self.iterable: Iterable = iterable
+        self.chunksize: int = chunksize
+        self.use_processes: bool = use_processes
+        self.ordered: bool = ordered
+        self.process_pool: Optional[ProcessPool] = process_pool
+        self.threadpool: Optional[QThreadPool] = None
+        self._try_start: Optional[Callable[[Callable], bool]] = None
+        self._chunks: list = []
+        self._chunk_results: list = []
+        self._delivered: list = []
+        self._next_delivery: int = 0
+        self._items_done: int = 0
+        self._item_count: int = 0
+        self._next_chunk = None
+        self._in_flight: int = 0
+        self._lock = threading.Condition()
+
+    @Slot()
+    def run(self) -> None:
+        if self.cancelled:
+            return
+        if self.use_processes and self.process_pool is None:
+            self.errors.append('No process pool available to run the task')
+            self.complete()
+            return
+        self.emit_start()
+        iterator = iter(self.iterable)
+        self._chunks = list(iter(lambda: list(itertools.islice(iterator, self.chunksize)), []))
+        self._chunk_results = [None] * len(self._chunks)
+        self._delivered, self._next_delivery = [], 0
+        self._items_done, self._item_count = 0, sum(self._chunk_weight(chunk) for chunk in self._chunks)
+        self.update_progress(0)
+        if self.use_processes:
+            self._run_processes()
+        else:
+            self._run_threads()
+        if self.cancelled:
+            return
+        if self.errors:
+            self.complete()
+        else:
+            self.complete(results=[result for chunk in self._delivered for result in chunk])
+
+    def _run_threads(self) -> None:
+        self._next_chunk = iter(range(len(self._chunks)))
+        self._in_flight = 0
+        if self.threadpool is not None:
+            # The manager lends its idle threads through _try_start, so that its scheduler knows they are taken
+            try_start = self.threadpool.tryStart if self._try_start is None else self._try_start
+            for _ in range(len(self._chunks) - 1):
+                if not try_start(self._process_chunks):
+                    break
+        self._process_chunks()
+        # Helpers may not have picked up a chunk yet: only wait for the chunks that are being processed
+        with self._lock:
+            while self._in_flight:
+                self._lock.wait()
+
+    def _process_chunks(self) -> None:
+        while not self.cancelled:
+            with self._lock:
+                index = None if self.errors else next(self._next_chunk, None)
+                if index is None:
+                    return
+                self._in_flight += 1
+            try:
+                results = _run_chunk(self.func, self._chunks[index])
+            except Exception as exception:
+                results = None
+                with self._lock:
+                    self.errors.append(f'Chunk {index}: {type(exception).__name__}: {exception}')
+            if results is not None:
+                self._chunk_done(index, results)
+            with self._lock:
+                self._in_flight -= 1
+                self._lock.notify_all()
+
+    def _run_processes(self) -> None:
+        futures = {self.process_pool.submit(_run_chunk, self.func, chunk): index
+                   for index, chunk in enumerate(self._chunks)}
+        pending = set(futures)
+        while pending:
+            if self.cancelled or self.errors:
+                for future in pending:
+                    future.cancel()
+                return
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results = future.result()
+                except Exception as exception:
+                    self.errors.append(f'Chunk {futures[future]}: {type(exception).__name__}: {exception}')
+                    continue
+                self._chunk_done(futures[future], results)
+
+    def _chunk_weight(self, chunk: list) -> int:
+        # Share of the total progress represented by a chunk
+        return len(chunk)
+
+    def _chunk_done(self, index: int, results: list) -> None:
+        with self._lock:
+            if self.errors:
+                return
+            self._chunk_results[index] = results
+            self._items_done += self._chunk_weight(self._chunks[index])
+            if self.ordered:
+                ready = []
+                while self._next_delivery < len(self._chunks) and self._chunk_results[self._next_delivery] is not None:
+                    ready.append(self._next_delivery)
+                    self._next_delivery += 1
+            else:
+                ready = [index]
+            for ready_index in ready:
+                self._delivered.append(self._chunk_results[ready_index])
+                self.signals.chunk_finished.emit(ready_index, self._chunk_results[ready_index])
+            self.update_progress(100 * self._items_done / self._item_count)
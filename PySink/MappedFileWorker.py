@@ -0,0 +1,100 @@
+from PySide6.QtCore import Slot
+from typing import Optional, Callable
+from functools import partial
+import mmap
+import os
+from PySink.MapWorker import MapWorker
+from PySink.ProcessPool import ProcessPool
+
+
+def _map_range(path: str, func: Callable, byte_range: tuple):
+    start, end = byte_range
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    whole = memoryview(mapped)
+    view = whole[start:end]
+    try:
+        return func(view)
+    finally:
+        try:
+            view.release()
+            whole.release()
+            mapped.close()
+        except BufferError:
+            # func kept a view of the chunk: the file is unmapped once that view is garbage collected
+            pass
+
+
+class MappedFileWorker(MapWorker):
+    def __init__(self, path: str, func: Callable, chunk_size: int = 4 * 2 ** 20, delimiter: bytes = b'\n',
+                 use_processes: bool = False, ordered: bool = True, identifier: Optional[str] = None,
+                 process_pool: Optional[ProcessPool] = None, timeout: Optional[float] = None):
+        """A :class:`~MapWorker` that processes a large file in parallel. The file is memory-mapped and split into
+        chunks of about `chunk_size` bytes, each extended up to the next `delimiter` so that no record is split between
+        two chunks. Workers like this one are usually created with :meth:`AsyncManager.map_file`.
+
+        `func` is called with a read-only memoryview of each chunk (a view of the mapped file, not a copy), and its
+        return values are delivered like the results of a :class:`~MapWorker`: per chunk via
+        :attr:`signals.chunk_finished<PySink.MapWorkerSignals.chunk_finished>`, and as the ``results`` list once the
+        whole file is processed. Progress is reported from the number of bytes processed, and a cancelled worker stops
+        before its next chunk. Views of a chunk should not be kept once `func` returns.
+
+        :param path: The path of the file to be processed
+        :type path: str
+        :param func: The callable applied to each chunk. Must be picklable if `use_processes` is True
+        :type func: Callable
+        :param chunk_size: The approximate size of each chunk in bytes. Defaults to 4 MiB
+        :type chunk_size: int, optional
+        :param delimiter: The bytes ending each record. Defaults to a newline
+        :type delimiter: bytes, optional
+        :param use_processes: Whether to process the chunks in child processes. Defaults to False
+        :type use_processes: bool, optional
+        :param ordered: Whether results are delivered in file order rather than completion order. Defaults to True
+        :type ordered: bool, optional
+        :param identifier: A unique identifier to differentiate this worker from other workers. Defaults to a uuid4 string
+        :type identifier: str, optional
+        :param process_pool: The pool to run the chunks on when `use_processes` is True. Defaults to the
+            :attr:`~AsyncManager.process_pool` of the manager that starts the worker
+        :type process_pool: ProcessPool, optional
+        :param timeout: Number of seconds after which the worker is cancelled. Defaults to None (no timeout)
+        :type timeout: float, optional
+        """
+        super(MappedFileWorker, self).__init__(partial(_map_range, path, func), [], 1, use_processes, ordered,
+                                               identifier, process_pool, timeout)
+        if chunk_size < 1:
+            raise Exception('chunk_size must be at least 1')
+        if not delimiter:
+            raise Exception('delimiter cannot be empty')
+        self.path: str = path
+        self.chunk_size: int = chunk_size
+        self.delimiter: bytes = delimiter
+
+    @Slot()
+    def run(self) -> None:
+        if self.cancelled:
+            return
+        try:
+            self.iterable = self._record_ranges()
+        except OSError as exception:
+            self.errors.append(f'{type(exception).__name__}: {exception}')
+            self.complete()
+            return
+        super().run()
+
+    def _record_ranges(self) -> list:
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return []
+        ranges, start = [], 0
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            while start < size:
+                end = start + self.chunk_size
+                if end < size:
+                    index = mapped.find(self.delimiter, end - 1)
+                    end = size if index < 0 else index + len(self.delimiter)
+                ranges.append((start, min(end, size)))
+                start = end
+        return ranges
+
+    def _chunk_weight(self, chunk: list) -> int:
+        return sum(end - start for start, end in chunk)
@@ -0,0 +1,12 @@
+class AsyncWorkerPartialResults:
+    """Class to store a batch of partial results streamed by an :class:`AsyncWorker` before it completes."""
+
+    __slots__ = ('items', 'index', 'id')
+
+    def __init__(self, items: list = None, index: int = 0, id: str = None):
+        self.items: list = items if items is not None else []   #: list: The items of the batch.
+        self.index: int = index                                 #: int: Position of the batch in the worker's stream, starting at 0.
+        self.id: str = id                                       #: str: The worker's unique identifier.
+
+    def __str__(self):
+        return f'Partial Results {self.index} from Worker {self.id}: Items = {len(self.items)}'
@@ -1,12 +1,19 @@
+from typing import Optional
 
 
 class AsyncWorkerProgress:
     """Class to store the progress of an :class:`AsyncWorker`."""
 
-    value = 0               #: Union[int, float]: Current progress value. For determinate progress, value should be [0, 100]. Indeterminate progress value should be -1.
-    message: str = None     #: str, optional: Status message about the worker's progress (Downloading, Calculating, etc).
-    id: str = None          #: str: The worker's unique identifier.
+    __slots__ = ('value', 'message', 'id', 'elapsed', 'rate', 'eta')
+
+    def __init__(self, value=0, message: str = None, id: str = None, elapsed: Optional[float] = None,
+                 rate: Optional[float] = None, eta: Optional[float] = None):
+        self.value = value                       #: Union[int, float]: Current progress value. For determinate progress, value should be [0, 100]. Indeterminate progress value should be -1.
+        self.message: str = message              #: str, optional: Status message about the worker's progress (Downloading, Calculating, etc).
+        self.id: str = id                        #: str: The worker's unique identifier.
+        self.elapsed: Optional[float] = elapsed  #: float, optional: Seconds since the worker began reporting progress.
+        self.rate: Optional[float] = rate        #: float, optional: Smoothed rate of progress per second, in units of :attr:`AsyncWorker.progress_total<PySink.AsyncWorker.progress_total>` (percentage points if it is not set). None while unknown or indeterminate.
+        self.eta: Optional[float] = eta          #: float, optional: Estimated number of seconds until the worker reaches 100. None while unknown or indeterminate.
 
     def __str__(self):
         return f'Progress from Worker {self.id}: Value = {self.value}, Message = {self.message}'
-
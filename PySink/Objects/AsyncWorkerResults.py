@@ -2,12 +2,14 @@
 class AsyncWorkerResults:
     """Class to store the results of an :class:`AsyncWorker`. Custom result types should inherit from this class."""
 
-    warnings = []       #: list: Warnings encountered by the worker.
-    errors = []         #: list: Errors encountered by the worker.
-    id = None           #: str: The worker's unique identifier.
-    results_dict = {}   #: dict: Results of the worker's task defined as key-value pairs.
+    __slots__ = ('warnings', 'errors', 'id', 'results_dict', '__weakref__')
+
+    def __init__(self):
+        self.warnings: list = []        #: list: Warnings encountered by the worker.
+        self.errors: list = []          #: list: Errors encountered by the worker.
+        self.id: str = None             #: str: The worker's unique identifier.
+        self.results_dict: dict = {}    #: dict: Results of the worker's task defined as key-value pairs.
 
     def __str__(self):
         return f'Results of Worker {self.id}: Warnings = {self.warnings}, Errors = {self.errors}, ResultsDict = {self.results_dict}'
 
-
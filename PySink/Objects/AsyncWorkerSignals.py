@@ -1,11 +1,12 @@
 from PySide6.QtCore import QObject, Signal
-from PySink.Objects import AsyncWorkerProgress, AsyncWorkerResults
+from PySink.Objects import AsyncWorkerProgress, AsyncWorkerResults, AsyncWorkerPartialResults
 
 
 class AsyncWorkerSignals(QObject):
 
     started = Signal(str)                   #: Signal(str): Signals that the worker has started its task. Contains the workers unique identified.
     progress = Signal(AsyncWorkerProgress)  #: Signal(:class:`~AsyncWorkerProgress`): Signal that contains progress information for the worker.
+    partial_results = Signal(AsyncWorkerPartialResults)    #: Signal(:class:`~AsyncWorkerPartialResults`): Signal that contains a batch of results streamed by the worker before it finishes.
     finished = Signal(AsyncWorkerResults)   #: Signal(:class:`~AsyncWorkerResults`): Signals that a worker has finished its task and contains the results of the worker's task.
 
     def __init__(self):
@@ -0,0 +1,119 @@
+from typing import Optional, Callable
+import threading
+import time
+
+
+class CancellationToken:
+    def __init__(self, timeout: Optional[float] = None):
+        """Thread-safe flag used to request the cancellation of a worker's task. Besides being polled through
+        :attr:`~cancelled`, the token can be waited on: :meth:`~wait` and :meth:`~sleep` return as soon as the token is
+        cancelled, so a worker blocked in them reacts to cancellation immediately. A token can also cancel itself once
+        a timeout expires.
+
+        :param timeout: Number of seconds after which the token cancels itself. Defaults to None (no timeout)
+        :type timeout: float, optional
+        """
+        self.deadline: Optional[float] = None   #: float, optional: :func:`time.monotonic` time at which the token cancels itself.
+        self.timed_out: bool = False            #: bool: True if the token was cancelled by its timeout.
+        self._event = threading.Event()
+        self._callbacks: list = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        if timeout is not None:
+            self.cancel_after(timeout)
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: True once the token has been cancelled."""
+        return self._event.is_set()
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """float, optional: Seconds left before the token's timeout expires, or None if it has no timeout."""
+        if self.deadline is None:
+            return None
+        return max(0., self.deadline - time.monotonic())
+
+    def cancel(self) -> bool:
+        """Cancels the token, waking up every thread blocked in :meth:`~wait` or :meth:`~sleep` and calling the
+        registered callbacks.
+
+        :return: True if this call cancelled the token, False if it was already cancelled
+        :rtype: bool
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+            self._stop_timer()
+        for callback in callbacks:
+            callback()
+        return True
+
+    def cancel_after(self, seconds: float) -> None:
+        """Cancels the token once the given number of seconds has elapsed, replacing any previous timeout.
+
+        :param seconds: The timeout in seconds
+        :type seconds: float
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._stop_timer()
+            self.deadline = time.monotonic() + seconds
+            self._timer = threading.Timer(seconds, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def clear_timeout(self) -> None:
+        """Removes the token's timeout, if it has one."""
+        with self._lock:
+            self._stop_timer()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Registers a callable to be called (from the cancelling thread) when the token is cancelled. If the token is
+        already cancelled, the callable is called immediately.
+
+        :param callback: The callable to be called
+        :type callback: Callable
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the token is cancelled or the timeout expires.
+
+        :param timeout: The maximum number of seconds to wait. Defaults to None (wait until cancelled)
+        :type timeout: float, optional
+        :return: True if the token was cancelled
+        :rtype: bool
+        """
+        return self._event.wait(timeout)
+
+    def sleep(self, seconds: float) -> bool:
+        """Equivalent of :func:`time.sleep` that returns early if the token is cancelled. Typical usage within a worker's
+        task is ``if self.cancel_token.sleep(1): return``.
+
+        :param seconds: The number of seconds to sleep
+        :type seconds: float
+        :return: True if the token was cancelled
+        :rtype: bool
+        """
+        return self._event.wait(seconds)
+
+    def _expire(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.timed_out = True
+        self.cancel()
+
+    def _stop_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self.deadline = None
@@ -0,0 +1,28 @@
+from typing import Optional
+
+
+class ManagerMetrics:
+    """Class to store a snapshot of the state of an :class:`AsyncManager` with metrics enabled."""
+
+    __slots__ = ('timestamp', 'active_workers', 'queued_workers', 'running_workers', 'active_threads',
+                 'finished_workers', 'cancelled_workers', 'progress_events', 'rate', 'eta')
+
+    def __init__(self, timestamp: float = 0., active_workers: int = 0, queued_workers: int = 0,
+                 running_workers: int = 0, active_threads: int = 0, finished_workers: int = 0,
+                 cancelled_workers: int = 0, progress_events: int = 0, rate: float = 0., eta: Optional[float] = None):
+        self.timestamp: float = timestamp                #: float: :func:`time.monotonic` time of the snapshot.
+        self.active_workers: int = active_workers        #: int: Workers started that have not yet finished.
+        self.queued_workers: int = queued_workers        #: int: Workers waiting in the manager's queue.
+        self.running_workers: int = running_workers      #: int: Thread-based workers currently running their task.
+        self.active_threads: int = active_threads        #: int: Active threads of the manager's thread pool.
+        self.finished_workers: int = finished_workers    #: int: Workers finished since metrics were enabled.
+        self.cancelled_workers: int = cancelled_workers  #: int: Workers cancelled since metrics were enabled.
+        self.progress_events: int = progress_events      #: int: Progress updates received since metrics were enabled.
+        self.rate: float = rate                          #: float: Sum of the rates of progress of the active workers (see :attr:`AsyncWorkerProgress.rate<PySink.AsyncWorkerProgress.rate>`), only meaningful if they share a unit.
+        self.eta: Optional[float] = eta                  #: float, optional: Longest estimated time remaining among the active workers, or None if no worker has an estimate.
+
+    def __str__(self):
+        return f'Manager Metrics: Active = {self.active_workers}, Queued = {self.queued_workers}, ' \
+               f'Running = {self.running_workers}, Threads = {self.active_threads}, ' \
+               f'Finished = {self.finished_workers}, Cancelled = {self.cancelled_workers}, ' \
+               f'Progress Events = {self.progress_events}'
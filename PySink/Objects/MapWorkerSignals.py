@@ -0,0 +1,11 @@
+from PySide6.QtCore import Signal
+from PySink.Objects.AsyncWorkerSignals import AsyncWorkerSignals
+
+
+class MapWorkerSignals(AsyncWorkerSignals):
+
+    chunk_finished = Signal(int, list)      #: Signal(int, list): Signals that a chunk of a :class:`~PySink.MapWorker` has been processed. Contains the index of the chunk and its results.
+
+    def __init__(self):
+        """Class to store the signals of a :class:`~PySink.MapWorker`."""
+        super(MapWorkerSignals, self).__init__()
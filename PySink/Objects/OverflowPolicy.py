@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class OverflowPolicy(str, Enum):
+    """Policy applied when a worker is started on a :class:`lane<PySink.WorkerLane>` whose queue is full."""
+
+    REJECT = 'reject'               #: :meth:`~PySink.AsyncManager.start_worker` raises an exception.
+    BLOCK = 'block'                 #: The manager holds the worker and queues it once the lane has room.
+    DROP_OLDEST = 'drop_oldest'     #: The oldest queued worker of the lane is dropped and finishes with a 'Dropped' error.
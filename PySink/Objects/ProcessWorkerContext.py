@@ -0,0 +1,90 @@
+from functools import partial
+from PySink.Objects.ProgressFlusher import ProgressFlusher
+import threading
+import time
+
+
+class ProcessWorkerContext:
+    """Object passed as the first argument to the task of a :class:`~PySink.ProcessAsyncWorker`. It is used from within
+    the child process to report progress and to check whether the worker has been cancelled."""
+
+    def __init__(self, worker_id: str, connection, progress_interval: float = 0.02):
+        self.id: str = worker_id    #: str: The unique identifier of the worker running the task.
+        self._connection = connection
+        self._cancelled: bool = False
+        self._next_cancel_poll: float = 0.
+        self._progress_interval: float = progress_interval
+        self._last_progress = None
+        self._last_progress_time: float = 0.
+        self._pending_progress = None
+        self._progress_lock = threading.Lock()
+        self._flush_due = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_progress_lock'] = state['_flush_due'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._progress_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: True if the worker has been cancelled. Tasks should poll this flag and return early if it is True.
+        The pipe the worker sends the cancellation through is polled at most once per millisecond, so checking the
+        flag is cheap enough for tight loops."""
+        if not self._cancelled:
+            now = time.monotonic()
+            if now >= self._next_cancel_poll:
+                self._next_cancel_poll = now + 0.001
+                # The only message the worker ever sends to the child is the cancellation
+                self._cancelled = self._connection.poll()
+        return self._cancelled
+
+    def update_progress(self, progress_value: int, message: str = '') -> None:
+        """Sends a progress value and message back to the worker, where it is emitted via the
+        :attr:`~PySink.AsyncWorkerSignals.progress` signal. Sending crosses a process boundary, so updates are
+        coalesced within the child process: repeated values are dropped, and updates arriving faster than the
+        worker can relay them are held back for a few milliseconds, keeping only the latest. Updates onto a boundary
+        (0, 100 or indeterminate) are always sent immediately.
+
+        :param progress_value: The current progress value. For discrete behavior, this value should be [0, 100].
+            For indeterminate behavior, this value should be -1.
+        :type progress_value: int
+        :param message: A message describing the current progress stage of the task
+        :type message: str, optional
+        """
+        progress = (progress_value, message)
+        with self._progress_lock:
+            if progress == self._last_progress:
+                self._pending_progress = None
+                return
+            now = time.monotonic()
+            boundary = progress_value <= 0 or progress_value >= 100
+            remaining = self._progress_interval - (now - self._last_progress_time)
+            if not boundary and remaining > 0:
+                self._pending_progress = progress
+                if self._flush_due is None:
+                    due = self._flush_due = now + remaining
+                    ProgressFlusher.instance().schedule(due, partial(self._flush_when_due, due))
+                return
+            self._send_progress(progress, now)
+
+    def _flush_progress(self) -> None:
+        # Called once the task has returned
+        with self._progress_lock:
+            if self._pending_progress is not None:
+                self._send_progress(self._pending_progress, time.monotonic())
+
+    def _flush_when_due(self, due: float) -> None:
+        # Called by the flusher, unless the held back update has been replaced by one sent in the meantime
+        with self._progress_lock:
+            if self._flush_due == due and self._pending_progress is not None:
+                self._send_progress(self._pending_progress, time.monotonic())
+
+    def _send_progress(self, progress: tuple, now: float) -> None:
+        self._pending_progress = self._flush_due = None
+        self._last_progress = progress
+        self._last_progress_time = now
+        self._connection.send(progress)
@@ -0,0 +1,74 @@
+from typing import Callable
+import itertools
+import threading
+import heapq
+import time
+import os
+
+
+class ProgressFlusher:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """Single daemon thread that calls back throttled progress reporters once the progress update they held back
+        is due. It is shared by every worker of a process (see :meth:`~instance`), so that throttling progress does not
+        start a timer thread per held back update.
+        """
+        self._heap: list = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='ProgressFlusher', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls) -> 'ProgressFlusher':
+        """Returns the flusher of the current process, creating it on first use.
+
+        :return: The shared flusher
+        :rtype: ProgressFlusher
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def schedule(self, due: float, callback: Callable[[], None]) -> None:
+        """Calls the given callable from the flusher's thread once :func:`time.monotonic` reaches `due`. Scheduled
+        calls cannot be withdrawn: callers are expected to ignore calls that are no longer needed.
+
+        :param due: The :func:`time.monotonic` time at which the callable is called
+        :type due: float
+        :param callback: The callable
+        :type callback: Callable
+        """
+        with self._condition:
+            heapq.heappush(self._heap, (due, next(self._counter), callback))
+            if self._heap[0][0] == due:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._condition.wait(self._heap[0][0] - now if self._heap else None)
+                callback = heapq.heappop(self._heap)[2]
+            try:
+                callback()
+            except Exception:
+                # A reporter whose signals were deleted must not stop the flushing of every other reporter
+                pass
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # The thread of the parent's flusher does not exist in a forked child
+        cls._instance = None
+        cls._instance_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=ProgressFlusher._reset_after_fork)
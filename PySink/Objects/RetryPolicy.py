@@ -0,0 +1,65 @@
+from typing import Optional, Callable
+import random
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, delay: float = 1., backoff: float = 2., max_delay: Optional[float] = 60.,
+                 jitter: float = 0.1, retry_on: Optional[Callable[[list], bool]] = None):
+        """Describes how an :class:`~PySink.AsyncManager` retries a worker that finishes with errors. The n-th retry is
+        queued `delay * backoff ** (n - 1)` seconds after the failed attempt finished (capped at `max_delay`), randomly
+        spread by up to `jitter` of that delay so that workers failing together do not all retry at the same time.
+
+        Workers cancelled with :meth:`~PySink.AsyncManager.cancel_worker` or dropped from a full lane are never
+        retried. Workers that timed out are retried too, but only once their previous attempt has returned from
+        :meth:`~PySink.AsyncWorker.run`, so that the same worker never runs twice at once. A worker that polls
+        :attr:`~PySink.CancellableAsyncWorker.cancelled` returns soon after timing out.
+
+        :param max_attempts: The maximum number of times the worker is run, including the first attempt. Defaults to 3
+        :type max_attempts: int, optional
+        :param delay: Seconds to wait before the first retry. Defaults to 1
+        :type delay: float, optional
+        :param backoff: Factor applied to the delay after every retry. Defaults to 2
+        :type backoff: float, optional
+        :param max_delay: The maximum number of seconds between two attempts. Defaults to 60 (None for unbounded)
+        :type max_delay: float, optional
+        :param jitter: Fraction of the delay by which it is randomly lengthened or shortened [0, 1]. Defaults to 0.1
+        :type jitter: float, optional
+        :param retry_on: Predicate called with the :attr:`~PySink.AsyncWorkerResults.errors` of a failed attempt,
+            returning whether the worker should be retried. Defaults to None (every failure is retried)
+        :type retry_on: Callable, optional
+        """
+        if max_attempts < 1:
+            raise Exception('max_attempts must be at least 1')
+        self.max_attempts: int = max_attempts
+        self.delay: float = delay
+        self.backoff: float = backoff
+        self.max_delay: Optional[float] = max_delay
+        self.jitter: float = jitter
+        self.retry_on: Optional[Callable[[list], bool]] = retry_on
+
+    def should_retry(self, errors: list, attempt: int) -> bool:
+        """Returns whether a worker should be run again after the given attempt finished with the given errors.
+
+        :param errors: The errors of the failed attempt
+        :type errors: list
+        :param attempt: The number of the failed attempt, starting at 1
+        :type attempt: int
+        :return: True if the worker should be retried
+        :rtype: bool
+        """
+        if not errors or attempt >= self.max_attempts or 'Dropped' in errors:
+            return False
+        return self.retry_on is None or bool(self.retry_on(errors))
+
+    def get_delay(self, attempt: int) -> float:
+        """Returns the number of seconds to wait before running a worker again after the given failed attempt.
+
+        :param attempt: The number of the failed attempt, starting at 1
+        :type attempt: int
+        :return: The delay in seconds
+        :rtype: float
+        """
+        delay = self.delay * self.backoff ** (attempt - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return max(0., delay * (1 + random.uniform(-self.jitter, self.jitter)))
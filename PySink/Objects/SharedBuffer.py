@@ -0,0 +1,101 @@
+from multiprocessing import shared_memory
+from typing import Optional
+import os
+
+# On Windows, a shared memory block is destroyed as soon as no process has it open, so blocks created by a process are
+# kept open by that process until they are released from it, or until another process has attached to them
+_kept_open: dict = {}
+
+
+class SharedBuffer:
+    def __init__(self, size: int, name: Optional[str] = None):
+        """A block of shared memory used to hand large payloads from a child process to the GUI thread without copying
+        them. A task run by a :class:`~PySink.ProcessAsyncWorker` creates the buffer, writes its data into
+        :attr:`~buffer` (e.g. through ``numpy.frombuffer(shared.buffer, dtype)``) and returns the buffer as one of its
+        results. Only the name of the block is pickled back to the main process, where the results then expose a view
+        of the very same memory.
+
+        The :class:`~PySink.AsyncManager` owns every buffer found among the values of a finished worker's
+        :attr:`~PySink.AsyncWorkerResults.results_dict`: once the results have been consumed, the buffers are freed with
+        :meth:`AsyncManager.release_shared_buffers<PySink.AsyncManager.release_shared_buffers>`. Buffers that are never
+        released are freed when the application exits.
+
+        :param size: The size of the buffer in bytes
+        :type size: int
+        :param name: The name of an existing block to attach to. Defaults to None (a new block is created)
+        :type name: str, optional
+        """
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            if os.name == 'nt':
+                _kept_open[self._memory.name] = self._memory
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self.size: int = size   #: int: The size of the buffer in bytes.
+        self._released: bool = False
+
+    @classmethod
+    def from_buffer(cls, data) -> 'SharedBuffer':
+        """Creates a buffer holding a copy of any bytes-like object. Writing into :attr:`~buffer` directly avoids this
+        copy.
+
+        :param data: The data to be copied (bytes, bytearray, memoryview, numpy array, etc)
+        :return: The new buffer
+        :rtype: SharedBuffer
+        """
+        view = memoryview(data).cast('B')
+        shared = cls(view.nbytes)
+        shared.buffer[:] = view
+        return shared
+
+    @property
+    def name(self) -> str:
+        """str: The name of the underlying shared memory block."""
+        return self._memory.name
+
+    @property
+    def buffer(self) -> memoryview:
+        """memoryview: A writable view of the buffer's memory."""
+        if self._released:
+            raise Exception(f'Shared buffer {self.name} has been released')
+        return self._memory.buf[:self.size]
+
+    @property
+    def released(self) -> bool:
+        """bool: True once the buffer has been released."""
+        return self._released
+
+    def release(self) -> None:
+        """Frees the shared memory block. Views of the buffer must not be used afterwards: the memory is unmapped once
+        the last of them is garbage collected.
+        """
+        if self._released:
+            return
+        self._released = True
+        _kept_open.pop(self._memory.name, None)
+        try:
+            self._memory.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            self._memory.close()
+        except BufferError:
+            # Views of the buffer are still alive: the mapping is closed when they are garbage collected
+            pass
+
+    def _detach(self) -> None:
+        # Closes this process' handle without freeing the block, which stays alive for the processes attached to it
+        _kept_open.pop(self._memory.name, None)
+        try:
+            self._memory.close()
+        except BufferError:
+            pass
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __reduce__(self):
+        return SharedBuffer, (self.size, self.name)
+
+    def __str__(self):
+        return f'Shared Buffer {self.name}: {self.size} bytes'
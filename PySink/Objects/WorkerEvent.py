@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class WorkerEvent(str, Enum):
+    """Kind of a record posted by a worker to an :class:`~PySink.EventBus`. Each value is also the name of the
+    corresponding :class:`~PySink.AsyncWorkerSignals` signal."""
+
+    STARTED = 'started'                     #: The worker started its task. The payload is the worker's id.
+    PROGRESS = 'progress'                   #: The payload is an :class:`~PySink.AsyncWorkerProgress`.
+    PARTIAL_RESULTS = 'partial_results'     #: The payload is an :class:`~PySink.AsyncWorkerPartialResults`.
+    FINISHED = 'finished'                   #: The worker finished. The payload is its :class:`~PySink.AsyncWorkerResults`.
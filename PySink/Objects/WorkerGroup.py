@@ -0,0 +1,55 @@
+class WorkerGroup:
+    """Class to store the aggregate state of the workers of an :class:`AsyncManager` that share the same
+    :attr:`~PySink.AsyncWorker.group`. The state is updated incrementally as the workers report progress and finish."""
+
+    __slots__ = ('name', 'worker_count', 'finished_count', 'failed_count', 'cancelled_count', 'total_weight',
+                 'weighted_progress', '_active')
+
+    def __init__(self, name: str):
+        self.name: str = name               #: str: The name of the group.
+        self.worker_count: int = 0          #: int: Workers added to the group.
+        self.finished_count: int = 0        #: int: Workers of the group that have finished (including failed and cancelled workers).
+        self.failed_count: int = 0          #: int: Workers of the group that finished with errors (including cancelled workers).
+        self.cancelled_count: int = 0       #: int: Workers of the group that were cancelled.
+        self.total_weight: float = 0.       #: float: Sum of the :attr:`~PySink.AsyncWorker.group_weight` of the group's workers.
+        self.weighted_progress: float = 0.  #: float: Sum of the progress of the group's workers, multiplied by their weight.
+        self._active: {str: list} = {}     # [weight, progress] of the unfinished workers, keyed by worker id
+
+    @property
+    def progress(self) -> float:
+        """float: Weighted average progress of the group's workers [0, 100]. Finished workers count as 100."""
+        if self.total_weight <= 0:
+            return 0.
+        return self.weighted_progress / self.total_weight
+
+    @property
+    def worker_ids(self) -> list:
+        """list: The ids of the unfinished workers of the group."""
+        return list(self._active)
+
+    @property
+    def done(self) -> bool:
+        """bool: True once every worker of the group has finished."""
+        return not self._active
+
+    def _add(self, worker_id: str, weight: float) -> None:
+        self._active[worker_id] = [weight, 0.]
+        self.worker_count += 1
+        self.total_weight += weight
+
+    def _update(self, worker_id: str, value: float) -> None:
+        entry = self._active.get(worker_id)
+        if entry is not None:
+            self.weighted_progress += entry[0] * (value - entry[1])
+            entry[1] = value
+
+    def _finish(self, worker_id: str, failed: bool, cancelled: bool) -> None:
+        self._update(worker_id, 100.)
+        if self._active.pop(worker_id, None) is not None:
+            self.finished_count += 1
+            self.failed_count += failed
+            self.cancelled_count += cancelled
+
+    def __str__(self):
+        return f'Worker Group {self.name}: Progress = {self.progress:.1f}, Finished = {self.finished_count}/' \
+               f'{self.worker_count}, Failed = {self.failed_count}, Cancelled = {self.cancelled_count}'
@@ -0,0 +1,35 @@
+from typing import Optional
+
+
+class WorkerStats:
+    """Class to store the lifecycle timestamps of a worker, as recorded by an :class:`AsyncManager` with metrics enabled.
+    Timestamps are :func:`time.monotonic` values, and are None until the corresponding event occurs."""
+
+    __slots__ = ('id', 'worker_type', 'submitted_at', 'started_at', 'finished_at', 'cancelled_at', 'progress_count')
+
+    def __init__(self, worker_id: str, worker_type: str, submitted_at: float):
+        self.id: str = worker_id                        #: str: The worker's unique identifier.
+        self.worker_type: str = worker_type             #: str: The name of the worker's class.
+        self.submitted_at: float = submitted_at         #: float: Time at which the worker was provided to the manager.
+        self.started_at: Optional[float] = None         #: float, optional: Time at which the worker's task began running.
+        self.finished_at: Optional[float] = None        #: float, optional: Time at which the worker's results were received.
+        self.cancelled_at: Optional[float] = None       #: float, optional: Time at which the worker was cancelled.
+        self.progress_count: int = 0                    #: int: Number of progress updates received from the worker.
+
+    @property
+    def queued_time(self) -> Optional[float]:
+        """float, optional: Seconds the worker spent waiting to be started."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        """float, optional: Seconds between the worker's task starting and its results being received."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def __str__(self):
+        return f'Stats of Worker {self.id}: Queued = {self.queued_time}, Running = {self.run_time}, ' \
+               f'Progress Updates = {self.progress_count}'
@@ -1,4 +1,16 @@
 from PySink.Objects.AsyncWorkerResults import AsyncWorkerResults
 from PySink.Objects.AsyncWorkerProgress import AsyncWorkerProgress
+from PySink.Objects.AsyncWorkerPartialResults import AsyncWorkerPartialResults
 from PySink.Objects.AsyncWorkerSignals import AsyncWorkerSignals
+from PySink.Objects.MapWorkerSignals import MapWorkerSignals
 
+from PySink.Objects.ProcessWorkerContext import ProcessWorkerContext
+from PySink.Objects.OverflowPolicy import OverflowPolicy
+from PySink.Objects.WorkerEvent import WorkerEvent
+from PySink.Objects.CancellationToken import CancellationToken
+from PySink.Objects.ProgressFlusher import ProgressFlusher
+from PySink.Objects.WorkerStats import WorkerStats
+from PySink.Objects.ManagerMetrics import ManagerMetrics
+from PySink.Objects.RetryPolicy import RetryPolicy
+from PySink.Objects.SharedBuffer import SharedBuffer
+from PySink.Objects.WorkerGroup import WorkerGroup
@@ -0,0 +1,156 @@
+from PySide6.QtCore import Slot
+from typing import Optional, Callable
+from concurrent.futures import CancelledError
+from functools import partial
+import multiprocessing
+import os
+import threading
+from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+from PySink.ProcessPool import ProcessPool
+from PySink.Objects import ProcessWorkerContext, SharedBuffer
+
+
+def _run_task(target: Callable, context: ProcessWorkerContext, args: tuple, kwargs: dict):
+    if context.cancelled:
+        return None
+    try:
+        result = target(context, *args, **kwargs)
+    finally:
+        context._flush_progress()
+    if os.name == 'nt':
+        buffers = [value for value in (result.values() if isinstance(result, dict) else [result])
+                   if isinstance(value, SharedBuffer)]
+        if buffers:
+            threading.Thread(target=_close_after_handoff, args=(context._connection, buffers), daemon=True).start()
+    return result
+
+
+def _close_after_handoff(connection, buffers: [SharedBuffer]) -> None:
+    # The child keeps the blocks it created open until the worker has attached to them (see SharedBuffer). The worker
+    # only closes its end of the pipe once it holds the results, so the blocks can then be closed in the child
+    try:
+        while True:
+            connection.recv()
+    except (EOFError, OSError):
+        pass
+    for shared in buffers:
+        shared._detach()
+
+
+def _notify_cancelled(connection, lock: threading.Lock) -> None:
+    # Called from the cancelling thread. The child only polls its end of the pipe for this message, which is far
+    # cheaper than asking a manager process whether an event is set
+    with lock:
+        if connection.closed:
+            return
+        try:
+            connection.send(None)
+        except OSError:
+            pass
+
+
+def _release_discarded(future) -> None:
+    # Shared buffers of results that will never be delivered would otherwise live until the application exits
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    for value in result.values() if isinstance(result, dict) else [result]:
+        if isinstance(value, SharedBuffer):
+            value.release()
+
+
+class ProcessAsyncWorker(CancellableAsyncWorker):
+    def __init__(self, target: Callable, *args, identifier: Optional[str] = None,
+                 process_pool: Optional[ProcessPool] = None, timeout: Optional[float] = None, **kwargs):
+        """A :class:`~CancellableAsyncWorker` that runs its task in a child process, allowing CPU-bound work to run in
+        parallel without being serialized by the GIL. The worker itself occupies a thread of the
+        :class:`~AsyncManager` and relays the task's progress and results through the usual
+        :class:`~PySink.AsyncWorkerSignals`.
+
+        The target is called as ``target(context, *args, **kwargs)`` within the child process, where ``context`` is a
+        :class:`~PySink.ProcessWorkerContext` used to report progress and to check for cancellation. If the target
+        returns a dict, its items are passed to :meth:`~AsyncWorker.complete` as key-word arguments, otherwise the
+        returned value is passed as ``result``. Exceptions raised by the target are appended to
+        :attr:`~AsyncWorker.errors`. When the worker is cancelled (or times out), the task is notified through
+        :attr:`ProcessWorkerContext.cancelled<PySink.ProcessWorkerContext.cancelled>`, and a task that has not yet
+        started in the child process will not be run.
+
+        The target, args and kwargs must be picklable (the target must be defined at module level). Results are
+        pickled back to the main process as well, so large payloads should be returned as
+        :class:`~PySink.SharedBuffer` instances, which are handed over without being copied.
+
+        :param target: The callable to be run in the child process
+        :type target: Callable
+        :param args: Positional arguments passed to the target
+        :param identifier: A unique identifier to differentiate this worker from other workers. Defaults to a uuid4 string
+        :type identifier: str, optional
+        :param process_pool: The pool to run the task on. Defaults to the :attr:`~AsyncManager.process_pool` of the
+            manager that starts the worker
+        :type process_pool: ProcessPool, optional
+        :param timeout: Number of seconds after which the worker is cancelled. Defaults to None (no timeout)
+        :type timeout: float, optional
+        :param kwargs: Key-word arguments passed to the target
+        """
+        super(ProcessAsyncWorker, self).__init__(identifier=identifier, timeout=timeout)
+        self.target: Callable = target
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+        self.process_pool: Optional[ProcessPool] = process_pool
+
+    @Slot()
+    def run(self) -> None:
+        if self.cancelled:
+            return
+        if self.process_pool is None:
+            self.errors.append('No process pool available to run the task')
+            self.complete()
+            return
+        self.emit_start()
+        # A duplex pipe is handed to the child with the task: progress is sent back through it, and cancellation is
+        # sent to the child the other way. Both are far cheaper than going through a manager process
+        progress_receiver, progress_sender = multiprocessing.Pipe()
+        pipe_lock = threading.Lock()
+        self.cancel_token.add_callback(partial(_notify_cancelled, progress_receiver, pipe_lock))
+        if self.cancelled:
+            progress_receiver.close()
+            progress_sender.close()
+            return
+        progress_interval = 1 / self.max_progress_rate if self.max_progress_rate else 0.02
+        context = ProcessWorkerContext(self.id, progress_sender, progress_interval)
+        future = self.process_pool.submit(_run_task, self.target, context, self.args, self.kwargs)
+        while not future.done():
+            if progress_receiver.poll(0.05):
+                self.update_progress(*progress_receiver.recv())
+            elif self.cancelled:
+                future.cancel()
+        # The sending end is only closed here, as it is pickled for the child in the background after submit(). A
+        # cancellation the child did not read must be discarded first, or the connection would be reset
+        with pipe_lock:
+            while progress_sender.poll():
+                progress_sender.recv()
+            progress_sender.close()
+        try:
+            while progress_receiver.poll():
+                self.update_progress(*progress_receiver.recv())
+        except EOFError:
+            pass
+        with pipe_lock:
+            progress_receiver.close()
+        if self.cancelled:
+            _release_discarded(future)
+            return
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as exception:
+            self.errors.append(f'{type(exception).__name__}: {exception}')
+            self.complete()
+            return
+        if isinstance(result, dict):
+            self.complete(**result)
+        elif result is None:
+            self.complete()
+        else:
+            self.complete(result=result)
+
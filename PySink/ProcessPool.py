@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Optional, Callable
+import multiprocessing
+import threading
+
+
+class ProcessPool:
+    def __init__(self, max_processes: Optional[int] = None, start_method: str = 'spawn'):
+        """A pool of child processes used to run the tasks of :class:`~PySink.ProcessAsyncWorker` instances. The process
+        pool is created lazily, the first time a task is submitted, and so is the helper process behind
+        :meth:`~create_queue` and :meth:`~create_event`, the first time one of them is called.
+
+        Because tasks are sent to the child processes by pickling, the callables (and their arguments) must be
+        picklable, i.e. defined at module level. When using the default 'spawn' start method, the application's entry
+        point must be protected by an ``if __name__ == '__main__':`` guard.
+
+        :param max_processes: The maximum number of child processes. Defaults to the number of CPUs on the machine
+        :type max_processes: int, optional
+        :param start_method: The multiprocessing start method ('spawn', 'fork' or 'forkserver'). Defaults to 'spawn',
+            as forking a process that is running Qt threads is unsafe
+        :type start_method: str, optional
+        """
+        self.max_processes: Optional[int] = max_processes
+        self.start_method: str = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._sync_manager = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submits a picklable callable to be executed in a child process.
+
+        :param fn: The callable to be executed
+        :type fn: Callable
+        :return: A future representing the execution of the callable
+        :rtype: concurrent.futures.Future
+        """
+        return self._get_executor().submit(fn, *args, **kwargs)
+
+    def create_queue(self):
+        """Creates a queue that can be shared with tasks running in the child processes.
+
+        :return: A proxy to a queue living in the pool's helper process
+        :rtype: queue.Queue
+        """
+        return self._get_sync_manager().Queue()
+
+    def create_event(self):
+        """Creates an event that can be shared with tasks running in the child processes.
+
+        :return: A proxy to an event living in the pool's helper process
+        :rtype: threading.Event
+        """
+        return self._get_sync_manager().Event()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the child processes. The pool will be recreated if another task is submitted afterwards.
+
+        :param wait: Whether to wait for the running tasks to complete before returning
+        :type wait: bool, optional
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            sync_manager, self._sync_manager = self._sync_manager, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if sync_manager is not None:
+            sync_manager.shutdown()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method)
+                self._executor = ProcessPoolExecutor(max_workers=self.max_processes, mp_context=context)
+            return self._executor
+
+    def _get_sync_manager(self):
+        with self._lock:
+            if self._sync_manager is None:
+                self._sync_manager = multiprocessing.get_context(self.start_method).Manager()
+            return self._sync_manager
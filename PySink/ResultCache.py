@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from typing import Optional
+import copy
+import hashlib
+import os
+import pickle
+import threading
+import time
+from PySink.Objects import AsyncWorkerResults
+
+
+class ResultCache:
+    def __init__(self, max_entries: Optional[int] = 128, ttl: Optional[float] = None, max_size: Optional[int] = None,
+                 path: Optional[str] = None):
+        """A cache of :class:`~PySink.AsyncWorkerResults`, used by an :class:`~AsyncManager` to skip the task of workers
+        whose results are already known. Only workers whose :meth:`~AsyncWorker.cache_key` returns a key are cached, and
+        only when they finish without errors.
+
+        Entries are evicted least recently used first once the cache holds more than `max_entries` entries or more than
+        `max_size` bytes (measured as the size of the pickled results), and expire `ttl` seconds after being stored. If
+        a `path` is given, every entry is also written to that directory, and entries found there are loaded when the
+        cache is created, so results survive a restart of the application. Persisted results must be picklable.
+
+        :param max_entries: The maximum number of entries. Defaults to 128 (None for unbounded)
+        :type max_entries: int, optional
+        :param ttl: Number of seconds after which an entry expires. Defaults to None (entries do not expire)
+        :type ttl: float, optional
+        :param max_size: The maximum total size of the entries in bytes. Defaults to None (unbounded)
+        :type max_size: int, optional
+        :param path: Directory in which entries are persisted. Defaults to None (memory only)
+        :type path: str, optional
+        """
+        self.max_entries: Optional[int] = max_entries
+        self.ttl: Optional[float] = ttl
+        self.max_size: Optional[int] = max_size
+        self.path: Optional[str] = path
+        self.size: int = 0      #: int: Total size of the entries in bytes (only measured if `max_size` or `path` is set).
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[AsyncWorkerResults]:
+        """Returns a copy of the results stored under the given key.
+
+        :param key: The cache key
+        :type key: str
+        :return: The cached results, or None if there is no valid entry for the key
+        :rtype: AsyncWorkerResults
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: str, results: AsyncWorkerResults, worker_type: Optional[type] = None) -> None:
+        """Stores a copy of a worker's results, evicting older entries if the cache is full.
+
+        :param key: The cache key
+        :type key: str
+        :param results: The results to be stored
+        :type results: AsyncWorkerResults
+        :param worker_type: The class of the worker that produced the results, used by :meth:`~invalidate`
+        :type worker_type: type, optional
+        """
+        results = copy.deepcopy(results)
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        type_name = None if worker_type is None else self._type_name(worker_type)
+        data = None
+        if self.max_size is not None or self.path is not None:
+            data = pickle.dumps((key, type_name, expires_at, results))
+        with self._lock:
+            self._remove(key)
+            size = 0 if data is None else len(data)
+            self._entries[key] = (results, expires_at, size, type_name)
+            self.size += size
+            if self.path is not None:
+                with open(self._file_path(key), 'wb') as file:
+                    file.write(data)
+            self._evict()
+
+    def invalidate(self, prefix: Optional[str] = None, worker_type: Optional[type] = None) -> int:
+        """Removes the entries whose key starts with `prefix` and/or that were produced by workers of `worker_type`
+        (or a subclass of it). Without arguments, every entry is removed.
+
+        :param prefix: The key prefix of the entries to be removed
+        :type prefix: str, optional
+        :param worker_type: The worker class of the entries to be removed
+        :type worker_type: type, optional
+        :return: The number of removed entries
+        :rtype: int
+        """
+        type_names = None
+        if worker_type is not None:
+            type_names = {self._type_name(worker_type)}
+            pending = [worker_type]
+            while pending:
+                for subclass in pending.pop().__subclasses__():
+                    type_names.add(self._type_name(subclass))
+                    pending.append(subclass)
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if (prefix is None or key.startswith(prefix)) and (type_names is None or entry[3] in type_names)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self.invalidate()
+
+    @staticmethod
+    def _type_name(worker_type: type) -> str:
+        # Qualified by module, as classes of the same name can be defined in different modules. A name rather than the
+        # class itself is stored so that persisted entries can be loaded without importing it
+        return f'{worker_type.__module__}.{worker_type.__qualname__}'
+
+    def _evict(self) -> None:
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                                 (self.max_size is not None and self.size > self.max_size)):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry[2]
+        if self.path is not None:
+            try:
+                os.remove(self._file_path(key))
+            except OSError:
+                pass
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(key.encode()).hexdigest() + '.pickle')
+
+    def _load(self) -> None:
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.pickle'):
+                continue
+            file_path = os.path.join(self.path, name)
+            try:
+                with open(file_path, 'rb') as file:
+                    data = file.read()
+                key, type_name, expires_at, results = pickle.loads(data)
+            except Exception:
+                continue
+            if expires_at is not None and expires_at <= time.time():
+                os.remove(file_path)
+                continue
+            entries.append((os.path.getmtime(file_path), key, (results, expires_at, len(data), type_name)))
+        for _, key, entry in sorted(entries, key=lambda item: item[0]):
+            self._entries[key] = entry
+            self.size += entry[2]
+        self._evict()
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import Optional
+import sys
+import threading
+import time
+import weakref
+from PySink.Objects import AsyncWorkerResults, SharedBuffer
+
+
+class ResultStore:
+    def __init__(self, max_entries: Optional[int] = 1000, max_age: Optional[float] = None,
+                 max_size: Optional[int] = None, weak_above: Optional[int] = None):
+        """A bounded history of the :class:`~PySink.AsyncWorkerResults` of finished workers, looked up by worker id. Given
+        to an :class:`~AsyncManager`, it records the results of every worker (and task) that finishes, so past outcomes
+        can be inspected with :meth:`AsyncManager.get_results` without keeping every result alive.
+
+        The oldest results are discarded once the store holds more than `max_entries` results or more than `max_size`
+        bytes, and results are discarded `max_age` seconds after being stored. Sizes are estimated from the values of
+        each :attr:`~PySink.AsyncWorkerResults.results_dict` (shallowly, with :func:`sys.getsizeof`). Results estimated
+        to be larger than `weak_above` bytes are only held through a weak reference: they remain available while the
+        application keeps them alive, but the store never prolongs their lifetime, and they do not count towards
+        `max_size`. Results holding a :class:`~PySink.SharedBuffer` that has been released are discarded as well.
+
+        :param max_entries: The maximum number of stored results. Defaults to 1000 (None for unbounded)
+        :type max_entries: int, optional
+        :param max_age: Number of seconds after which results are discarded. Defaults to None (no expiry)
+        :type max_age: float, optional
+        :param max_size: The maximum estimated size of the strongly held results in bytes. Defaults to None (unbounded)
+        :type max_size: int, optional
+        :param weak_above: Size in bytes above which results are held weakly. Defaults to None (always held strongly)
+        :type weak_above: int, optional
+        """
+        self.max_entries: Optional[int] = max_entries
+        self.max_age: Optional[float] = max_age
+        self.max_size: Optional[int] = max_size
+        self.weak_above: Optional[int] = weak_above
+        self.size: int = 0      #: int: Estimated size of the strongly held results in bytes.
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, worker_id: str) -> bool:
+        return self.get(worker_id) is not None
+
+    def add(self, results: AsyncWorkerResults) -> None:
+        """Stores the results of a finished worker, replacing any previous results with the same id.
+
+        :param results: The results to be stored
+        :type results: AsyncWorkerResults
+        """
+        size = self.estimate_size(results)
+        weak = self.weak_above is not None and size > self.weak_above
+        reference = weakref.ref(results) if weak else results
+        with self._lock:
+            self._remove(results.id)
+            self._entries[results.id] = (reference, time.monotonic(), 0 if weak else size, weak)
+            self.size += 0 if weak else size
+            self._evict()
+
+    def get(self, worker_id: str) -> Optional[AsyncWorkerResults]:
+        """Returns the stored results of a worker.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: The worker's results, or None if they were never stored, have been discarded or were garbage collected
+        :rtype: AsyncWorkerResults
+        """
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(worker_id)
+            if entry is None:
+                return None
+            results = self._live_results(entry)
+            if results is None:
+                self._remove(worker_id)
+            return results
+
+    def ids(self) -> list:
+        """Returns the ids of the stored results, oldest first.
+
+        :return: The worker ids
+        :rtype: list
+        """
+        with self._lock:
+            self._evict()
+            dead_ids = [worker_id for worker_id, entry in self._entries.items() if self._live_results(entry) is None]
+            for worker_id in dead_ids:
+                self._remove(worker_id)
+            return list(self._entries)
+
+    def discard(self, worker_id: str) -> bool:
+        """Discards the stored results of a worker.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: False if there were no stored results for the worker
+        :rtype: bool
+        """
+        with self._lock:
+            if worker_id not in self._entries:
+                return False
+            self._remove(worker_id)
+            return True
+
+    def clear(self) -> None:
+        """Discards every stored result."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    @staticmethod
+    def estimate_size(results: AsyncWorkerResults) -> int:
+        """Estimates the size of a worker's results from the values of its results dict.
+
+        :param results: The results to be measured
+        :type results: AsyncWorkerResults
+        :return: The estimated size in bytes
+        :rtype: int
+        """
+        size = sys.getsizeof(results)
+        for value in results.results_dict.values():
+            size += value.nbytes if isinstance(value, memoryview) else sys.getsizeof(value)
+        return size
+
+    @staticmethod
+    def _live_results(entry: tuple) -> Optional[AsyncWorkerResults]:
+        results = entry[0]() if entry[3] else entry[0]
+        if results is not None and any(isinstance(value, SharedBuffer) and value.released
+                                       for value in results.results_dict.values()):
+            return None
+        return results
+
+    def _evict(self) -> None:
+        expired_before = None if self.max_age is None else time.monotonic() - self.max_age
+        while self._entries:
+            worker_id, entry = next(iter(self._entries.items()))
+            if (self.max_entries is not None and len(self._entries) > self.max_entries) or \
+                    (self.max_size is not None and self.size > self.max_size) or \
+                    (expired_before is not None and entry[1] < expired_before):
+                self._remove(worker_id)
+            else:
+                break
+
+    def _remove(self, worker_id: str) -> None:
+        entry = self._entries.pop(worker_id, None)
+        if entry is not None:
+            self.size -= entry[2]
@@ -0,0 +1,35 @@
+from PySide6.QtCore import QRunnable
+from PySink.Objects import AsyncWorkerResults
+
+
+class TaskRunner(QRunnable):
+    def __init__(self, manager):
+        """Reusable runnable used by :meth:`AsyncManager.submit` to run plain callables. A runner takes tasks from the
+        manager's task queue until the queue is empty, then returns itself to the manager's pool of idle runners. The
+        pool never holds more runners than the thread pool has threads, so submitting a task creates no QRunnable, no
+        QObject and no signal connection.
+
+        :param manager: The manager that owns the runner
+        :type manager: AsyncManager
+        """
+        super(TaskRunner, self).__init__()
+        self.setAutoDelete(False)
+        self.manager = manager
+
+    def run(self) -> None:
+        task = self.manager._next_task(self)
+        while task is not None:
+            task_id, func, args, kwargs = task
+            results = AsyncWorkerResults()
+            results.id = task_id
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exception:
+                results.errors.append(f'{type(exception).__name__}: {exception}')
+            else:
+                if isinstance(result, dict):
+                    results.results_dict = result
+                elif result is not None:
+                    results.results_dict = {'result': result}
+            self.manager._task_finished.emit(results)
+            task = self.manager._next_task(self)
@@ -0,0 +1,30 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionProgressBar, QStyle, QApplication
+from PySide6.QtCore import Qt
+
+
+class ProgressBarDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        """Item delegate painting a cell's value as a progress bar, without creating a widget. Values below 0 are
+        painted as an indeterminate progress bar.
+
+        :param parent: The parent object
+        :type parent: QObject, optional
+        """
+        super(ProgressBarDelegate, self).__init__(parent)
+
+    def paint(self, painter, option, index) -> None:
+        value = index.data()
+        if value is None:
+            super().paint(painter, option, index)
+            return
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 2, -2, -2)
+        bar.state = option.state | QStyle.State_Horizontal
+        bar.minimum = 0
+        bar.maximum = 0 if value < 0 else 100
+        bar.progress = 0 if value < 0 else int(min(value, 100))
+        bar.text = '' if value < 0 else f'{bar.progress}%'
+        bar.textVisible = value >= 0
+        bar.textAlignment = Qt.AlignCenter
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter, option.widget)
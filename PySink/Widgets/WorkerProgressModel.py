@@ -0,0 +1,206 @@
+from typing import Optional
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PySink.Objects.AsyncWorkerProgress import AsyncWorkerProgress
+from PySink.Objects.AsyncWorkerResults import AsyncWorkerResults
+
+
+class WorkerProgressModel(QAbstractTableModel):
+    ID_COLUMN = 0
+    PROGRESS_COLUMN = 1
+    MESSAGE_COLUMN = 2
+    ETA_COLUMN = 3
+    STATUS_COLUMN = 4
+    HEADERS = ('Worker', 'Progress', 'Message', 'ETA', 'Status')
+
+    def __init__(self, manager=None, refresh_interval: int = 50, parent=None):
+        """A table model holding one row per worker of an :class:`~PySink.AsyncManager`, meant to be displayed by a
+        :class:`~PySink.Widgets.WorkerProgressView`. Unlike a :class:`~PySink.Widgets.ProgressBarWidget` per worker, the
+        model creates no widget per row, so it scales to tens of thousands of workers.
+
+        Once connected to a manager, a row is added for every worker that reports being started, progress or results
+        (rows can also be added up front with :meth:`~add_worker`). Updates are stored as they arrive but only reported
+        to the views once per `refresh_interval`, as one change per run of consecutive updated rows. Views then only
+        repaint the rows that are both visible and changed.
+
+        :param manager: The manager whose workers are displayed. Defaults to None (see :meth:`~set_manager`)
+        :type manager: AsyncManager, optional
+        :param refresh_interval: The minimum time between two updates of the views in milliseconds. Defaults to 50
+        :type refresh_interval: int, optional
+        :param parent: The parent object
+        :type parent: QObject, optional
+        """
+        super(WorkerProgressModel, self).__init__(parent)
+        self.manager = None
+        self._rows: list = []           # [id, value, message, eta, status], in display order
+        self._row_index: {str: int} = {}
+        self._inserted_count: int = 0   # Rows past this count have not been reported to the views yet
+        self._dirty_rows: set = set()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(refresh_interval)
+        self._refresh_timer.timeout.connect(self.refresh)
+        if manager is not None:
+            self.set_manager(manager)
+
+    def set_manager(self, manager) -> None:
+        """Connects the model to the signals of a manager, disconnecting it from the previous one.
+
+        :param manager: The manager whose workers are displayed
+        :type manager: AsyncManager
+        """
+        if self.manager is not None:
+            self.manager.worker_started_signal.disconnect(self.set_started)
+            self.manager.worker_progress_signal.disconnect(self.update_progress)
+            self.manager.worker_finished_signal.disconnect(self.set_finished)
+        self.manager = manager
+        manager.worker_started_signal.connect(self.set_started)
+        manager.worker_progress_signal.connect(self.update_progress)
+        manager.worker_finished_signal.connect(self.set_finished)
+
+    def add_worker(self, worker_id: str) -> int:
+        """Adds a row for a worker that has not reported anything yet, with a 'Queued' status.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: The row of the worker
+        :rtype: int
+        """
+        return self._get_row(worker_id)
+
+    def row_of(self, worker_id: str) -> Optional[int]:
+        """Returns the row of a worker.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: The row, or None if the worker is not in the model
+        :rtype: int
+        """
+        row = self._row_index.get(worker_id)
+        return row if row is not None and row < self._inserted_count else None
+
+    def set_started(self, worker_id: str) -> None:
+        """Marks a worker as running. Connected to
+        :attr:`AsyncManager.worker_started_signal<PySink.AsyncManager.worker_started_signal>`.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        """
+        self._set(worker_id, self.STATUS_COLUMN, 'Running')
+
+    def update_progress(self, progress: AsyncWorkerProgress) -> None:
+        """Stores the progress of a worker. Connected to
+        :attr:`AsyncManager.worker_progress_signal<PySink.AsyncManager.worker_progress_signal>`.
+
+        :param progress: The worker's progress
+        :type progress: :class:`~PySink.AsyncWorkerProgress`
+        """
+        row = self._get_row(progress.id)
+        data = self._rows[row]
+        data[1], data[2], data[3] = progress.value, progress.message or '', progress.eta
+        if data[4] == 'Queued':
+            data[4] = 'Running'
+        self._mark_dirty(row)
+
+    def set_finished(self, results: AsyncWorkerResults) -> None:
+        """Marks a worker as finished. Connected to
+        :attr:`AsyncManager.worker_finished_signal<PySink.AsyncManager.worker_finished_signal>`.
+
+        :param results: The worker's results
+        :type results: :class:`~PySink.AsyncWorkerResults`
+        """
+        row = self._get_row(results.id)
+        data = self._rows[row]
+        if 'Cancelled' in results.errors:
+            data[4] = 'Cancelled'
+        elif results.errors:
+            data[4] = 'Failed'
+        else:
+            data[1], data[4] = 100, 'Done'
+        data[3] = None
+        self._mark_dirty(row)
+
+    def clear_finished(self) -> None:
+        """Removes the rows of the workers that have finished."""
+        self.refresh()
+        self.beginResetModel()
+        self._rows = [data for data in self._rows if data[4] in ('Queued', 'Running')]
+        self._row_index = {data[0]: row for row, data in enumerate(self._rows)}
+        self._inserted_count = len(self._rows)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Removes every row."""
+        self.beginResetModel()
+        self._rows, self._row_index, self._inserted_count = [], {}, 0
+        self._dirty_rows.clear()
+        self._refresh_timer.stop()
+        self.endResetModel()
+
+    def refresh(self) -> None:
+        """Reports the pending changes to the views. This is called automatically once per refresh interval."""
+        self._refresh_timer.stop()
+        if self._inserted_count < len(self._rows):
+            self.beginInsertRows(QModelIndex(), self._inserted_count, len(self._rows) - 1)
+            self._inserted_count = len(self._rows)
+            self.endInsertRows()
+        if not self._dirty_rows:
+            return
+        rows, self._dirty_rows = sorted(self._dirty_rows), set()
+        first = previous = rows[0]
+        for row in rows[1:] + [None]:
+            if row == previous + 1:
+                previous = row
+                continue
+            self.dataChanged.emit(self.index(first, self.PROGRESS_COLUMN), self.index(previous, self.STATUS_COLUMN))
+            first = previous = row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._inserted_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if index.column() == self.ETA_COLUMN:
+            return '' if value is None else self._format_eta(value)
+        return value
+
+    def _get_row(self, worker_id: str) -> int:
+        row = self._row_index.get(worker_id)
+        if row is None:
+            row = self._row_index[worker_id] = len(self._rows)
+            self._rows.append([worker_id, 0, '', None, 'Queued'])
+            self._start_refresh()
+        return row
+
+    def _set(self, worker_id: str, column: int, value) -> None:
+        row = self._get_row(worker_id)
+        self._rows[row][column] = value
+        self._mark_dirty(row)
+
+    def _mark_dirty(self, row: int) -> None:
+        # Rows that have not been inserted yet are reported by their insertion
+        if row < self._inserted_count:
+            self._dirty_rows.add(row)
+            self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    @staticmethod
+    def _format_eta(seconds: float) -> str:
+        seconds = int(seconds + 0.5)
+        if seconds < 60:
+            return f'{seconds}s'
+        if seconds < 3600:
+            return f'{seconds // 60}m {seconds % 60:02d}s'
+        return f'{seconds // 3600}h {seconds % 3600 // 60:02d}m'
@@ -0,0 +1,57 @@
+from PySide6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PySink.Widgets.WorkerProgressModel import WorkerProgressModel
+from PySink.Widgets.ProgressBarDelegate import ProgressBarDelegate
+
+
+class WorkerProgressView(QTableView):
+    def __init__(self, manager=None, parent=None):
+        """A table displaying the progress of every worker of an :class:`~PySink.AsyncManager`, one row per worker,
+        backed by a :class:`~PySink.Widgets.WorkerProgressModel`. Progress bars are painted by a
+        :class:`~PySink.Widgets.ProgressBarDelegate` and rows have a fixed height, so only the visible rows are ever
+        laid out or painted, however many workers the model holds.
+
+        :param manager: The manager whose workers are displayed. Defaults to None (see
+            :meth:`WorkerProgressModel.set_manager<PySink.Widgets.WorkerProgressModel.set_manager>`)
+        :type manager: AsyncManager, optional
+        :param parent: The parent widget
+        :type parent: QWidget, optional
+        """
+        super(WorkerProgressView, self).__init__(parent)
+        self.progress_model = WorkerProgressModel(manager, parent=self)
+        self.progress_delegate = ProgressBarDelegate(self)
+        self.setModel(self.progress_model)
+        self.setItemDelegateForColumn(WorkerProgressModel.PROGRESS_COLUMN, self.progress_delegate)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setWordWrap(False)
+        vertical_header = self.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        vertical_header.hide()
+        horizontal_header = self.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.Interactive)
+        horizontal_header.setSectionResizeMode(WorkerProgressModel.MESSAGE_COLUMN, QHeaderView.Stretch)
+        horizontal_header.resizeSection(WorkerProgressModel.PROGRESS_COLUMN, 160)
+
+
+if __name__ == '__main__':
+    from PySide6.QtWidgets import QApplication, QMainWindow
+    from PySink import AsyncManager, AsyncWorker
+    import time
+
+    class DemoWorker(AsyncWorker):
+        def run(self):
+            for ii in range(20):
+                time.sleep(0.1)
+                self.update_progress(5 * (ii + 1), f'Step {ii + 1}')
+            self.complete()
+
+    app = QApplication()
+    demo_manager = AsyncManager()
+    window = QMainWindow()
+    window.setCentralWidget(WorkerProgressView(demo_manager))
+    window.resize(700, 500)
+    window.show()
+    for _ in range(200):
+        demo_manager.start_worker(DemoWorker())
+    app.exec()
@@ -1 +1,4 @@
 from PySink.Widgets.ProgressBarWidget import ProgressBarWidget
+from PySink.Widgets.ProgressBarDelegate import ProgressBarDelegate
+from PySink.Widgets.WorkerProgressModel import WorkerProgressModel
+from PySink.Widgets.WorkerProgressView import WorkerProgressView
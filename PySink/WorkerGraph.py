@@ -0,0 +1,147 @@
+from PySide6.QtCore import QObject, Signal, Qt
+from typing import Optional, Callable
+import threading
+from PySink.AsyncWorker import AsyncWorker
+from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+from PySink.Objects import AsyncWorkerResults, AsyncWorkerProgress
+
+
+class WorkerGraph(QObject):
+    #: Signal(int): Aggregate progress of the graph [0, 100], averaged over all of its workers.
+    progress = Signal(int)
+    #: Signal(dict): Signals that every worker of the graph has finished. Contains their results, keyed by worker id.
+    finished = Signal(dict)
+
+    def __init__(self):
+        """A pipeline of workers with declared dependencies, forming a directed acyclic graph. Once the graph is
+        provided to :meth:`AsyncManager.start_graph`, each worker is queued as soon as all of the workers it depends on
+        have finished successfully. This happens on the thread of the last dependency to finish, so consecutive stages
+        run back to back without a round trip through the GUI thread.
+
+        Before a worker is queued, the results of its dependencies are stored in its
+        :attr:`~AsyncWorker.dependency_results`, keyed by worker id. If a worker finishes with errors (or is
+        cancelled), every worker downstream of it is finished without being run: an error naming the failed dependency
+        is appended to its errors, and cancellable workers are cancelled. A worker that is going to be retried (see
+        :attr:`~AsyncWorker.retry_policy`) has not failed yet: its dependents wait for its last attempt.
+
+        All workers of the graph go through the :class:`~AsyncManager` like any other worker, so their individual
+        signals are still relayed by the manager's signals. They are however always run: the manager's result cache and
+        in-flight deduplication do not apply to graph workers.
+        """
+        super(WorkerGraph, self).__init__()
+        self.workers: {str: AsyncWorker} = {}
+        self.dependencies: {str: [str]} = {}
+        self.dependents: {str: [str]} = {}
+        self.results: {str: AsyncWorkerResults} = {}
+        self._remaining: {str: int} = {}
+        self._failed: set = set()
+        self._progress: {str: float} = {}
+        self._progress_total: float = 0.
+        self._last_progress: int = -1
+        self._queue_worker: Optional[Callable[[AsyncWorker], None]] = None
+        self._will_retry: Optional[Callable[[AsyncWorker, AsyncWorkerResults], bool]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        """bool: True once every worker of the graph has finished."""
+        return len(self.results) == len(self.workers)
+
+    def add_worker(self, worker: AsyncWorker, depends_on: Optional[list] = None) -> AsyncWorker:
+        """Adds a worker to the graph. Dependencies must be added to the graph before the workers that depend on them,
+        which guarantees that the graph has no cycles.
+
+        :param worker: The worker to be added
+        :type worker: AsyncWorker
+        :param depends_on: The workers (or their ids) that must finish successfully before this worker is started.
+            Defaults to None (the worker is started with the graph)
+        :type depends_on: list, optional
+        :raises Exception: Raised if a worker with the same id is already in the graph, if a dependency is not in the
+            graph, or if the graph has already been started.
+        :return: The added worker, for convenience
+        :rtype: AsyncWorker
+        """
+        if self._queue_worker is not None:
+            raise Exception('Workers cannot be added to a graph that has been started')
+        if worker.id in self.workers:
+            raise Exception(f'Worker with id: {worker.id} is already in the graph')
+        dependency_ids = []
+        for dependency in depends_on or []:
+            dependency_id = dependency if isinstance(dependency, str) else dependency.id
+            if dependency_id not in self.workers:
+                raise Exception(f'Dependency with id: {dependency_id} is not in the graph')
+            if dependency_id not in dependency_ids:
+                dependency_ids.append(dependency_id)
+        self.workers[worker.id] = worker
+        self.dependencies[worker.id] = dependency_ids
+        self.dependents[worker.id] = []
+        for dependency_id in dependency_ids:
+            self.dependents[dependency_id].append(worker.id)
+        return worker
+
+    def _start(self, queue_worker: Callable[[AsyncWorker], None],
+               will_retry: Optional[Callable[[AsyncWorker, AsyncWorkerResults], bool]] = None) -> list:
+        # Called by the manager once every worker is registered. Returns the workers that can be queued right away
+        self._queue_worker = queue_worker
+        self._will_retry = will_retry
+        self._remaining = {worker_id: len(dependency_ids) for worker_id, dependency_ids in self.dependencies.items()}
+        self._progress = {worker_id: 0. for worker_id in self.workers}
+        for worker in self.workers.values():
+            worker.dependency_results = {}
+            worker.signals.progress.connect(self._worker_progress_callback, Qt.DirectConnection)
+            worker.signals.finished.connect(self._worker_finished_callback, Qt.DirectConnection)
+        return [self.workers[worker_id] for worker_id, remaining in self._remaining.items() if remaining == 0]
+
+    def _worker_progress_callback(self, progress: AsyncWorkerProgress) -> None:
+        value = min(max(progress.value, 0), 100)
+        with self._lock:
+            if progress.id not in self._progress or progress.id in self.results:
+                return
+            self._progress_total += value - self._progress[progress.id]
+            self._progress[progress.id] = value
+            graph_progress = int(self._progress_total / len(self.workers))
+            if graph_progress != self._last_progress:
+                self._last_progress = graph_progress
+                self.progress.emit(graph_progress)
+
+    def _worker_finished_callback(self, results: AsyncWorkerResults) -> None:
+        # Runs on the thread that finished the worker (the worker's own thread, unless it was cancelled)
+        ready, failed = [], []
+        worker = self.workers.get(results.id)
+        if worker is None or (self._will_retry is not None and self._will_retry(worker, results)):
+            return
+        with self._lock:
+            if results.id in self.results:
+                return
+            self.results[results.id] = results
+            self._progress_total += 100 - self._progress[results.id]
+            self._progress[results.id] = 100
+            for dependent_id in self.dependents[results.id]:
+                if dependent_id in self.results or dependent_id in self._failed:
+                    continue
+                dependent = self.workers[dependent_id]
+                if results.errors:
+                    self._failed.add(dependent_id)
+                    failed.append(dependent)
+                    continue
+                dependent.dependency_results[results.id] = results
+                self._remaining[dependent_id] -= 1
+                if self._remaining[dependent_id] == 0:
+                    ready.append(dependent)
+            graph_progress = int(self._progress_total / len(self.workers))
+            if graph_progress != self._last_progress:
+                self._last_progress = graph_progress
+                self.progress.emit(graph_progress)
+            done = self.done
+        for dependent in failed:
+            dependent.retry_policy = None
+            dependent.errors.append(f'Dependency {results.id} failed')
+            if isinstance(dependent, CancellableAsyncWorker):
+                dependent.cancel()
+            else:
+                dependent.complete()
+        for dependent in ready:
+            self._queue_worker(dependent)
+        if done:
+            self.finished.emit(dict(self.results))
+
@@ -0,0 +1,235 @@
+from typing import Optional
+from PySink.Objects import OverflowPolicy
+import itertools
+import threading
+import heapq
+import time
+
+
+class WorkerLane:
+    def __init__(self, name: str, max_running: Optional[int] = None, max_queued: Optional[int] = None,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.REJECT, block_timeout: Optional[float] = None):
+        """A named category of workers with its own concurrency limit and bounded queue. Workers are assigned to a lane
+        through their :attr:`~AsyncWorker.lane` attribute. Lanes are created with :meth:`AsyncManager.add_lane`.
+
+        :param name: The name of the lane
+        :type name: str
+        :param max_running: The maximum number of workers of this lane running at once. Defaults to None (only limited
+            by the manager's thread count)
+        :type max_running: int, optional
+        :param max_queued: The maximum number of workers of this lane waiting to be started. Defaults to None (unbounded)
+        :type max_queued: int, optional
+        :param overflow_policy: What to do when a worker is started while the lane's queue is full
+        :type overflow_policy: OverflowPolicy, optional
+        :param block_timeout: With :attr:`OverflowPolicy.BLOCK`, the maximum number of seconds a worker is held waiting
+            for room in the queue, after which it finishes with a 'Dropped' error. Defaults to None (wait indefinitely)
+        :type block_timeout: float, optional
+        """
+        self.name: str = name
+        self.max_running: Optional[int] = max_running
+        self.max_queued: Optional[int] = max_queued
+        self.overflow_policy: OverflowPolicy = OverflowPolicy(overflow_policy)
+        self.block_timeout: Optional[float] = block_timeout
+        self._heap: list = []
+        self._entries: dict = {}
+        self._running: set = set()
+
+    @property
+    def queued_count(self) -> int:
+        """int: The number of workers of this lane waiting to be started."""
+        return len(self._entries)
+
+    @property
+    def running_count(self) -> int:
+        """int: The number of workers of this lane currently running."""
+        return len(self._running)
+
+    @property
+    def is_full(self) -> bool:
+        """bool: True if no more workers can be queued on this lane."""
+        return self.max_queued is not None and len(self._entries) >= self.max_queued
+
+    def _has_capacity(self) -> bool:
+        return self.max_running is None or len(self._running) < self.max_running
+
+    def _peek(self) -> Optional[list]:
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+
+class WorkerScheduler:
+    def __init__(self, aging_rate: float = 0.5):
+        """Thread-safe priority queue used by the :class:`~AsyncManager` to decide which queued worker runs next.
+        Workers with a higher :attr:`~AsyncWorker.priority` are started first, and workers with the same priority are
+        started in the order they were queued.
+
+        To prevent starvation, a queued worker's effective priority grows by :attr:`~aging_rate` for every second it
+        spends in the queue. Since every queued worker ages at the same rate, the relative order of two workers never
+        changes while they wait, which allows the queue to be kept as a heap.
+
+        Workers are queued on the :class:`~WorkerLane` named by their :attr:`~AsyncWorker.lane` attribute (or on the
+        default lane if it is None). A worker is only started while its lane is below its own running limit.
+
+        :param aging_rate: Priority gained per second spent in the queue. Defaults to 0.5
+        :type aging_rate: float, optional
+        """
+        self.aging_rate: float = aging_rate
+        self.lanes: {Optional[str]: WorkerLane} = {None: WorkerLane('default')}
+        self._entries: dict = {}
+        self._running: dict = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def queued_count(self) -> int:
+        """int: The number of workers waiting to be started."""
+        return len(self._entries)
+
+    @property
+    def running_count(self) -> int:
+        """int: The number of workers that have been started and have not yet returned from their run method."""
+        return len(self._running)
+
+    def add_lane(self, lane: WorkerLane) -> None:
+        """Adds a lane, replacing the limits of any existing lane with the same name.
+
+        :param lane: The lane to be added
+        :type lane: WorkerLane
+        """
+        with self._lock:
+            existing = self.lanes.get(lane.name)
+            if existing is not None:
+                lane._heap, lane._entries, lane._running = existing._heap, existing._entries, existing._running
+            self.lanes[lane.name] = lane
+
+    def get_lane(self, worker) -> WorkerLane:
+        """Returns the lane a worker is assigned to.
+
+        :param worker: The worker
+        :type worker: AsyncWorker
+        :raises Exception: Raised if the worker's lane does not exist.
+        :return: The worker's lane
+        :rtype: WorkerLane
+        """
+        lane = self.lanes.get(worker.lane)
+        if lane is None:
+            raise Exception(f'There is no lane named: {worker.lane}')
+        return lane
+
+    def push(self, worker):
+        """Adds a worker to the queue of its lane. If the lane is full and its policy is
+        :attr:`OverflowPolicy.DROP_OLDEST`, the oldest queued worker of the lane is removed to make room.
+
+        :param worker: The worker to be queued
+        :type worker: AsyncWorker
+        :raises Exception: Raised if the lane is full and its policy is not :attr:`OverflowPolicy.DROP_OLDEST`.
+        :return: The worker that was dropped to make room, if any
+        :rtype: AsyncWorker
+        """
+        with self._lock:
+            lane = self.get_lane(worker)
+            dropped = None
+            if lane.is_full:
+                if lane.overflow_policy != OverflowPolicy.DROP_OLDEST or not lane._entries:
+                    raise Exception(f'The queue of lane {lane.name} is full')
+                oldest = min(lane._entries.values(), key=lambda entry: (entry[3], entry[1]))
+                dropped = self._pop_entry(oldest[2].id)
+            self._push(worker, time.monotonic())
+            return dropped
+
+    def set_priority(self, worker_id: str, priority: int) -> bool:
+        """Changes the priority of a queued worker. The time the worker has already spent in the queue is kept.
+
+        :param worker_id: The unique identifier of the queued worker
+        :type worker_id: str
+        :param priority: The new priority
+        :type priority: int
+        :return: False if there is no queued worker with the given id
+        :rtype: bool
+        """
+        with self._lock:
+            lane = self._entries.get(worker_id)
+            if lane is None:
+                return False
+            queued_at = lane._entries[worker_id][3]
+            worker = self._pop_entry(worker_id)
+            worker.priority = priority
+            self._push(worker, queued_at)
+            return True
+
+    def remove(self, worker_id: str):
+        """Removes a worker from the queue.
+
+        :param worker_id: The unique identifier of the queued worker
+        :type worker_id: str
+        :return: The removed worker, or None if there is no queued worker with the given id
+        :rtype: AsyncWorker
+        """
+        with self._lock:
+            return self._pop_entry(worker_id)
+
+    def take_ready(self, max_running: int) -> list:
+        """Removes workers from the queue, highest effective priority first, until either no lane has both queued
+        workers and spare capacity, or `max_running` workers are running. The returned workers are considered running
+        until they are :meth:`released<release>`.
+
+        :param max_running: The maximum number of workers allowed to run at once, across all lanes
+        :type max_running: int
+        :return: The workers to be started
+        :rtype: list
+        """
+        ready = []
+        with self._lock:
+            while len(self._running) < max_running:
+                best_lane, best_entry = None, None
+                for lane in self.lanes.values():
+                    if not lane._has_capacity():
+                        continue
+                    entry = lane._peek()
+                    if entry is not None and (best_entry is None or entry < best_entry):
+                        best_lane, best_entry = lane, entry
+                if best_entry is None:
+                    break
+                worker = self._pop_entry(best_entry[2].id)
+                best_lane._running.add(worker.id)
+                self._running[worker.id] = best_lane
+                ready.append(worker)
+        return ready
+
+    def is_running(self, worker_id: str) -> bool:
+        """Returns whether a worker has been taken from the queue and not yet :meth:`released<release>`.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        :return: True if the worker holds a slot
+        :rtype: bool
+        """
+        with self._lock:
+            return worker_id in self._running
+
+    def release(self, worker_id: str) -> None:
+        """Marks a running worker as done, freeing its slot.
+
+        :param worker_id: The unique identifier of the worker
+        :type worker_id: str
+        """
+        with self._lock:
+            lane = self._running.pop(worker_id, None)
+            if lane is not None:
+                lane._running.discard(worker_id)
+
+    def _push(self, worker, queued_at: float) -> None:
+        lane = self.get_lane(worker)
+        entry = [self.aging_rate * queued_at - worker.priority, next(self._counter), worker, queued_at]
+        self._entries[worker.id] = lane
+        lane._entries[worker.id] = entry
+        heapq.heappush(lane._heap, entry)
+
+    def _pop_entry(self, worker_id: str):
+        lane = self._entries.pop(worker_id, None)
+        if lane is None:
+            return None
+        entry = lane._entries.pop(worker_id)
+        worker, entry[2] = entry[2], None
+        return worker
@@ -1,6 +1,17 @@
 from PySink.AsyncWorker import AsyncWorker
 from PySink.AsyncManager import AsyncManager
 from PySink.CancellableAsyncWorker import CancellableAsyncWorker
+from PySink.ProcessAsyncWorker import ProcessAsyncWorker
+from PySink.AsyncCoroutineWorker import AsyncCoroutineWorker
+from PySink.EventLoopThread import EventLoopThread
+from PySink.ProcessPool import ProcessPool
+from PySink.WorkerScheduler import WorkerScheduler, WorkerLane
+from PySink.WorkerGraph import WorkerGraph
+from PySink.MapWorker import MapWorker
+from PySink.MappedFileWorker import MappedFileWorker
+from PySink.ResultCache import ResultCache
+from PySink.ResultStore import ResultStore
+from PySink.EventBus import EventBus
 
 from PySink.Objects import *
 
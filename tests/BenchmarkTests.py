@@ -0,0 +1,183 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from PySide6.QtCore import QCoreApplication
+
+from PySink import AsyncManager, AsyncWorker, AsyncWorkerResults
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baselines.json')
+# 100000 workers is not a default size: PySide deletes senders that have connections in quadratic time, so tearing
+# down 10000 workers already takes seconds and a single run with 100000 takes many minutes
+DEFAULT_SIZES = (10, 1000, 10000)
+PROGRESS_UPDATES = 100000
+MANAGER_KWARGS = {}
+
+
+class EmptyWorker(AsyncWorker):
+    def run(self):
+        self.complete(sent_at=time.perf_counter())
+
+
+class ProgressWorker(AsyncWorker):
+    def __init__(self, updates):
+        super(ProgressWorker, self).__init__()
+        self.updates = updates
+
+    def run(self):
+        for ii in range(self.updates):
+            self.update_progress(ii * 100 / self.updates)
+        self.complete()
+
+
+def run_until_finished(app, manager, workers):
+    manager.all_workers_finished_signal.connect(app.quit)
+    for worker in workers:
+        manager.start_worker(worker)
+    app.exec()
+    manager.all_workers_finished_signal.disconnect(app.quit)
+
+
+def bench_start_overhead(app, count):
+    # Time spent in start_worker (on the GUI thread) per worker, in microseconds
+    manager = AsyncManager(**MANAGER_KWARGS)
+    workers = [EmptyWorker() for _ in range(count)]
+    manager.all_workers_finished_signal.connect(app.quit)
+    start = time.perf_counter()
+    for worker in workers:
+        manager.start_worker(worker)
+    elapsed = time.perf_counter() - start
+    app.exec()
+    return 1e6 * elapsed / count
+
+
+def bench_finished_latency(app, count):
+    # Median time between a worker calling complete() and worker_finished_signal firing, in microseconds. Workers that
+    # finish while the GUI thread is still starting the others wait for it, so this also grows with start_overhead_us
+    manager = AsyncManager(**MANAGER_KWARGS)
+    latencies = []
+
+    def on_finished(results: AsyncWorkerResults):
+        latencies.append(time.perf_counter() - results.results_dict['sent_at'])
+
+    manager.worker_finished_signal.connect(on_finished)
+    run_until_finished(app, manager, [EmptyWorker() for _ in range(count)])
+    return 1e6 * statistics.median(latencies)
+
+
+def bench_progress_throughput(app, count):
+    # Progress updates delivered through worker_progress_signal per second
+    manager = AsyncManager(**MANAGER_KWARGS)
+    received = [0]
+    manager.worker_progress_signal.connect(lambda progress: received.__setitem__(0, received[0] + 1))
+    updates = max(1, PROGRESS_UPDATES // count)
+    start = time.perf_counter()
+    run_until_finished(app, manager, [ProgressWorker(updates) for _ in range(min(count, PROGRESS_UPDATES))])
+    return received[0] / (time.perf_counter() - start)
+
+
+def bench_memory_per_worker(app, count):
+    # Memory retained by the manager per completed worker, in bytes
+    manager = AsyncManager(**MANAGER_KWARGS)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    run_until_finished(app, manager, [EmptyWorker() for _ in range(count)])
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return max(0, after - before) / count
+
+
+def bench_submit_overhead(app, count):
+    # Time spent in submit (on the GUI thread) per task, in microseconds
+    manager = AsyncManager(**MANAGER_KWARGS)
+    manager.all_workers_finished_signal.connect(app.quit)
+    start = time.perf_counter()
+    for ii in range(count):
+        manager.submit(abs, ii)
+    elapsed = time.perf_counter() - start
+    app.exec()
+    return 1e6 * elapsed / count
+
+
+BENCHMARKS = {
+    'start_overhead_us': (bench_start_overhead, 'lower'),
+    'finished_latency_us': (bench_finished_latency, 'lower'),
+    'progress_throughput_per_s': (bench_progress_throughput, 'higher'),
+    'memory_per_worker_bytes': (bench_memory_per_worker, 'lower'),
+    'submit_overhead_us': (bench_submit_overhead, 'lower'),
+}
+
+
+def run_benchmarks(sizes, names, repeat, suffix=''):
+    # Each benchmark is run `repeat` times and the best value is kept, as slower runs are caused by the machine
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    measurements = {}
+    for name in names:
+        benchmark, direction = BENCHMARKS[name]
+        best = min if direction == 'lower' else max
+        for size in sizes:
+            key = f'{name}[{size}]{suffix}'
+            measurements[key] = best(benchmark(app, size) for _ in range(repeat))
+            print(f'{key:<40} {measurements[key]:>14.2f}')
+    return measurements
+
+
+def compare_to_baselines(measurements, baselines, tolerance):
+    regressions = []
+    for key, value in measurements.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        direction = BENCHMARKS[key.split('[')[0]][1]
+        if direction == 'lower':
+            regressed = value > baseline * (1 + tolerance) and value - baseline > 1
+        else:
+            regressed = value < baseline * (1 - tolerance)
+        if regressed:
+            regressions.append(f'{key}: {value:.2f} (baseline {baseline:.2f})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless AsyncManager benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Worker counts to benchmark')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, of which the best is kept')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative regression before failing')
+    parser.add_argument('--event-bus', type=int, metavar='INTERVAL', help='Benchmark managers using an event bus')
+    parser.add_argument('--update-baselines', action='store_true', help='Store the measurements as the new baselines')
+    args = parser.parse_args()
+
+    suffix = ''
+    if args.event_bus is not None:
+        MANAGER_KWARGS['event_bus_interval'] = args.event_bus
+        suffix = '@bus'
+    measurements = run_benchmarks(args.sizes, args.benchmarks, max(1, args.repeat), suffix)
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as file:
+            baselines = json.load(file)
+    if args.update_baselines:
+        baselines.update(measurements)
+        with open(BASELINES_PATH, 'w') as file:
+            json.dump(baselines, file, indent=4, sort_keys=True)
+        print(f'Baselines written to {BASELINES_PATH}')
+        return 0
+    regressions = compare_to_baselines(measurements, baselines, args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,960 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import asyncio
+import gc
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+from functools import partial
+
+from PySide6.QtCore import QCoreApplication, QEventLoop
+
+from PySink import AsyncCoroutineWorker, AsyncManager, AsyncWorker, CancellableAsyncWorker, MapWorker, \
+    ProcessAsyncWorker, ResultCache, ResultStore, RetryPolicy, SharedBuffer, WorkerGraph
+from PySink.Objects import AsyncWorkerResults, OverflowPolicy, WorkerEvent
+
+
+def stored_results(worker_id, payload):
+    results = AsyncWorkerResults()
+    results.id = worker_id
+    results.results_dict = {'payload': payload}
+    return results
+
+
+def process_events_until(condition, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        QCoreApplication.processEvents(QEventLoop.AllEvents, 10)
+        time.sleep(0.001)
+    return True
+
+
+def sleep_and_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def slow_square(value):
+    # Later items finish first, so that chunks complete out of order
+    time.sleep(0.002 * (10 - value))
+    return value * value
+
+
+def fail_on_five(value):
+    if value == 5:
+        raise ValueError('Five')
+    return value
+
+
+def split_records(chunk):
+    # Runs on a thread or in a child process
+    return bytes(chunk).split(b'\n')
+
+
+def report_and_square(context, value):
+    # Runs in a child process
+    context.update_progress(50, 'Squaring')
+    return {'square': value * value, 'pid': os.getpid()}
+
+
+def fail_in_child(context):
+    # Runs in a child process
+    raise ValueError('Failed in child')
+
+
+def spin_until_cancelled(context):
+    # Runs in a child process
+    context.update_progress(50)
+    checks = 0
+    deadline = time.monotonic() + 10
+    while not context.cancelled and time.monotonic() < deadline:
+        checks += 1
+    return {'checks': checks}
+
+
+def make_shared_buffer(context, size):
+    # Runs in a child process
+    shared = SharedBuffer(size)
+    shared.buffer[:] = b'\x07' * size
+    return {'payload': shared}
+
+
+class SleepingWorker(CancellableAsyncWorker):
+    def run(self):
+        self.emit_start()
+        if self.sleep(0.2):
+            return
+        self.complete()
+
+
+class FlakyWorker(AsyncWorker):
+    def __init__(self, failures, identifier=None):
+        super(FlakyWorker, self).__init__(identifier=identifier)
+        self.failures = failures
+        self.runs = 0
+
+    def run(self):
+        self.runs += 1
+        if self.runs <= self.failures:
+            self.errors.append(f'Failure {self.runs}')
+        self.complete(run=self.runs)
+
+
+class CachedSquareWorker(AsyncWorker):
+    runs = 0
+
+    def __init__(self, value):
+        super(CachedSquareWorker, self).__init__()
+        self.value = value
+
+    def cache_key(self):
+        return f'square-{self.value}'
+
+    def run(self):
+        CachedSquareWorker.runs += 1
+        self.complete(square=self.value * self.value, values=[self.value])
+
+
+class SharedFetchWorker(CancellableAsyncWorker):
+    def __init__(self, gate, runs):
+        super(SharedFetchWorker, self).__init__()
+        self.gate = gate
+        self.runs = runs
+
+    def dedup_key(self):
+        return 'fetch'
+
+    def run(self):
+        self.runs.append(self.id)
+        self.emit_start()
+        self.update_progress(30, 'Fetching')
+        while not self.gate.wait(0.01):
+            if self.cancelled:
+                return
+        self.complete(fetched_by=self.id)
+
+
+class GroupedWorker(CancellableAsyncWorker):
+    def __init__(self, group, weight, value, gate):
+        super(GroupedWorker, self).__init__()
+        self.group = group
+        self.group_weight = weight
+        self.value = value
+        self.gate = gate
+        self.reported = threading.Event()
+
+    def run(self):
+        self.update_progress(self.value)
+        self.reported.set()
+        while not self.gate.wait(0.01):
+            if self.cancelled:
+                return
+        self.complete()
+
+
+class UncacheableWorker(AsyncWorker):
+    def cache_key(self):
+        return 'uncacheable'
+
+    def run(self):
+        # Locks can neither be copied nor pickled by the cache
+        self.complete(lock=threading.Lock())
+
+
+class SteadyWorker(AsyncWorker):
+    def __init__(self):
+        super(SteadyWorker, self).__init__()
+        self.progress_total = 1000
+        # Short enough for every update after the first to have a rate
+        self.rate_window = 0.2
+
+    def run(self):
+        for value in range(10, 101, 10):
+            self.update_progress(value)
+            time.sleep(0.02)
+        self.complete()
+
+
+class LateProgressWorker(CancellableAsyncWorker):
+    def __init__(self):
+        super(LateProgressWorker, self).__init__()
+        self.rate_window = 0.05
+        self.reported = threading.Event()
+
+    def run(self):
+        self.emit_start()
+        self.update_progress(10)
+        time.sleep(0.01)
+        self.update_progress(20)
+        self.reported.set()
+        self.cancel_token.wait()
+
+
+class StuckWorker(CancellableAsyncWorker):
+    def __init__(self):
+        super(StuckWorker, self).__init__(timeout=0.2)
+        self.lane = 'stuck'
+        self.running = 0
+        self.max_running = 0
+        self.runs = 0
+        self._count_lock = threading.Lock()
+
+    def run(self):
+        with self._count_lock:
+            self.running += 1
+            self.runs += 1
+            self.max_running = max(self.max_running, self.running)
+        # Ignores cancellation for a while, as blocking calls do
+        time.sleep(0.4)
+        with self._count_lock:
+            self.running -= 1
+        self.complete(ok=True)
+
+
+class ThrottledWorker(AsyncWorker):
+    def __init__(self):
+        super(ThrottledWorker, self).__init__(max_progress_rate=50)
+        self.emitted = []
+
+    def _post(self, event, payload):
+        if event == WorkerEvent.PROGRESS:
+            # The time the rate was checked against, rather than the time of this call, which the OS can delay
+            self.emitted.append((self._last_progress_time, payload.value, threading.get_ident()))
+
+    def run(self):
+        end = time.monotonic() + 0.5
+        value = 0
+        while time.monotonic() < end:
+            value = value % 98 + 1
+            self.update_progress(value)
+            time.sleep(0.0005)
+
+
+class GatedWorker(AsyncWorker):
+    def __init__(self, gate):
+        super(GatedWorker, self).__init__()
+        self.gate = gate
+
+    def run(self):
+        self.gate.wait(5)
+        self.complete()
+
+
+class NappingCoroutineWorker(AsyncCoroutineWorker):
+    def __init__(self, seconds, fail=False):
+        super(NappingCoroutineWorker, self).__init__()
+        self.seconds = seconds
+        self.fail = fail
+        self.woke_up = False
+
+    async def run(self):
+        self.emit_start()
+        await asyncio.sleep(self.seconds)
+        self.woke_up = True
+        if self.fail:
+            raise ValueError('Woke up on the wrong side')
+        self.complete(thread=threading.get_ident())
+
+
+class SummingWorker(AsyncWorker):
+    def __init__(self, identifier, value, fail=False):
+        super(SummingWorker, self).__init__(identifier=identifier)
+        self.value = value
+        self.fail = fail
+        self.ran = False
+
+    def run(self):
+        self.ran = True
+        if self.fail:
+            self.errors.append('Failed')
+        total = sum(results.results_dict['total'] for results in self.dependency_results.values())
+        self.complete(total=total + self.value)
+
+
+class ConcurrencyWorker(AsyncWorker):
+    def __init__(self, counts, lane):
+        super(ConcurrencyWorker, self).__init__()
+        self.counts = counts
+        self.lane = lane
+
+    def run(self):
+        with self.counts['lock']:
+            self.counts['running'] += 1
+            self.counts['max_running'] = max(self.counts['max_running'], self.counts['running'])
+        time.sleep(0.02)
+        with self.counts['lock']:
+            self.counts['running'] -= 1
+        self.complete()
+
+
+class OrderedWorker(AsyncWorker):
+    def __init__(self, order, identifier, priority=0):
+        super(OrderedWorker, self).__init__(identifier=identifier)
+        self.order = order
+        self.priority = priority
+
+    def run(self):
+        self.order.append(self.id)
+        self.complete()
+
+
+class ManagerBehaviorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.threadpool.waitForDone(5000)
+            manager.event_loop.stop()
+
+    def create_manager(self, **kwargs):
+        manager = AsyncManager(**kwargs)
+        self.managers.append(manager)
+        return manager
+
+    def test_cancel_all_with_queued_work(self):
+        manager = self.create_manager()
+        # A single thread, so that the task runner waits in the thread pool's queue behind the running worker
+        manager.threadpool.setMaxThreadCount(1)
+        finished = []
+        manager.all_workers_finished_signal.connect(lambda: finished.append(True))
+        for _ in range(10):
+            manager.start_worker(SleepingWorker())
+        for _ in range(20):
+            manager.submit(time.sleep, 0.01)
+        manager.cancel_all_workers()
+        self.assertTrue(process_events_until(lambda: finished and not manager.workers and not manager._tasks))
+
+        # The manager's threads and task runners must still be usable afterwards
+        results = []
+        manager.worker_finished_signal.connect(results.append)
+        manager.start_worker(FlakyWorker(0, identifier='after'))
+        task_id = manager.submit(abs, -1)
+        self.assertTrue(process_events_until(lambda: len(results) == 2))
+        self.assertEqual({'after', task_id}, {result.id for result in results})
+
+    def test_queued_workers_start_by_priority(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(1)
+        gate = threading.Event()
+        manager.start_worker(GatedWorker(gate))
+        order = []
+        for identifier, priority in (('low', 0), ('high', 5), ('medium', 1), ('raised', 0)):
+            manager.start_worker(OrderedWorker(order, identifier, priority))
+        self.assertEqual('', manager.set_worker_priority('raised', 10))
+        self.assertNotEqual('', manager.set_worker_priority('unknown', 10))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual(['raised', 'high', 'medium', 'low'], order)
+        # Only queued workers can be reprioritized
+        self.assertNotEqual('', manager.set_worker_priority('low', 10))
+
+    def test_queued_workers_gain_priority_while_waiting(self):
+        manager = self.create_manager(priority_aging_rate=1000)
+        manager.threadpool.setMaxThreadCount(1)
+        gate = threading.Event()
+        manager.start_worker(GatedWorker(gate))
+        order = []
+        manager.start_worker(OrderedWorker(order, 'old'))
+        time.sleep(0.05)
+        # Waiting 50ms at 1000 per second is worth more than the 10 the newer worker starts with
+        manager.start_worker(OrderedWorker(order, 'new', priority=10))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual(['old', 'new'], order)
+
+    def test_coroutine_workers_wait_concurrently_on_one_thread(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(1)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        begin = time.monotonic()
+        for _ in range(50):
+            manager.start_worker(NappingCoroutineWorker(0.2))
+        self.assertEqual(0, manager.threadpool.activeThreadCount())
+        self.assertTrue(process_events_until(lambda: len(finished) == 50))
+        self.assertLess(time.monotonic() - begin, 2)
+        self.assertEqual([], [result.errors for result in finished if result.errors])
+        self.assertEqual(1, len({result.results_dict['thread'] for result in finished}))
+
+    def test_coroutine_workers_are_cancelled_and_report_exceptions(self):
+        manager = self.create_manager()
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        sleeping = NappingCoroutineWorker(10)
+        failing = NappingCoroutineWorker(0.01, fail=True)
+        manager.start_worker(sleeping)
+        manager.start_worker(failing)
+        self.assertTrue(process_events_until(lambda: len(finished) == 1))
+        self.assertEqual(['ValueError: Woke up on the wrong side'], finished[0].errors)
+        self.assertEqual('', manager.cancel_worker(sleeping.id))
+        self.assertTrue(process_events_until(lambda: len(finished) == 2, timeout=1))
+        self.assertEqual(['Cancelled'], finished[1].errors)
+        time.sleep(0.05)
+        self.assertFalse(sleeping.woke_up)
+
+    def test_graph_passes_results_downstream_and_skips_failed_branches(self):
+        manager = self.create_manager()
+        graph = WorkerGraph()
+        first = graph.add_worker(SummingWorker('first', 1))
+        second = graph.add_worker(SummingWorker('second', 10))
+        both = graph.add_worker(SummingWorker('both', 100), depends_on=[first, 'second'])
+        broken = graph.add_worker(SummingWorker('broken', 0, fail=True), depends_on=[first])
+        downstream = graph.add_worker(SummingWorker('downstream', 0), depends_on=[broken])
+        last = graph.add_worker(SummingWorker('last', 0), depends_on=[downstream, both])
+        self.assertRaises(Exception, graph.add_worker, SummingWorker('orphan', 0), ['unknown'])
+        done = []
+        graph.finished.connect(done.append)
+        manager.start_graph(graph)
+        self.assertTrue(process_events_until(lambda: done))
+        results = done[0]
+        self.assertEqual(6, len(results))
+        self.assertEqual(111, results['both'].results_dict['total'])
+        self.assertEqual({'first', 'second'}, set(both.dependency_results))
+        self.assertEqual(['Failed'], results['broken'].errors)
+        # Everything downstream of the failure finishes without being run
+        self.assertEqual(['Dependency broken failed'], results['downstream'].errors)
+        self.assertEqual(['Dependency downstream failed'], results['last'].errors)
+        self.assertEqual([True, True, True, True, False, False],
+                         [worker.ran for worker in (first, second, both, broken, downstream, last)])
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+
+    def test_map_delivers_chunks_and_results_in_order(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(4)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        ordered = MapWorker(slow_square, range(10), chunksize=3)
+        unordered = MapWorker(slow_square, range(10), chunksize=3, ordered=False)
+        chunks = {ordered.id: [], unordered.id: []}
+        for worker in (ordered, unordered):
+            worker.signals.chunk_finished.connect(lambda index, results, worker_id=worker.id:
+                                                  chunks[worker_id].append((index, results)))
+            manager.start_worker(worker)
+        in_processes = manager.map(abs, [-1, -2, -3], use_processes=True)
+        self.addCleanup(manager.process_pool.shutdown)
+        self.assertTrue(process_events_until(lambda: len(finished) == 3, timeout=30))
+        results = {result.id: result for result in finished}
+        squares = [value * value for value in range(10)]
+        self.assertEqual([], results[ordered.id].errors)
+        self.assertEqual(squares, results[ordered.id].results_dict['results'])
+        self.assertEqual([(0, [0, 1, 4]), (1, [9, 16, 25]), (2, [36, 49, 64]), (3, [81])], chunks[ordered.id])
+        self.assertEqual(sorted(squares), sorted(results[unordered.id].results_dict['results']))
+        self.assertEqual([0, 1, 2, 3], sorted(index for index, _ in chunks[unordered.id]))
+        self.assertEqual([1, 2, 3], results[in_processes.id].results_dict['results'])
+
+    def test_map_reports_the_failing_chunk(self):
+        manager = self.create_manager()
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        manager.map(fail_on_five, range(8), chunksize=2)
+        self.assertTrue(process_events_until(lambda: finished))
+        self.assertEqual(['Chunk 2: ValueError: Five'], finished[0].errors)
+        self.assertRaises(Exception, MapWorker, abs, [], chunksize=0)
+
+    def test_map_file_never_splits_records(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(4)
+        self.addCleanup(manager.process_pool.shutdown)
+        records = [f'record {index} '.encode() + b'#' * (index % 37) for index in range(500)]
+        with tempfile.NamedTemporaryFile('wb', suffix='.log', delete=False) as file:
+            file.write(b'\n'.join(records) + b'\n')
+        self.addCleanup(os.remove, file.name)
+        finished, progress = [], []
+        manager.worker_finished_signal.connect(finished.append)
+        manager.worker_progress_signal.connect(progress.append)
+        on_threads = manager.map_file(file.name, split_records, chunk_size=256)
+        in_processes = manager.map_file(file.name, split_records, chunk_size=4096, use_processes=True)
+        missing = manager.map_file(file.name + '.missing', split_records)
+        self.assertTrue(process_events_until(lambda: len(finished) == 3, timeout=30))
+        results = {result.id: result for result in finished}
+        self.assertTrue(results.pop(missing.id).errors[0].startswith('FileNotFoundError'))
+        for result in results.values():
+            self.assertEqual([], result.errors)
+            chunks = result.results_dict['results']
+            # Every chunk ends with a delimiter, so the last piece of each split is empty
+            self.assertEqual([b''] * len(chunks), [chunk[-1] for chunk in chunks])
+            self.assertEqual(records, [record for chunk in chunks for record in chunk[:-1]])
+        self.assertGreater(len(results[on_threads.id].results_dict['results']), 10)
+        self.assertEqual(100, max(update.value for update in progress if update.id == in_processes.id))
+
+    def test_tasks_do_not_bypass_worker_priority(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(2)
+        for _ in range(4):
+            manager.submit(time.sleep, 0.05)
+        order = []
+        for index in range(2):
+            manager.start_worker(OrderedWorker(order, f'bg{index}'))
+        manager.start_worker(OrderedWorker(order, 'interactive', priority=100))
+        self.assertTrue(process_events_until(lambda: len(order) == 3 and not manager._tasks))
+        self.assertEqual('interactive', order[0])
+
+    def test_map_helpers_do_not_bypass_worker_priority(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(2)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        map_worker = manager.map(partial(sleep_and_return, 0.05), range(4))
+        # Wait for the map worker to borrow the second thread
+        self.assertTrue(process_events_until(lambda: manager._borrowed_threads == 1))
+        order = []
+        manager.start_worker(OrderedWorker(order, 'bg'))
+        manager.start_worker(OrderedWorker(order, 'interactive', priority=100))
+        self.assertTrue(process_events_until(lambda: len(finished) == 3))
+        self.assertEqual(['interactive', 'bg'], order)
+        self.assertEqual([0, 1, 2, 3], next(r for r in finished if r.id == map_worker.id).results_dict['results'])
+
+    def test_process_worker_results_progress_and_errors(self):
+        manager = self.create_manager(max_processes=1)
+        self.addCleanup(manager.process_pool.shutdown)
+        progress, finished = [], []
+        manager.worker_progress_signal.connect(progress.append)
+        manager.worker_finished_signal.connect(finished.append)
+        squaring = ProcessAsyncWorker(report_and_square, 7)
+        failing = ProcessAsyncWorker(fail_in_child)
+        manager.start_worker(squaring)
+        manager.start_worker(failing)
+        self.assertTrue(process_events_until(lambda: len(finished) == 2, timeout=30))
+        results = {result.id: result for result in finished}
+        self.assertEqual([], results[squaring.id].errors)
+        self.assertEqual(49, results[squaring.id].results_dict['square'])
+        # The task ran in a child process, and its progress was relayed by the worker
+        self.assertNotEqual(os.getpid(), results[squaring.id].results_dict['pid'])
+        self.assertIn((squaring.id, 50, 'Squaring'), [(update.id, update.value, update.message) for update in progress])
+        self.assertEqual(1, len(results[failing.id].errors))
+        self.assertIn('Failed in child', results[failing.id].errors[0])
+
+    def test_process_worker_cancellation_reaches_the_child(self):
+        manager = self.create_manager(max_processes=1)
+        self.addCleanup(manager.process_pool.shutdown)
+        progress, finished = [], []
+        manager.worker_progress_signal.connect(progress.append)
+        manager.worker_finished_signal.connect(finished.append)
+        worker = ProcessAsyncWorker(spin_until_cancelled)
+        manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: progress, timeout=30))
+        self.assertEqual(50, progress[0].value)
+        self.assertEqual('', manager.cancel_worker(worker.id))
+        self.assertTrue(process_events_until(lambda: finished and not manager.threadpool.activeThreadCount()))
+        self.assertIn('Cancelled', finished[0].errors)
+
+    def test_lane_limits_its_running_workers(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(4)
+        manager.add_lane('io', max_running=2)
+        counts = {'lock': threading.Lock(), 'running': 0, 'max_running': 0}
+        for _ in range(8):
+            manager.start_worker(ConcurrencyWorker(counts, 'io'))
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual(2, counts['max_running'])
+        worker = AsyncWorker()
+        worker.lane = 'missing'
+        self.assertRaises(Exception, manager.start_worker, worker)
+
+    def test_full_lane_rejects_workers(self):
+        manager = self.create_manager()
+        manager.add_lane('io', max_running=1, max_queued=1, overflow_policy=OverflowPolicy.REJECT)
+        gate = threading.Event()
+        workers = [GatedWorker(gate) for _ in range(3)]
+        for worker in workers:
+            worker.lane = 'io'
+        manager.start_worker(workers[0])
+        manager.start_worker(workers[1])
+        self.assertRaises(Exception, manager.start_worker, workers[2])
+        self.assertNotIn(workers[2].id, manager.workers)
+        gate.set()
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+
+    def test_full_lane_drops_its_oldest_queued_worker(self):
+        manager = self.create_manager()
+        manager.add_lane('io', max_running=1, max_queued=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        gate = threading.Event()
+        workers = [GatedWorker(gate) for _ in range(5)]
+        for worker in workers:
+            worker.lane = 'io'
+            manager.start_worker(worker)
+            # Gives the first worker time to leave the queue
+            self.assertTrue(process_events_until(lambda: manager.scheduler.running_count == 1))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: len(finished) == 5))
+        errors = {result.id: result.errors for result in finished}
+        self.assertEqual([[], ['Dropped'], ['Dropped'], [], []], [errors[worker.id] for worker in workers])
+
+    def test_blocking_lane_holds_workers_without_blocking_the_caller(self):
+        manager = self.create_manager()
+        manager.add_lane('io', max_running=1, max_queued=1, overflow_policy='block', block_timeout=0.1)
+        order, finished = [], []
+        manager.worker_finished_signal.connect(finished.append)
+        workers = [SleepingWorker() for _ in range(4)]
+        for worker in workers:
+            worker.lane = 'io'
+        begin = time.monotonic()
+        for worker in workers:
+            manager.start_worker(worker)
+        self.assertLess(time.monotonic() - begin, 0.1)
+        self.assertEqual(2, len(manager._blocked_workers['io']))
+        # Cancelling a held worker finishes it without it ever being queued
+        self.assertEqual('', manager.cancel_worker(workers[3].id))
+        self.assertTrue(process_events_until(lambda: len(finished) == 4))
+        errors = {result.id: result.errors for result in finished}
+        self.assertEqual([], errors[workers[0].id])
+        self.assertEqual([], errors[workers[1].id])
+        # The second worker only leaves the queue once the first one is done, after 0.2s
+        self.assertEqual('Dropped', errors[workers[2].id][0])
+        self.assertEqual(['Cancelled'], errors[workers[3].id])
+        self.assertEqual({}, manager._blocked_workers)
+
+    def test_blocking_lane_admits_held_workers_in_order(self):
+        manager = self.create_manager()
+        manager.add_lane('io', max_running=1, max_queued=1, overflow_policy='block')
+        order = []
+        for index in range(5):
+            worker = OrderedWorker(order, f'io{index}')
+            worker.lane = 'io'
+            manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual([f'io{index}' for index in range(5)], order)
+
+    def test_result_store_keeps_the_latest_results(self):
+        manager = self.create_manager(result_store=ResultStore(max_entries=2))
+        manager.threadpool.setMaxThreadCount(1)
+        order = []
+        for identifier in ('a', 'b', 'c'):
+            manager.start_worker(OrderedWorker(order, identifier))
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        task_id = manager.submit(abs, -3)
+        self.assertTrue(process_events_until(lambda: task_id in manager.result_store))
+        self.assertEqual(['c', task_id], manager.result_store.ids())
+        self.assertIsNone(manager.get_results('a'))
+        self.assertEqual(3, manager.get_results(task_id).results_dict['result'])
+
+    def test_result_store_expires_evicts_and_holds_large_results_weakly(self):
+        store = ResultStore(max_age=0.05)
+        store.add(stored_results('old', 1))
+        time.sleep(0.06)
+        store.add(stored_results('new', 2))
+        self.assertEqual(['new'], store.ids())
+
+        store = ResultStore(max_size=1000)
+        store.add(stored_results('first', b'x' * 600))
+        store.add(stored_results('second', b'x' * 600))
+        self.assertEqual(['second'], store.ids())
+        self.assertLessEqual(store.size, 1000)
+
+        store = ResultStore(weak_above=1000)
+        large = stored_results('large', b'x' * 2000)
+        store.add(large)
+        store.add(stored_results('small', b'x'))
+        self.assertIs(large, store.get('large'))
+        del large
+        gc.collect()
+        self.assertIsNone(store.get('large'))
+        self.assertEqual(['small'], store.ids())
+
+    def test_shared_buffer_is_attached_rather_than_copied(self):
+        shared = SharedBuffer.from_buffer(bytearray(b'abc'))
+        self.addCleanup(shared.release)
+        self.assertEqual(3, len(shared))
+        attached = pickle.loads(pickle.dumps(shared))
+        self.assertEqual(shared.name, attached.name)
+        # Both handles map the same memory
+        attached.buffer[0:1] = b'x'
+        self.assertEqual(b'xbc', bytes(shared.buffer))
+        attached._detach()
+        shared.release()
+        self.assertTrue(shared.released)
+        self.assertRaises(Exception, lambda: shared.buffer)
+        self.assertRaises(FileNotFoundError, SharedBuffer, 3, shared.name)
+
+    def test_released_shared_buffers_leave_the_result_store(self):
+        manager = self.create_manager(max_processes=1, result_store=ResultStore())
+        self.addCleanup(manager.process_pool.shutdown)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        workers = [ProcessAsyncWorker(make_shared_buffer, 1024) for _ in range(2)]
+        for worker in workers:
+            manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: len(finished) == 2, timeout=30))
+        stored = manager.get_results(workers[0].id)
+        self.assertEqual(b'\x07' * 1024, bytes(stored.results_dict['payload'].buffer))
+        self.assertEqual(1, manager.release_shared_buffers(workers[0].id))
+        self.assertIsNone(manager.get_results(workers[0].id))
+        # Buffers released by the application directly are not handed out by the store either
+        manager.get_results(workers[1].id).results_dict['payload'].release()
+        self.assertIsNone(manager.get_results(workers[1].id))
+        self.assertEqual([], manager.result_store.ids())
+        manager.release_shared_buffers()
+        self.assertEqual({}, manager.shared_buffers)
+
+    def test_retry_policy_gives_up_after_its_last_attempt(self):
+        manager = self.create_manager()
+        policy = RetryPolicy(max_attempts=3, delay=0.01, backoff=2., jitter=0.,
+                             retry_on=lambda errors: errors[0].startswith('Failure'))
+        self.assertEqual([0.01, 0.02, 0.04], [policy.get_delay(attempt) for attempt in (1, 2, 3)])
+        retried, finished = [], []
+        manager.worker_retry_signal.connect(retried.append)
+        manager.worker_finished_signal.connect(finished.append)
+        hopeless = FlakyWorker(5, identifier='hopeless')
+        hopeless.retry_policy = policy
+        manager.start_worker(hopeless)
+        # Failures rejected by retry_on are final
+        unmatched = FlakyWorker(1, identifier='unmatched')
+        unmatched.retry_policy = RetryPolicy(max_attempts=3, delay=0.01, retry_on=lambda errors: 'Timed out' in errors)
+        manager.start_worker(unmatched)
+        self.assertTrue(process_events_until(lambda: len(finished) == 2))
+        results = {result.id: result for result in finished}
+        self.assertEqual(3, hopeless.runs)
+        self.assertEqual(['Failure 3'], results['hopeless'].errors)
+        self.assertEqual(['hopeless', 'hopeless'], [result.id for result in retried])
+        self.assertEqual(1, unmatched.runs)
+        self.assertEqual(['Failure 1'], results['unmatched'].errors)
+
+    def test_retry_with_event_bus(self):
+        manager = self.create_manager(event_bus_interval=16, retry_policy=RetryPolicy(max_attempts=3, delay=0.01))
+        retried, by_id, by_type = [], [], []
+        manager.worker_retry_signal.connect(retried.append)
+        manager.event_bus.subscribe(lambda worker_id, event, payload: event == WorkerEvent.FINISHED and
+                                    by_id.append(payload), worker_id='flaky')
+        manager.event_bus.subscribe(lambda worker_id, event, payload: event == WorkerEvent.FINISHED and
+                                    by_type.append(payload), worker_type=FlakyWorker)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        manager.start_worker(FlakyWorker(2, identifier='flaky'))
+        self.assertTrue(process_events_until(lambda: finished))
+        self.assertEqual(2, len(retried))
+        for delivered in (finished, by_id, by_type):
+            self.assertEqual(1, len(delivered))
+            self.assertEqual([], delivered[0].errors)
+            self.assertEqual(3, delivered[0].results_dict['run'])
+
+    def test_retry_after_timeout_waits_for_previous_run(self):
+        manager = self.create_manager(retry_policy=RetryPolicy(max_attempts=3, delay=0.01))
+        manager.threadpool.setMaxThreadCount(4)
+        manager.add_lane('stuck', max_running=1)
+        worker = StuckWorker()
+        lane_counts = []
+        manager.worker_retry_signal.connect(
+            lambda _: lane_counts.append(manager.scheduler.lanes['stuck'].running_count))
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: finished, timeout=10))
+        self.assertEqual(3, worker.runs)
+        self.assertEqual(1, worker.max_running)
+        self.assertEqual(['Cancelled', 'Timed out'], finished[0].errors)
+        # Every failed attempt timed out while its run was still holding the lane's slot
+        self.assertEqual([1, 1], lane_counts)
+
+    def test_cached_results_skip_the_worker(self):
+        manager = self.create_manager(result_cache=ResultCache())
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        CachedSquareWorker.runs = 0
+        first = CachedSquareWorker(4)
+        manager.start_worker(first)
+        self.assertTrue(process_events_until(lambda: finished))
+        # The cache holds a copy: changing the delivered results does not change the cached ones
+        finished[0].results_dict['values'].append('changed')
+        second, other = CachedSquareWorker(4), CachedSquareWorker(5)
+        manager.start_worker(second)
+        manager.start_worker(other)
+        self.assertTrue(process_events_until(lambda: len(finished) == 3))
+        results = {result.id: result for result in finished}
+        self.assertEqual(2, CachedSquareWorker.runs)
+        self.assertEqual({'square': 16, 'values': [4]}, results[second.id].results_dict)
+        self.assertEqual(25, results[other.id].results_dict['square'])
+        self.assertEqual(2, manager.result_cache.invalidate(worker_type=CachedSquareWorker))
+        self.assertEqual(0, len(manager.result_cache))
+
+    def test_cache_failure_does_not_strand_worker(self):
+        manager = self.create_manager(result_cache=ResultCache())
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        manager.start_worker(UncacheableWorker())
+        self.assertTrue(process_events_until(lambda: finished))
+        self.assertEqual({}, manager.workers)
+        self.assertEqual(0, len(manager.result_cache))
+        self.assertTrue(any(warning.startswith('Results not cached') for warning in finished[0].warnings))
+
+    def test_duplicate_workers_share_one_run(self):
+        manager = self.create_manager()
+        progress, finished = [], []
+        manager.worker_progress_signal.connect(progress.append)
+        manager.worker_finished_signal.connect(finished.append)
+        gate, runs = threading.Event(), []
+        leader, *followers = [SharedFetchWorker(gate, runs) for _ in range(3)]
+        for worker in (leader, *followers):
+            manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: len(progress) == 3))
+        # Followers receive the leader's progress under their own id
+        self.assertEqual({worker.id for worker in (leader, *followers)}, {update.id for update in progress})
+        gate.set()
+        self.assertTrue(process_events_until(lambda: len(finished) == 3))
+        self.assertEqual([leader.id], runs)
+        self.assertEqual({leader.id, *(follower.id for follower in followers)}, {result.id for result in finished})
+        self.assertEqual([leader.id] * 3, [result.results_dict['fetched_by'] for result in finished])
+        self.assertEqual({}, manager._flights)
+
+    def test_cancelling_a_deduplicated_leader_promotes_a_follower(self):
+        manager = self.create_manager()
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        gate, runs = threading.Event(), []
+        leader, follower, other = [SharedFetchWorker(gate, runs) for _ in range(3)]
+        for worker in (leader, follower, other):
+            manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: runs))
+        self.assertEqual('', manager.cancel_worker(leader.id))
+        self.assertTrue(process_events_until(lambda: len(runs) == 2))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: len(finished) == 3))
+        results = {result.id: result for result in finished}
+        self.assertEqual(['Cancelled'], results[leader.id].errors)
+        self.assertEqual([leader.id, follower.id], runs)
+        self.assertEqual(follower.id, results[other.id].results_dict['fetched_by'])
+
+    def test_latest_channel_worker_supersedes_the_active_one(self):
+        manager = self.create_manager()
+        started, finished, idle = [], [], []
+        manager.worker_started_signal.connect(started.append)
+        manager.worker_finished_signal.connect(finished.append)
+        manager.all_workers_finished_signal.connect(lambda: idle.append(True))
+        superseded = SleepingWorker()
+        manager.submit_latest('search', superseded)
+        self.assertTrue(process_events_until(lambda: started))
+        order = []
+        manager.submit_latest('search', OrderedWorker(order, 'latest'))
+        self.assertTrue(process_events_until(lambda: idle))
+        self.assertTrue(superseded.cancelled)
+        self.assertEqual(['latest'], [result.id for result in finished])
+        self.assertEqual(['latest'], order)
+
+    def test_debounced_channel_only_starts_the_last_worker(self):
+        manager = self.create_manager()
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        order = []
+        for identifier in ('first', 'second', 'third'):
+            manager.submit_latest('search', OrderedWorker(order, identifier), debounce=50)
+        manager.submit_latest('discarded', OrderedWorker(order, 'discarded'), debounce=50)
+        manager.cancel_channel('discarded')
+        self.assertTrue(process_events_until(lambda: finished))
+        time.sleep(0.1)
+        QCoreApplication.processEvents()
+        self.assertEqual(['third'], order)
+        self.assertEqual(['third'], [result.id for result in finished])
+
+    def test_group_progress_is_weighted_by_worker(self):
+        manager = self.create_manager()
+        manager.threadpool.setMaxThreadCount(3)
+        group_progress, groups_finished = [], []
+        manager.group_progress_signal.connect(lambda name, progress: group_progress.append((name, progress)))
+        manager.group_finished_signal.connect(groups_finished.append)
+        gate = threading.Event()
+        heavy, light = GroupedWorker('batch', 3., 40, gate), GroupedWorker('batch', 1., 80, gate)
+        failing = FlakyWorker(1)
+        failing.group = 'batch'
+        for worker in (heavy, light):
+            manager.start_worker(worker)
+        self.assertTrue(heavy.reported.wait(5) and light.reported.wait(5))
+        self.assertTrue(process_events_until(lambda: group_progress and group_progress[-1] == ('batch', 50)))
+        self.assertEqual(2, manager.get_group('batch').worker_count)
+        manager.start_worker(failing)
+        self.assertTrue(process_events_until(lambda: failing.id not in manager.workers))
+        # The failed worker counts as done, with the weight of 1 it was given by default
+        self.assertEqual(60, int(manager.get_group('batch').progress))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: groups_finished))
+        group = groups_finished[0]
+        self.assertEqual((3, 3, 1, 0), (group.worker_count, group.finished_count, group.failed_count,
+                                        group.cancelled_count))
+        self.assertEqual(('batch', 100), group_progress[-1])
+        self.assertIsNone(manager.get_group('batch'))
+
+    def test_cancelling_a_group_cancels_its_unfinished_workers(self):
+        manager = self.create_manager()
+        groups_finished = []
+        manager.group_finished_signal.connect(groups_finished.append)
+        gate = threading.Event()
+        workers = [GroupedWorker('batch', 1., 10, gate) for _ in range(3)]
+        outsider = GroupedWorker('other', 1., 10, gate)
+        for worker in (*workers, outsider):
+            manager.start_worker(worker)
+        self.assertEqual({}, manager.cancel_group('batch'))
+        self.assertTrue(process_events_until(lambda: groups_finished))
+        self.assertEqual(3, groups_finished[0].cancelled_count)
+        self.assertFalse(outsider.cancelled)
+        self.assertEqual({}, manager.cancel_group('batch'))
+        gate.set()
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual(['batch', 'other'], [group.name for group in groups_finished])
+
+    def test_progress_rate_is_enforced(self):
+        worker = ThrottledWorker()
+        worker.reset()
+        worker.run()
+        last_value = worker._pending_progress[0] if worker._pending_progress else worker.emitted[-1][1]
+        self.assertTrue(process_events_until(lambda: worker.emitted[-1][1] == last_value, timeout=1))
+        # Held back updates are emitted by a single thread shared by all workers, not by a thread per update
+        self.assertEqual(2, len({thread for _, _, thread in worker.emitted}))
+        times = [emitted_at for emitted_at, _, _ in worker.emitted]
+        self.assertLessEqual(len(times), 27)
+        self.assertGreaterEqual(min(b - a for a, b in zip(times, times[1:])), 0.0195)
+
+    def test_progress_reports_elapsed_time_rate_and_eta(self):
+        manager = self.create_manager()
+        progress = []
+        manager.worker_progress_signal.connect(progress.append)
+        manager.start_worker(SteadyWorker())
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        self.assertEqual(10, len(progress))
+        # Nothing can be estimated from the first update
+        self.assertEqual((0., None, None), (progress[0].elapsed, progress[0].rate, progress[0].eta))
+        elapsed = [update.elapsed for update in progress]
+        self.assertEqual(sorted(elapsed), elapsed)
+        for update in progress[1:-1]:
+            # The rate is in units of progress_total per second, while the ETA is derived from percentage points
+            self.assertGreater(update.rate, 0)
+            self.assertAlmostEqual((100 - update.value) * 10 / update.rate, update.eta)
+        self.assertEqual(0., progress[-1].eta)
+
+    def test_stale_progress_after_cancel(self):
+        manager = self.create_manager()
+        worker = LateProgressWorker()
+        progress = []
+        manager.worker_progress_signal.connect(progress.append)
+        manager.start_worker(worker)
+        self.assertTrue(worker.reported.wait(5))
+        # The worker's progress is still queued: none of it may be delivered once the worker is cancelled
+        self.assertEqual('', manager.cancel_worker(worker.id))
+        self.assertTrue(process_events_until(lambda: not manager.workers))
+        QCoreApplication.processEvents()
+        metrics = manager.get_metrics()
+        self.assertEqual([], progress)
+        self.assertEqual(0., metrics.rate)
+        self.assertIsNone(metrics.eta)
+
+    def test_cache_invalidation_by_type_is_qualified_by_module(self):
+        cache = ResultCache()
+        same_name = type(UncacheableWorker.__name__, (AsyncWorker,), {'__module__': 'other.module'})
+        cache.put('here', AsyncWorkerResults(), UncacheableWorker)
+        cache.put('there', AsyncWorkerResults(), same_name)
+        self.assertEqual(1, cache.invalidate(worker_type=same_name))
+        self.assertIsNotNone(cache.get('here'))
+        self.assertIsNone(cache.get('there'))
+
+
+if __name__ == '__main__':
+    unittest.main()
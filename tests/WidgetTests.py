@@ -0,0 +1,170 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import time
+import unittest
+
+from PySide6.QtCore import QCoreApplication, QEventLoop
+from PySide6.QtWidgets import QApplication, QProxyStyle, QStyle
+
+from PySink import AsyncManager, AsyncWorker
+from PySink.Objects import AsyncWorkerProgress, AsyncWorkerResults
+from PySink.Widgets import WorkerProgressModel, WorkerProgressView
+
+
+def process_events_until(condition, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        QCoreApplication.processEvents(QEventLoop.AllEvents, 10)
+        time.sleep(0.001)
+    return True
+
+
+def finished_results(worker_id, *errors):
+    results = AsyncWorkerResults()
+    results.id = worker_id
+    results.errors.extend(errors)
+    return results
+
+
+class ReportingWorker(AsyncWorker):
+    def run(self):
+        self.emit_start()
+        self.update_progress(50, 'Halfway')
+        self.complete()
+
+
+class RecordingStyle(QProxyStyle):
+    def __init__(self):
+        super(RecordingStyle, self).__init__()
+        self.bars = []
+
+    def drawControl(self, element, option, painter, widget=None):
+        if element == QStyle.CE_ProgressBar:
+            self.bars.append((option.maximum, option.progress, option.text, option.textVisible))
+        super(RecordingStyle, self).drawControl(element, option, painter, widget)
+
+
+class WidgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def create_model(self, row_count):
+        model = WorkerProgressModel(refresh_interval=10)
+        for index in range(row_count):
+            model.add_worker(f'worker-{index}')
+        model.refresh()
+        return model
+
+    def test_rows_are_inserted_once_per_refresh(self):
+        model = WorkerProgressModel(refresh_interval=10)
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.set_started('a')
+        model.update_progress(AsyncWorkerProgress(30, 'Loading', 'b'))
+        model.add_worker('c')
+        # Nothing reaches the views until the refresh interval has elapsed
+        self.assertEqual(0, model.rowCount())
+        self.assertIsNone(model.row_of('a'))
+        self.assertTrue(process_events_until(lambda: inserted, timeout=1))
+        self.assertEqual([(0, 2)], inserted)
+        self.assertEqual(3, model.rowCount())
+        self.assertEqual(1, model.row_of('b'))
+        row_b = [model.data(model.index(1, column)) for column in range(model.columnCount())]
+        self.assertEqual(['b', 30, 'Loading', '', 'Running'], row_b)
+        self.assertEqual('Running', model.data(model.index(0, WorkerProgressModel.STATUS_COLUMN)))
+        self.assertEqual('Queued', model.data(model.index(2, WorkerProgressModel.STATUS_COLUMN)))
+
+    def test_updates_are_reported_per_run_of_changed_rows(self):
+        model = self.create_model(5)
+        changed = []
+        model.dataChanged.connect(lambda top_left, bottom_right: changed.append(
+            (top_left.row(), bottom_right.row(), top_left.column(), bottom_right.column())))
+        model.update_progress(AsyncWorkerProgress(10, '', 'worker-0', eta=75.))
+        model.update_progress(AsyncWorkerProgress(20, '', 'worker-1'))
+        model.update_progress(AsyncWorkerProgress(25, '', 'worker-1'))
+        model.set_finished(finished_results('worker-3'))
+        self.assertEqual([], changed)
+        model.refresh()
+        progress, status = WorkerProgressModel.PROGRESS_COLUMN, WorkerProgressModel.STATUS_COLUMN
+        self.assertEqual([(0, 1, progress, status), (3, 3, progress, status)], changed)
+        self.assertEqual('1m 15s', model.data(model.index(0, WorkerProgressModel.ETA_COLUMN)))
+        self.assertEqual(25, model.data(model.index(1, progress)))
+        self.assertEqual((100, 'Done'), (model.data(model.index(3, progress)), model.data(model.index(3, status))))
+        # Rows are only reported once per refresh
+        model.refresh()
+        self.assertEqual(2, len(changed))
+
+    def test_clear_finished_removes_finished_rows(self):
+        model = self.create_model(4)
+        model.set_started('worker-2')
+        model.set_finished(finished_results('worker-0'))
+        model.set_finished(finished_results('worker-1', 'Cancelled'))
+        model.set_finished(finished_results('worker-3', 'Failed to load'))
+        self.assertEqual('Cancelled', model.data(model.index(1, WorkerProgressModel.STATUS_COLUMN)))
+        self.assertEqual('Failed', model.data(model.index(3, WorkerProgressModel.STATUS_COLUMN)))
+        resets = []
+        model.modelReset.connect(lambda: resets.append(True))
+        model.clear_finished()
+        self.assertEqual([True], resets)
+        self.assertEqual(1, model.rowCount())
+        self.assertEqual(0, model.row_of('worker-2'))
+        self.assertIsNone(model.row_of('worker-0'))
+        model.clear()
+        self.assertEqual(0, model.rowCount())
+
+    def test_model_follows_the_manager(self):
+        manager = AsyncManager()
+        self.addCleanup(manager.event_loop.stop)
+        self.addCleanup(manager.threadpool.waitForDone, 5000)
+        model = WorkerProgressModel(manager, refresh_interval=10)
+        finished = []
+        manager.worker_finished_signal.connect(finished.append)
+        worker = ReportingWorker()
+        manager.start_worker(worker)
+        self.assertTrue(process_events_until(lambda: finished and model.rowCount() == 1))
+        model.refresh()
+        row = [model.data(model.index(0, column)) for column in range(model.columnCount())]
+        self.assertEqual([worker.id, 100, 'Halfway', '', 'Done'], row)
+
+        # Once moved to another manager, the model no longer follows the first one
+        other_manager = AsyncManager()
+        self.addCleanup(other_manager.event_loop.stop)
+        model.set_manager(other_manager)
+        manager.start_worker(ReportingWorker())
+        self.assertTrue(process_events_until(lambda: len(finished) == 2))
+        model.refresh()
+        self.assertEqual(1, model.rowCount())
+
+    def test_view_paints_determinate_and_indeterminate_bars(self):
+        view = WorkerProgressView()
+        style = RecordingStyle()
+        view.setStyle(style)
+        model = view.progress_model
+        model.update_progress(AsyncWorkerProgress(40, '', 'determinate'))
+        model.update_progress(AsyncWorkerProgress(-1, 'Waiting', 'indeterminate'))
+        model.refresh()
+        view.resize(600, 200)
+        view.grab()
+        self.assertIn((100, 40, '40%', True), style.bars)
+        self.assertIn((0, 0, '', False), style.bars)
+
+    def test_view_only_paints_visible_rows(self):
+        view = WorkerProgressView()
+        style = RecordingStyle()
+        view.setStyle(style)
+        model = view.progress_model
+        for index in range(10000):
+            model.update_progress(AsyncWorkerProgress(index % 100, '', f'worker-{index}'))
+        model.refresh()
+        view.resize(600, 200)
+        view.grab()
+        visible_rows = view.viewport().height() // view.verticalHeader().defaultSectionSize() + 1
+        self.assertTrue(0 < len(style.bars) <= visible_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()